@@ -0,0 +1,345 @@
+"""
+In-process stand-ins for Google Sheets and the Steam store, so the benchmarks run offline and measure soul-link code
+instead of the network.
+"""
+
+import json
+import os
+import random
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from threading import Thread
+from urllib.parse import parse_qs, urlparse
+
+from soul_link.wrappers import steam
+from soul_link.wrappers.cache import TTLCache
+from soul_link.wrappers.http import RateLimiter
+
+RECORDED_APP_DETAILS_PATH = Path(__file__).parent / "fixtures" / "appdetails.json"
+# empty rows after the last game, new Google sheets have a grid larger than their content
+GRID_SPARE_ROWS = 100
+HEADER = ["name", "is_free", "short_description", "categories", "genres", "released", "app_id"]
+
+_WORDS = (
+    "dark souls portal half life counter strike witcher hollow knight stardew valley elden ring factorio terraria "
+    "rimworld cities skylines civilization simulator tycoon legend quest space station shadow blade"
+).split()
+_CATEGORIES = ("Single-player", "Multi-player", "Co-op", "Steam Achievements", "Full controller support")
+_GENRES = ("Action", "Adventure", "Indie", "RPG", "Strategy", "Simulation", "Casual")
+
+
+@lru_cache(maxsize=8)
+def make_rows(count: int, seed: int = 0) -> list[list[str]]:
+    """
+    Generate a game list with the default header and `count` games with realistic cell lengths. Results are cached,
+    so the returned list must not be modified.
+
+    Args:
+        count (int): Number of games.
+        seed (int): Random seed, the same seed always generates the same rows.
+
+    Returns:
+        list[list[str]] with the header and the game rows.
+    """
+    generator = random.Random(seed)
+    rows = [list(HEADER)]
+    for i in range(count):
+        name = " ".join(generator.choice(_WORDS).capitalize() for _ in range(generator.randint(1, 4)))
+        description = " ".join(generator.choice(_WORDS) for _ in range(generator.randint(20, 45)))
+        rows.append(
+            [
+                f"{name} {i}",
+                generator.choice(("TRUE", "FALSE")),
+                description.capitalize(),
+                ", ".join(generator.sample(_CATEGORIES, generator.randint(1, 3))),
+                ", ".join(generator.sample(_GENRES, generator.randint(1, 2))),
+                generator.choice(("TRUE", "FALSE")),
+                str(1000 + i),
+            ]
+        )
+    return rows
+
+
+class FakeResponse:
+    def __init__(self, data: dict):
+        self._data = data
+
+    def json(self) -> dict:
+        return self._data
+
+
+class FakeClient:
+    """
+    Stand-in for `gspread.Client`, only the Google Drive metadata request used by `SheetWrapper` is supported.
+    """
+
+    def __init__(self, spreadsheet: "FakeSpreadsheet"):
+        self._spreadsheet = spreadsheet
+
+    def request(self, method: str, endpoint: str, params: dict | None = None, **kwargs) -> FakeResponse:
+        return FakeResponse(self._spreadsheet.transfer({"modifiedTime": self._spreadsheet.modified_time}))
+
+
+class FakeWorksheet:
+    """
+    Stand-in for `gspread.Worksheet` storing its cells in memory.
+    """
+
+    def __init__(self, spreadsheet: "FakeSpreadsheet", rows: list[list[str]]):
+        self.id = 0
+        self._spreadsheet = spreadsheet
+        self.rows = [list(row) for row in rows]
+
+    @property
+    def row_count(self) -> int:
+        return len(self.rows) + GRID_SPARE_ROWS
+
+    def get_all_values(self) -> list[list[str]]:
+        width = max((len(row) for row in self.rows), default=0)
+        return self._spreadsheet.transfer([row + [""] * (width - len(row)) for row in self.rows])
+
+    def get(self, range_name: str) -> list[list[str]]:
+        """
+        Get a range of whole rows, like `2:101`. Empty cells at the end of a row and empty rows at the end of the range
+        are omitted, like the Sheets API does.
+
+        Raises:
+            ValueError: If the range goes past the worksheet grid.
+        """
+        first, last = (int(row) for row in range_name.split(":"))
+        if last > self.row_count:
+            raise ValueError(f"Range {range_name} exceeds grid limits")
+        values = []
+        for row in self.rows[first - 1 : last]:
+            row = list(row)
+            while row and not row[-1]:
+                row.pop()
+            values.append(row)
+        while values and not values[-1]:
+            values.pop()
+        return self._spreadsheet.transfer(values)
+
+    def update(self, values: list[list]):
+        self.rows = [[_cell_text(value) for value in row] for row in self._spreadsheet.transfer(values)]
+        self._spreadsheet.touch()
+
+    def append_rows(self, values: list[list], value_input_option: str = "RAW"):
+        self.rows.extend([_cell_text(value) for value in row] for row in self._spreadsheet.transfer(values))
+        self._spreadsheet.touch()
+
+
+def _cell_text(value) -> str:
+    """
+    Get the text read back from a cell written with a typed value, like the formatted values returned by the API.
+    """
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    return str(value)
+
+
+class FakeSpreadsheet:
+    """
+    Stand-in for `gspread.Spreadsheet` with a single worksheet. Every call goes through `transfer`, which serializes
+    the payload to JSON like the real API does, counts the transferred bytes and waits `latency` seconds.
+
+    `batch_update` applies the `deleteDimension`, `insertDimension` and `updateCells` requests sent by
+    `soul_link.data.SheetWrapper`, so the worksheet content can be checked after a synchronization.
+    """
+
+    def __init__(self, rows: list[list[str]], latency: float = 0.0):
+        """
+        Args:
+            rows (list[list[str]]): Initial worksheet content, header included.
+            latency (float): Seconds waited by every request.
+        """
+        self.id = "fake-spreadsheet"
+        self.latency = latency
+        self.requests = 0
+        self.bytes_transferred = 0
+        self.modified_time = ""
+        self.client = FakeClient(self)
+        self.worksheet = FakeWorksheet(self, rows)
+        self.touch()
+
+    def get_worksheet(self, index: int) -> FakeWorksheet:
+        return self.worksheet
+
+    def batch_update(self, body: dict) -> dict:
+        body = self.transfer(body)
+        rows = self.worksheet.rows
+        for request in body["requests"]:
+            if "deleteDimension" in request:
+                cells_range = request["deleteDimension"]["range"]
+                del rows[cells_range["startIndex"] : cells_range["endIndex"]]
+            elif "insertDimension" in request:
+                cells_range = request["insertDimension"]["range"]
+                rows[cells_range["startIndex"] : cells_range["startIndex"]] = [
+                    [] for _ in range(cells_range["endIndex"] - cells_range["startIndex"])
+                ]
+            elif "updateCells" in request:
+                start = request["updateCells"]["start"]
+                for y, row in enumerate(request["updateCells"]["rows"], start=start["rowIndex"]):
+                    for x, cell in enumerate(row["values"], start=start["columnIndex"]):
+                        rows[y] += [""] * (x + 1 - len(rows[y]))
+                        value = cell.get("userEnteredValue", {})
+                        rows[y][x] = _cell_text(next(iter(value.values()), ""))
+        self.touch()
+        return {"replies": [{} for _ in body["requests"]]}
+
+    def touch(self):
+        """
+        Update the modified time, like Google Drive does after every change.
+        """
+        self.modified_time = datetime.now(timezone.utc).isoformat(timespec="microseconds")
+
+    def transfer(self, payload):
+        """
+        Simulate sending `payload` over the network.
+
+        Returns:
+            A copy of `payload` decoded from its JSON representation.
+        """
+        encoded = json.dumps(payload)
+        self.requests += 1
+        self.bytes_transferred += len(encoded)
+        if self.latency:
+            time.sleep(self.latency)
+        return json.loads(encoded)
+
+
+class FakeTerminal:
+    """
+    Text stream standing for the terminal where `soul_link.tui.screen.Screen` writes its frames.
+    """
+
+    def __init__(self, lines: int = 50, columns: int = 200):
+        self.lines = lines
+        self.columns = columns
+        self.bytes_written = 0
+
+    def write(self, data: str):
+        self.bytes_written += len(data)
+
+    def flush(self):
+        pass
+
+    def get_terminal_size(self, fd: int = 1) -> os.terminal_size:
+        """
+        Replacement for `os.get_terminal_size`.
+        """
+        return os.terminal_size((self.columns, self.lines))
+
+
+class SteamStub:
+    """
+    Local HTTP server answering Steam store `appdetails` requests with recorded payloads. Requested application IDs
+    that were not recorded get a copy of a recorded payload with the ID in its name. The `filters` parameter is
+    honored like the store does, `basic` returns the keys of `soul_link.wrappers.steam.BASIC_FIELDS` and any other
+    value returns the key with its name.
+    """
+
+    def __init__(self, latency: float = 0.0, recorded_path: Path = RECORDED_APP_DETAILS_PATH):
+        """
+        Args:
+            latency (float): Seconds waited before answering every request.
+            recorded_path (Path): JSON file with recorded `appdetails` responses.
+        """
+        with open(recorded_path, "r") as handler:
+            self._recorded = list(json.load(handler).values())
+        self.latency = latency
+        self.requests = 0
+        self.bytes_sent = 0
+        self._server: ThreadingHTTPServer | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api"
+
+    def app_details(self, app_id: int, query: dict[str, list[str]]) -> dict:
+        """
+        Build the `appdetails` response of an application.
+
+        Args:
+            app_id (int): Requested application ID.
+            query (dict[str, list[str]]): Request query parameters.
+
+        Returns:
+            dict with the response body.
+        """
+        recorded = self._recorded[app_id % len(self._recorded)]
+        data = dict(recorded["data"], steam_appid=app_id, name=f"{recorded['data']['name']} {app_id}")
+        if "filters" in query:
+            filters = set(query["filters"][0].split(","))
+            data = {
+                key: value
+                for key, value in data.items()
+                if key in filters or ("basic" in filters and key in steam.BASIC_FIELDS)
+            }
+        return {str(app_id): {"success": True, "data": data}}
+
+    def start(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # headers and body are written separately, do not wait for the client to acknowledge the headers
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                query = parse_qs(url.query)
+                if stub.latency:
+                    time.sleep(stub.latency)
+                if url.path != "/api/appdetails" or not query.get("appids", [""])[0].isdigit():
+                    body = b"null"
+                else:
+                    body = json.dumps(stub.app_details(int(query["appids"][0]), query)).encode("utf-8")
+                stub.requests += 1
+                stub.bytes_sent += len(body)
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@contextmanager
+def steam_store_stub(cache_dir: str, latency: float = 0.0):
+    """
+    Point the Steam wrapper to a `SteamStub` while the context is active, with an empty application details cache
+    stored in `cache_dir` and no rate limit.
+
+    Args:
+        cache_dir (str): Directory of the application details cache.
+        latency (float): Seconds waited before answering every request.
+
+    Yields:
+        SteamStub: running stub.
+    """
+    stub = SteamStub(latency)
+    stub.start()
+    saved = (steam.STORE_API_BASE_URL, steam.APP_DETAILS_CACHE, steam.STORE_RATE_LIMITER)
+    steam.STORE_API_BASE_URL = stub.base_url
+    steam.APP_DETAILS_CACHE = TTLCache(cache_dir)
+    steam.STORE_RATE_LIMITER = RateLimiter(rate=1_000_000, burst=1_000_000)
+    try:
+        yield stub
+    finally:
+        steam.STORE_API_BASE_URL, steam.APP_DETAILS_CACHE, steam.STORE_RATE_LIMITER = saved
+        stub.stop()
@@ -0,0 +1,303 @@
+"""
+Offline benchmarks of the soul-link hot paths. Google Sheets and the Steam store are replaced by the stand-ins of
+`benchmarks.fakes`, so results only depend on soul-link code.
+
+Usage:
+    python -m benchmarks.run                  # run everything and compare with the stored baselines
+    python -m benchmarks.run --filter tui     # run the benchmarks whose name contains `tui`
+    python -m benchmarks.run --save           # store the results as the new baselines
+
+Every benchmark runs at each list size and reports the median and minimum time of its repetitions. A benchmark is a
+regression when its median is slower than its baseline multiplied by `--tolerance`, in which case the exit code is 1.
+Baselines are only meaningful on the machine where they were stored, store them again before comparing changes on a
+different machine.
+"""
+
+import json
+import statistics
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser
+from pathlib import Path
+from unittest import mock
+
+from benchmarks.fakes import FakeSpreadsheet, FakeTerminal, make_rows, steam_store_stub
+from soul_link.collect_game_data import collect_steam_game_data, collect_steam_game_data_many
+from soul_link.data import SheetWrapper
+from soul_link.table import Table
+from soul_link.tui import TUI
+from soul_link.tui.screen import Screen
+
+BASELINES_PATH = Path(__file__).parent / "baselines.json"
+LIST_SIZES = (100, 10_000, 100_000)
+DEFAULT_REPEAT = 5
+DEFAULT_TOLERANCE = 1.5
+# Steam store requests are benchmarked with fewer items, each one is a real HTTP request to the stub
+STEAM_SIZES = (1, 100)
+# seconds waited by the Steam store stub before every answer, changed with `--latency`
+LATENCY = 0.02
+
+BENCHMARKS = {}
+
+
+class Timer:
+    """
+    Context manager measuring the timed section of a benchmark. Benchmarks can also record counters, like the
+    transferred bytes, that are reported with the timings.
+    """
+
+    def __init__(self):
+        self.elapsed = 0.0
+        self.counters: dict[str, int] = {}
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        self.elapsed += time.perf_counter() - self._start
+
+
+def benchmark(name: str, sizes: tuple[int] = LIST_SIZES):
+    """
+    Register a benchmark. The decorated function is called once per repetition with the list size and a `Timer`,
+    only the code inside the `Timer` context is measured so the setup is not.
+
+    Args:
+        name (str): Benchmark name.
+        sizes (tuple[int]): Sizes the benchmark runs at.
+    """
+
+    def register(function: callable) -> callable:
+        BENCHMARKS[name] = (function, sizes)
+        return function
+
+    return register
+
+
+def make_tui(size: int, terminal: FakeTerminal) -> TUI:
+    tui = TUI(Table(make_rows(size)), on_data_update=lambda data: None)
+    tui._screen = Screen(output=terminal)
+    return tui
+
+
+@benchmark("sheet.get_table")
+def sheet_get_table(size: int, timer: Timer):
+    spreadsheet = FakeSpreadsheet(make_rows(size))
+    wrapper = SheetWrapper(spreadsheet)
+    with timer:
+        wrapper.get_table()
+    timer.counters["bytes"] = spreadsheet.bytes_transferred
+
+
+@benchmark("sheet.get_table_paged")
+def sheet_get_table_paged(size: int, timer: Timer):
+    spreadsheet = FakeSpreadsheet(make_rows(size))
+    wrapper = SheetWrapper(spreadsheet)
+    # time until the first page can be displayed, the rest is downloaded in the background
+    with timer:
+        table = wrapper.get_table_paged()
+    timer.counters["bytes"] = spreadsheet.bytes_transferred
+    table.wait()
+
+
+@benchmark("sheet.update_sheet")
+def sheet_update_sheet(size: int, timer: Timer):
+    spreadsheet = FakeSpreadsheet(make_rows(size))
+    wrapper = SheetWrapper(spreadsheet)
+    data = wrapper.get_table()
+    data.delete(size // 2)
+    data.update(size // 4, 0, "Renamed game")
+    data.append(make_rows(1, seed=1)[1])
+    spreadsheet.bytes_transferred = 0
+    with timer:
+        wrapper.update_sheet(data)
+    timer.counters["bytes"] = spreadsheet.bytes_transferred
+
+
+@benchmark("sheet.poll_unchanged")
+def sheet_poll_unchanged(size: int, timer: Timer):
+    spreadsheet = FakeSpreadsheet(make_rows(size))
+    wrapper = SheetWrapper(spreadsheet)
+    data = wrapper.get_table()
+    wrapper.merge_remote_changes(data)
+    spreadsheet.bytes_transferred = 0
+    with timer:
+        wrapper.merge_remote_changes(data)
+    timer.counters["bytes"] = spreadsheet.bytes_transferred
+
+
+@benchmark("sheet.merge_remote_changes")
+def sheet_merge_remote_changes(size: int, timer: Timer):
+    spreadsheet = FakeSpreadsheet(make_rows(size))
+    wrapper = SheetWrapper(spreadsheet)
+    data = wrapper.get_table()
+    wrapper.merge_remote_changes(data)
+    data.update(size // 4, 0, "Renamed game")
+    rows = spreadsheet.worksheet.rows
+    rows[size // 2][2] = "Edited by another user"
+    del rows[3 * size // 4]
+    rows.append(make_rows(1, seed=1)[1])
+    spreadsheet.touch()
+    spreadsheet.bytes_transferred = 0
+    with timer:
+        wrapper.merge_remote_changes(data)
+    timer.counters["bytes"] = spreadsheet.bytes_transferred
+
+
+@benchmark("tui.first_frame")
+def tui_first_frame(size: int, timer: Timer):
+    terminal = FakeTerminal()
+    with mock.patch("os.get_terminal_size", terminal.get_terminal_size):
+        tui = make_tui(size, terminal)
+        with timer:
+            tui._display()
+    timer.counters["bytes"] = terminal.bytes_written
+
+
+@benchmark("tui.scroll")
+def tui_scroll(size: int, timer: Timer):
+    terminal = FakeTerminal()
+    with mock.patch("os.get_terminal_size", terminal.get_terminal_size):
+        tui = make_tui(size, terminal)
+        tui._mode = tui._MODE_ROW
+        tui._display()
+        terminal.bytes_written = 0
+        with timer:
+            # move the cursor past the bottom of the terminal, so every step scrolls the viewport
+            for _ in range(terminal.lines * 2):
+                tui._add_cursor_line(tui._CURSOR_DOWN)
+                tui._display()
+    timer.counters["bytes"] = terminal.bytes_written
+
+
+@benchmark("tui.delete_row")
+def tui_delete_row(size: int, timer: Timer):
+    terminal = FakeTerminal()
+    with mock.patch("os.get_terminal_size", terminal.get_terminal_size):
+        tui = make_tui(size, terminal)
+        tui._mode = tui._MODE_ROW
+        tui._display()
+        terminal.bytes_written = 0
+        with timer:
+            for _ in range(10):
+                tui._data.delete(tui._cursor_line)
+                tui._display()
+    timer.counters["bytes"] = terminal.bytes_written
+
+
+@benchmark("steam.collect", sizes=STEAM_SIZES)
+def steam_collect(size: int, timer: Timer):
+    urls = [f"https://store.steampowered.com/app/{1000 + i}/" for i in range(size)]
+    with tempfile.TemporaryDirectory() as cache_dir, steam_store_stub(cache_dir, latency=LATENCY) as stub:
+        with timer:
+            if size == 1:
+                collect_steam_game_data(urls[0])
+            else:
+                for result in collect_steam_game_data_many(urls):
+                    if result.error:
+                        raise result.error
+        timer.counters["bytes"] = stub.bytes_sent
+
+
+@benchmark("steam.collect_cached", sizes=STEAM_SIZES)
+def steam_collect_cached(size: int, timer: Timer):
+    urls = [f"https://store.steampowered.com/app/{1000 + i}/" for i in range(size)]
+    with tempfile.TemporaryDirectory() as cache_dir, steam_store_stub(cache_dir, latency=LATENCY):
+        for url in urls:
+            collect_steam_game_data(url)
+        with timer:
+            for result in collect_steam_game_data_many(urls):
+                if result.error:
+                    raise result.error
+
+
+def run(names: list[str], sizes: tuple[int] | None, repeat: int) -> dict[str, dict]:
+    """
+    Run benchmarks.
+
+    Args:
+        names (list[str]): Names of the benchmarks to run.
+        sizes (tuple[int] | None): List sizes to run, `None` to run every size of each benchmark.
+        repeat (int): Repetitions of every benchmark and size.
+
+    Returns:
+        dict[str, dict] mapping `name[size]` to the median and minimum seconds and the recorded counters.
+    """
+    results = {}
+    for name in names:
+        function, benchmark_sizes = BENCHMARKS[name]
+        for size in benchmark_sizes:
+            if sizes and benchmark_sizes is LIST_SIZES and size not in sizes:
+                continue
+            timings = []
+            for _ in range(repeat):
+                timer = Timer()
+                function(size, timer)
+                timings.append(timer.elapsed)
+            results[f"{name}[{size}]"] = {
+                "median": statistics.median(timings),
+                "min": min(timings),
+                **timer.counters,
+            }
+    return results
+
+
+def load_baselines() -> dict[str, dict]:
+    if not BASELINES_PATH.exists():
+        return {}
+    with open(BASELINES_PATH, "r") as handler:
+        return json.load(handler)
+
+
+def main() -> int:
+    global LATENCY
+
+    parser = ArgumentParser(description="Run the soul-link offline benchmarks.")
+    parser.add_argument("--filter", type=str, default="", help="Only run benchmarks whose name contains this text.")
+    parser.add_argument("--sizes", type=int, nargs="+", help=f"List sizes to run. Defaults to {LIST_SIZES}.")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Repetitions of every benchmark.")
+    parser.add_argument("--latency", type=float, default=LATENCY, help="Seconds of Steam store stub latency.")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="Slowdown factor against the baseline reported as a regression.",
+    )
+    parser.add_argument("--save", action="store_true", help="Store the results as the new baselines.")
+    args = parser.parse_args()
+    LATENCY = args.latency
+
+    names = [name for name in BENCHMARKS if args.filter in name]
+    results = run(names, tuple(args.sizes) if args.sizes else None, args.repeat)
+    baselines = load_baselines()
+
+    regressions = 0
+    print(f"{'benchmark':<32}{'median ms':>12}{'min ms':>12}{'baseline ms':>14}{'ratio':>8}{'bytes':>12}")
+    for key, result in results.items():
+        baseline = baselines.get(key, {}).get("median")
+        ratio = result["median"] / baseline if baseline else None
+        regression = ratio is not None and ratio > args.tolerance
+        regressions += regression
+        print(
+            f"{key:<32}{result['median'] * 1000:>12.3f}{result['min'] * 1000:>12.3f}"
+            f"{baseline * 1000 if baseline else float('nan'):>14.3f}{ratio or float('nan'):>8.2f}"
+            f"{result.get('bytes', ''):>12}{'  REGRESSION' if regression else ''}"
+        )
+
+    if args.save:
+        baselines.update(results)
+        with open(BASELINES_PATH, "w") as handler:
+            json.dump(baselines, handler, indent=2, sort_keys=True)
+            handler.write("\n")
+        print(f"Baselines stored in {BASELINES_PATH}")
+        return 0
+    if regressions:
+        print(f"{regressions} benchmarks are slower than their baseline")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,316 @@
+import json
+import mmap
+import re
+import struct
+from array import array
+from bisect import bisect_left
+from difflib import SequenceMatcher
+from pathlib import Path
+from threading import Lock
+from typing import NamedTuple
+
+DEFAULT_APP_LIST_PATH = "~/.config/soulink/applist.json"
+DEFAULT_APP_INDEX_PATH = "~/.config/soulink/applist.idx"
+
+_MAGIC = b"SLAPPIX1"
+# magic, number of apps and number of indexed name suffixes
+_HEADER = struct.Struct("<8sII")
+_WORD_PATTERN = re.compile(r"\w+")
+# number of candidates ranked for every requested completion
+_COMPLETE_CANDIDATES = 8
+# number of candidates ranked by similarity when looking for misspelled names
+_FUZZY_CANDIDATES = 256
+_FUZZY_MIN_PREFIX = 2
+_FUZZY_MIN_RATIO = 0.6
+
+
+class AppMatch(NamedTuple):
+    """
+    Steam application found in an `AppIndex`.
+
+    Attributes:
+        name (str): Application name.
+        app_id (int): Steam application ID.
+    """
+
+    name: str
+    app_id: int
+
+
+def normalize_name(name: str) -> str:
+    """
+    Normalize an application name for lookups: lowercase words separated by a single space, punctuation and symbols
+    like `™` are removed.
+
+    Args:
+        name (str): Application name.
+
+    Returns:
+        str with the normalized name.
+    """
+    return " ".join(_WORD_PATTERN.findall(name.lower()))
+
+
+def build_app_index(app_list_path: str | Path, index_path: str | Path):
+    """
+    Build an `AppIndex` file from a dump of the Steam `ISteamApps/GetAppList` endpoint, a JSON file like
+    `{"applist": {"apps": [{"appid": 10, "name": "Counter-Strike"}, ...]}}`. A plain list of apps is also accepted.
+
+    The index file contains, after a header, these arrays of native byte order:
+        - app IDs (uint32), one per app sorted by normalized name.
+        - offsets (uint32) of every normalized name in the keys blob, plus the end of the blob.
+        - offsets (uint32) of every display name in the names blob, plus the end of the blob.
+        - indexed suffixes (uint32 app position and uint32 offset in its key), one for every word of every normalized
+          name, sorted by the suffix text, so names can be found by any of their words.
+        - keys blob with the UTF-8 normalized names.
+        - names blob with the UTF-8 display names.
+
+    Args:
+        app_list_path (str | Path): Path of the `GetAppList` JSON dump.
+        index_path (str | Path): Path where the index is written.
+    """
+    with open(Path(app_list_path).expanduser(), "rb") as handler:
+        apps = json.load(handler)
+    if isinstance(apps, dict):
+        apps = apps["applist"]["apps"]
+
+    entries = {}
+    for app in apps:
+        key = normalize_name(app.get("name") or "")
+        if key:
+            # the dump repeats some apps, keep a single entry per app ID and name
+            entries[(key, int(app["appid"]))] = app["name"].strip()
+    ordered = sorted((key.encode("utf-8"), app_id, name) for (key, app_id), name in entries.items())
+
+    keys = [key for key, _, _ in ordered]
+    names = [name.encode("utf-8") for _, _, name in ordered]
+    suffixes = []
+    for position, key in enumerate(keys):
+        start = 0
+        while start != -1:
+            suffixes.append((key[start:], position, start))
+            start = key.find(b" ", start)
+            start = start + 1 if start != -1 else -1
+    suffixes.sort()
+
+    index_path = Path(index_path).expanduser()
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = index_path.with_suffix(".tmp")
+    with open(temp_path, "wb") as handler:
+        handler.write(_HEADER.pack(_MAGIC, len(ordered), len(suffixes)))
+        handler.write(array("I", [app_id for _, app_id, _ in ordered]).tobytes())
+        handler.write(_offsets(keys).tobytes())
+        handler.write(_offsets(names).tobytes())
+        handler.write(array("I", [value for _, position, start in suffixes for value in (position, start)]).tobytes())
+        handler.write(b"".join(keys))
+        handler.write(b"".join(names))
+    temp_path.replace(index_path)
+
+
+def load_app_index(
+    app_list_path: str | Path = DEFAULT_APP_LIST_PATH, index_path: str | Path | None = None
+) -> "AppIndex":
+    """
+    Get the `AppIndex` of a `GetAppList` dump, building the index file first if it is missing or older than the dump.
+
+    Args:
+        app_list_path (str | Path): Path of the `GetAppList` JSON dump.
+        index_path (str | Path | None): Path of the index file. Defaults to the dump path with the `.idx` suffix.
+
+    Returns:
+        AppIndex: index of the dump. The file is not read until the first lookup.
+
+    Raises:
+        FileNotFoundError: If neither the dump nor the index file exist.
+    """
+    app_list_path = Path(app_list_path).expanduser()
+    index_path = Path(index_path).expanduser() if index_path else app_list_path.with_suffix(".idx")
+    if app_list_path.exists() and (
+        not index_path.exists() or index_path.stat().st_mtime < app_list_path.stat().st_mtime
+    ):
+        build_app_index(app_list_path, index_path)
+    if not index_path.exists():
+        raise FileNotFoundError(f"Missing Steam application list '{app_list_path}'")
+    return AppIndex(index_path)
+
+
+class AppIndex:
+    """
+    Lookup of Steam application IDs by name, stored in a file built by `build_app_index`.
+
+    The file is memory mapped on the first lookup and its arrays are read in place, so opening the index costs
+    nothing and only the pages touched by the lookups are read from disk. Names are found with binary searches over
+    the sorted name suffixes, which takes a few microseconds even with the whole Steam catalog.
+    """
+
+    def __init__(self, path: str | Path = DEFAULT_APP_INDEX_PATH):
+        """
+        Args:
+            path (str | Path): Path of the index file.
+        """
+        self._path = Path(path).expanduser()
+        self._lock = Lock()
+        self._mmap: mmap.mmap | None = None
+
+    def __len__(self) -> int:
+        self._load()
+        return len(self._app_ids)
+
+    def close(self):
+        """
+        Unmap the index file. It is mapped again by the next lookup.
+        """
+        with self._lock:
+            if self._mmap is not None:
+                # arrays are views of the map, they must be released before closing it
+                for view in (self._app_ids, self._key_offsets, self._name_offsets, self._suffixes):
+                    view.release()
+                self._mmap.close()
+                self._mmap = None
+
+    def complete(self, prefix: str, limit: int = 10) -> list[AppMatch]:
+        """
+        Find the applications with a name word starting with `prefix`, meant to suggest names while they are being
+        typed. Exact matches come first, then names starting with `prefix` and then names containing it, shorter
+        names first.
+
+        Args:
+            prefix (str): Typed name.
+            limit (int): Maximum number of returned matches.
+
+        Returns:
+            list[AppMatch] with the found applications.
+        """
+        key = normalize_name(prefix).encode("utf-8")
+        if not key:
+            return []
+        self._load()
+        start, end = self._suffix_range(key)
+        # every suffix of the range matches, when there are many the first ones are enough to rank the best matches
+        ranks = {}
+        for i in range(start, min(end, start + limit * _COMPLETE_CANDIDATES)):
+            position, offset = self._suffixes[i * 2], self._suffixes[i * 2 + 1]
+            length = self._key_offsets[position + 1] - self._key_offsets[position]
+            rank = (offset != 0 or length != len(key), offset != 0, length, position)
+            ranks[position] = min(rank, ranks.get(position, rank))
+        ranked = sorted(ranks.values())
+        return [self._match(rank[-1]) for rank in ranked[:limit]]
+
+    def search(self, name: str, limit: int = 10) -> list[AppMatch]:
+        """
+        Find the applications whose name best matches `name`, tolerating misspellings. If no name contains the typed
+        words, names sharing the longest possible prefix with them are ranked by similarity.
+
+        Args:
+            name (str): Application name.
+            limit (int): Maximum number of returned matches.
+
+        Returns:
+            list[AppMatch] with the found applications, best matches first.
+        """
+        matches = self.complete(name, limit)
+        if matches:
+            return matches
+
+        key = normalize_name(name)
+        encoded_key = key.encode("utf-8")
+        for length in range(len(encoded_key) - 1, _FUZZY_MIN_PREFIX - 1, -1):
+            start, end = self._suffix_range(encoded_key[:length])
+            if start == end:
+                continue
+            matcher = SequenceMatcher(b=key)
+            scored = []
+            for i in range(start, min(end, start + _FUZZY_CANDIDATES)):
+                position = self._suffixes[i * 2]
+                matcher.set_seq1(self._key(position).decode("utf-8"))
+                if matcher.quick_ratio() >= _FUZZY_MIN_RATIO and matcher.ratio() >= _FUZZY_MIN_RATIO:
+                    scored.append((-matcher.ratio(), position))
+            if scored:
+                positions = dict.fromkeys(position for _, position in sorted(scored))
+                return [self._match(position) for position in list(positions)[:limit]]
+        return []
+
+    def resolve(self, name: str) -> int | None:
+        """
+        Args:
+            name (str): Application name, compared ignoring case and punctuation.
+
+        Returns:
+            int with the ID of the application with exactly that name, `None` if there is none.
+        """
+        # exact matches are ranked first
+        matches = self.complete(name, limit=1)
+        if matches and normalize_name(matches[0].name) == normalize_name(name):
+            return matches[0].app_id
+        return None
+
+    def _load(self):
+        with self._lock:
+            if self._mmap is not None:
+                return
+            with open(self._path, "rb") as handler:
+                self._mmap = mmap.mmap(handler.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, count, suffix_count = _HEADER.unpack_from(self._mmap)
+            if magic != _MAGIC:
+                self._mmap.close()
+                self._mmap = None
+                raise ValueError(f"'{self._path}' is not a Steam application index")
+
+            view = memoryview(self._mmap)
+            offset = _HEADER.size
+            arrays = []
+            for length in (count, count + 1, count + 1, suffix_count * 2):
+                arrays.append(view[offset : offset + length * 4].cast("I"))
+                offset += length * 4
+            view.release()
+            self._app_ids, self._key_offsets, self._name_offsets, self._suffixes = arrays
+            self._keys_start = offset
+            self._names_start = offset + self._key_offsets[-1]
+
+    def _key(self, position: int) -> bytes:
+        return self._mmap[
+            self._keys_start + self._key_offsets[position] : self._keys_start + self._key_offsets[position + 1]
+        ]
+
+    def _suffix_range(self, key: bytes) -> tuple[int, int]:
+        """
+        Get the range of indexed suffixes starting with `key`.
+        """
+        suffixes = _Suffixes(self)
+        start = bisect_left(suffixes, key)
+        # `key` followed by a byte that never appears in UTF-8 sorts after every suffix starting with `key`
+        end = bisect_left(suffixes, key + b"\xff", start)
+        return start, end
+
+    def _match(self, position: int) -> AppMatch:
+        start = self._names_start + self._name_offsets[position]
+        name = self._mmap[start : self._names_start + self._name_offsets[position + 1]].decode("utf-8")
+        return AppMatch(name, self._app_ids[position])
+
+
+class _Suffixes:
+    """
+    Read only sequence of the indexed suffixes of an `AppIndex`, so they can be searched with `bisect` without being
+    copied.
+    """
+
+    def __init__(self, index: AppIndex):
+        self._mmap = index._mmap
+        self._suffixes = index._suffixes
+        self._key_offsets = index._key_offsets
+        self._keys_start = index._keys_start
+
+    def __len__(self) -> int:
+        return len(self._suffixes) // 2
+
+    def __getitem__(self, i: int) -> bytes:
+        position = self._suffixes[i * 2]
+        start = self._keys_start + self._key_offsets[position]
+        return self._mmap[start + self._suffixes[i * 2 + 1] : self._keys_start + self._key_offsets[position + 1]]
+
+
+def _offsets(blobs: list[bytes]) -> array:
+    offsets = array("I", [0])
+    for blob in blobs:
+        offsets.append(offsets[-1] + len(blob))
+    return offsets
@@ -1,15 +1,41 @@
-from soul_link.wrappers.steam import get_app_details, get_app_id_from_store_url
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import NamedTuple
 
+from soul_link.wrappers.steam import (
+    APP_DETAILS_FIELDS,
+    SteamAppNotFound,
+    get_app_details,
+    get_app_id_from_store_url,
+)
 
-def collect_steam_game_data(url: str) -> dict:
+
+class CollectResult(NamedTuple):
+    """
+    Result of collecting the game data of a single URL with `collect_steam_game_data_many`.
+
+    Attributes:
+        url (str): Requested URL.
+        data (dict | None): Game data as returned by `collect_steam_game_data`, `None` if the collection failed.
+        error (Exception | None): Exception raised while collecting the game data, `None` if it succeeded.
+    """
+
+    url: str
+    data: dict | None
+    error: Exception | None
+
+
+def collect_steam_game_data(url: str, use_cache: bool = True) -> dict:
     """
     Get Steam game store details.
 
     Args:
         url (str): URL where the Steam application ID will be gathered to collect game data.
+        use_cache (bool): If `False`, bypass the Steam application details cache and always request the store.
 
     Returns:
         dict: the dictionary has the following keys:
+            - app_id (int): Steam application ID.
             - name (str): Game name.
             - is_free (bool): `true` if the game is free, `false` otherwise.
             - short_description (str): Steam game short description.
@@ -25,15 +51,97 @@ def collect_steam_game_data(url: str) -> dict:
     if not url.startswith("https://store.steampowered.com"):
         print("Currently we only support Steam store URLs")
 
-    app_id = str(get_app_id_from_store_url(url))
-    app_details = get_app_details(app_id)
-
-    if app_id not in app_details or not app_details[app_id]["success"]:
+    try:
+        return _collect_steam_game_data(url, use_cache)
+    except SteamAppNotFound:
         print("Game does not exist")
         return
 
+
+def collect_steam_game_data_many(
+    urls: Iterable[str], max_workers: int = 8, use_cache: bool = True
+) -> Iterator[CollectResult]:
+    """
+    Get Steam game store details for many URLs concurrently. URLs are consumed lazily from `urls`, so it can be a
+    generator reading from a file, and results are yielded as soon as they are available, which means that they are
+    not yielded in the same order as `urls`.
+
+    All the requests share the Steam wrapper connection pool and rate limiter. A failing URL does not stop the batch,
+    its error is reported in the yielded `CollectResult`. If the generator is closed before it is exhausted, the
+    queued requests are cancelled and only the running ones are waited for.
+
+    Args:
+        urls (Iterable[str]): URLs where the Steam application IDs will be gathered to collect game data.
+        max_workers (int): Maximum number of concurrent requests.
+        use_cache (bool): If `False`, bypass the Steam application details cache and always request the store.
+
+    Yields:
+        CollectResult: one result for every given URL.
+    """
+    urls = iter(urls)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = {}
+
+        def submit(count: int):
+            for url in urls:
+                pending[executor.submit(_collect_steam_game_data, url, use_cache)] = url
+                count -= 1
+                if count == 0:
+                    return
+
+        # keep the queue a bit longer than the pool so workers never wait for the consumer
+        submit(max_workers * 2)
+        try:
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    url = pending.pop(future)
+                    error = future.exception()
+                    yield CollectResult(url, None if error else future.result(), error)
+                submit(len(done))
+        finally:
+            # the consumer stopped early, do not send the queued requests
+            for future in pending:
+                future.cancel()
+
+
+def to_sheet_row(game_data: dict, header: Iterable[str]) -> list[str]:
+    """
+    Convert game data to a sheet row.
+
+    Args:
+        game_data (dict): Game data as returned by `collect_steam_game_data`.
+        header (Iterable[str]): Sheet header. Columns without game data are left empty.
+
+    Returns:
+        list[str] with the row cells in `header` order. Booleans are written as `TRUE` or `FALSE` and lists as comma
+        separated values.
+    """
+    row = []
+    for column in header:
+        value = game_data.get(column, "")
+        if isinstance(value, bool):
+            value = "TRUE" if value else "FALSE"
+        elif isinstance(value, list):
+            value = ", ".join(value)
+        row.append(str(value))
+    return row
+
+
+def _collect_steam_game_data(url: str, use_cache: bool) -> dict:
+    """
+    Same as `collect_steam_game_data` but raising `wrappers.steam.SteamAppNotFound` instead of printing if the game
+    does not exist.
+    """
+    app_id = str(get_app_id_from_store_url(url))
+    app_details = get_app_details(app_id, use_cache=use_cache, fields=APP_DETAILS_FIELDS)
+
+    if not app_details or app_id not in app_details or not app_details[app_id]["success"]:
+        raise SteamAppNotFound(app_id)
+
     app_details = app_details[app_id]
     return_details = {}
+    return_details["app_id"] = int(app_id)
     return_details["name"] = app_details["data"]["name"]
     return_details["is_free"] = app_details["data"]["is_free"]
     return_details["short_description"] = app_details["data"]["short_description"]
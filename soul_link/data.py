@@ -1,13 +1,654 @@
-import gspread
-import numpy as np
+import re
+import time
+from difflib import SequenceMatcher
+from threading import Lock, RLock, Thread
+from typing import TYPE_CHECKING, NamedTuple
+
+from soul_link.mirror import SheetMirror
+from soul_link.profiling import PROFILER
+from soul_link.table import PagedTable, Table
+
+if TYPE_CHECKING:
+    import gspread
+
+# rows of the first request of `SheetWrapper.get_table_paged`, enough to fill the first screen
+FIRST_PAGE_ROWS = 100
+PAGE_ROWS = 2000
+# integers written as numbers, longer ones would lose precision and be read back in scientific notation
+INTEGER_CELL_PATTERN = re.compile(r"-?(0|[1-9][0-9]{0,14})")
+
+
+class MergeResult(NamedTuple):
+    """
+    Result of merging remote changes into a table with `merge_rows`.
+
+    Attributes:
+        rows (set[int]): IDs of the local rows changed or inserted by the merge.
+        deleted (int): Local rows deleted by the merge.
+        conflicts (int): Cells changed both locally and remotely to different values, the local value is kept and
+            written on the next update.
+        table (Table | None): Table replacing the local one when the header changed, `None` otherwise. If columns were
+            only added remotely, it is the local table widened with them and the changes merged, otherwise the rows can
+            not be merged and it is the remote table.
+    """
+
+    rows: set[int]
+    deleted: int
+    conflicts: int
+    table: Table | None = None
 
 
 class SheetWrapper:
-    def __init__(self, sheet: gspread.Spreadsheet):
+    def __init__(self, sheet: "gspread.Spreadsheet", mirror: SheetMirror | None = None):
+        """
+        Args:
+            sheet (gspread.Spreadsheet): Google sheet containing the game list in its first worksheet.
+            mirror (SheetMirror | None): If given, the local mirror is kept up to date with every download and upload.
+        """
         self._sheet = sheet
+        self._mirror = mirror
+        self._worksheet: "gspread.Worksheet | None" = None
+        self._synced_rows: list[tuple[str]] | None = None
+        # Google Drive modified time of `_synced_rows`, `None` if it is unknown
+        self._modified_time: str | None = None
+        # held while `_synced_rows` is compared with the sheet, so merges and updates do not interleave
+        self._lock = RLock()
+
+    def get_table(self) -> Table:
+        modified_time = self.get_modified_time() if self._mirror else None
+        worksheet = self._get_worksheet()
+        with PROFILER.span("sheets.get_all_values") as span:
+            rows = worksheet.get_all_values()
+            span.set(rows=len(rows))
+        self._synced_rows = [tuple(row) for row in rows]
+        self._modified_time = modified_time
+        if self._mirror:
+            self._mirror.save(rows, modified_time)
+        return Table(rows)
+
+    def get_table_paged(self, first_page_rows: int = FIRST_PAGE_ROWS, page_rows: int = PAGE_ROWS) -> PagedTable:
+        """
+        Download the header and the first rows and return them as a table that is filled with the rest of the rows in
+        a background thread, requesting `page_rows` rows at a time. The time until the table is returned does not
+        depend on the size of the sheet.
+
+        The sheet can not be updated until the table is complete, `update_sheet` waits for it. If the sheet was opened
+        with `soul_link.wrappers.sheets.open_by_key`, the first page downloaded when opening it is used and the table
+        is returned without any request. The modified time stored in the mirror is requested after the first page,
+        from the background thread.
+
+        Args:
+            first_page_rows (int): Rows of the first request, header excluded.
+            page_rows (int): Rows of every following request.
+
+        Returns:
+            PagedTable: table being filled.
+        """
+        worksheet = self._get_worksheet()
+        # ranges can not go past the worksheet grid, which usually has empty rows after the games
+        grid_rows = worksheet.row_count
+        last_row = min(first_page_rows + 1, grid_rows)
+        take_first_rows = getattr(self._sheet, "take_first_rows", None)
+        rows = take_first_rows(last_row) if take_first_rows else None
+        if rows is None:
+            with PROFILER.span("sheets.get_page", first_row=1) as span:
+                rows = worksheet.get(f"1:{last_row}")
+                span.set(rows=len(rows))
+        rows = _pad_rows(rows, len(rows[0]) if rows else 0)
+        table = PagedTable(rows, expected_rows=max(0, grid_rows - 1))
+        Thread(
+            target=self._download_pages,
+            args=(table, worksheet, rows, last_row, grid_rows, page_rows),
+            daemon=True,
+        ).start()
+        return table
+
+    def _download_pages(
+        self,
+        table: PagedTable,
+        worksheet: "gspread.Worksheet",
+        rows: list[list[str]],
+        last_row: int,
+        grid_rows: int,
+        page_rows: int,
+    ):
+        """
+        Download the rows after the first page into `table`. Runs in the thread started by `get_table_paged`.
+
+        The API omits the empty rows at the end of a range, they are only added to the table if a later page has rows,
+        like `gspread.Worksheet.get_all_values` does.
+        """
+        width = len(table.header)
+        try:
+            modified_time = self.get_modified_time() if self._mirror else None
+            while last_row < grid_rows:
+                first_row = last_row + 1
+                count = max(page_rows, table.take_wanted_rows() - (len(rows) - 1))
+                last_row = min(first_row + count - 1, grid_rows)
+                with PROFILER.span("sheets.get_page", first_row=first_row) as span:
+                    page = _pad_rows(worksheet.get(f"{first_row}:{last_row}"), width)
+                    span.set(rows=len(page))
+                if not page:
+                    continue
+                # empty rows between the previous page and this one
+                page = [[""] * width for _ in range(first_row - 1 - len(rows))] + page
+                rows.extend(page)
+                table.add_page(page)
+        except Exception as error:
+            table.finish(error)
+            return
+
+        self._synced_rows = [tuple(row) for row in rows]
+        self._modified_time = modified_time
+        if self._mirror:
+            self._mirror.save(rows, modified_time)
+        table.finish()
+
+    def pull_changes(self, data: Table, rows: list[list[str]], merge: callable = None) -> MergeResult | None:
+        """
+        Use `rows`, usually loaded from the local mirror, as the last synchronized state and merge into `data` the
+        changes made to the sheet since the mirror was saved, like `merge_remote_changes` does. The sheet is only
+        downloaded if it has been modified since then, and the local edits made meanwhile are kept.
+
+        Args:
+            data (Table): Local table loaded from `rows`, with changes that may not have been written yet.
+            rows (list[list[str]]): Last known rows of the sheet, header included.
+            merge (callable): Function applying the changes, refer to `merge_remote_changes`.
+
+        Returns:
+            MergeResult | None with the merged changes, `None` if `rows` is up to date.
+        """
+        with self._lock:
+            self._synced_rows = [tuple(row) for row in rows]
+            self._modified_time = self._mirror.get_modified_time() if self._mirror else None
+            return self.merge_remote_changes(data, merge)
+
+    def merge_remote_changes(self, data: Table, merge: callable = None) -> MergeResult | None:
+        """
+        Merge into `data` the changes made to the sheet by other users since it was last synchronized. Polling is
+        cheap: the sheet is only downloaded if its Google Drive modified time changed.
+
+        The Sheets API does not report which ranges changed, so the changed rows and cells are found by comparing the
+        downloaded rows with the last synchronized ones. Cells changed only remotely are copied to `data`, cells
+        changed both locally and remotely keep the local value and are counted as conflicts. The downloaded rows become
+        the synchronized state, so the next `update_sheet` only writes the local changes instead of overwriting the
+        remote ones. Columns added remotely are kept: the result holds a widened copy of `data` that must replace it.
+
+        Args:
+            data (Table): Local table, with changes that may not have been written yet.
+            merge (callable): Function applying the changes, called with `data`, the last synchronized rows and the
+                downloaded rows, and returning a `MergeResult`. Defaults to `merge_rows`.
+
+        Returns:
+            MergeResult | None with the merged changes, `None` if the sheet did not change.
+        """
+        with self._lock:
+            modified_time = self.get_modified_time()
+            if self._synced_rows is not None and modified_time == self._modified_time:
+                return None
+            worksheet = self._get_worksheet()
+            with PROFILER.span("sheets.get_all_values") as span:
+                rows = worksheet.get_all_values()
+                span.set(rows=len(rows))
+            # as wide as the widest side, columns added remotely are not dropped
+            width = max(len(data.header), max(map(len, rows), default=0))
+            rows = [tuple(row) for row in _pad_rows(rows, width)]
+            header = rows[0] if rows else ()
+            local_width = len(data.header)
+            if (
+                self._synced_rows is None
+                or self._synced_rows[:1] != [data.header]
+                or header[:local_width] != data.header
+            ):
+                result = MergeResult(rows=set(), deleted=0, conflicts=0, table=Table(rows))
+            elif width > local_width:
+                # columns added remotely, merged into a wider copy of the local table that replaces it
+                widened = Table([header] + [row + ("",) * (width - local_width) for row in data.rows()])
+                base_rows = [header] + [row + ("",) * (width - len(row)) for row in self._synced_rows[1:]]
+                with PROFILER.span("sheets.merge"):
+                    result = (merge or merge_rows)(widened, base_rows, rows)._replace(table=widened)
+            else:
+                with PROFILER.span("sheets.merge"):
+                    result = (merge or merge_rows)(data, self._synced_rows, rows)
+            self._synced_rows = rows
+            self._modified_time = modified_time
+            if self._mirror:
+                self._mirror.save(rows, modified_time)
+            return result
+
+    def get_modified_time(self) -> str:
+        """
+        Get the last time the sheet was modified. This is a single lightweight Google Drive metadata request, much
+        cheaper than downloading the sheet values.
+
+        Returns:
+            str with the RFC 3339 modified time reported by Google Drive.
+        """
+        from gspread.urls import DRIVE_FILES_API_V3_URL
+
+        with PROFILER.span("drive.modified_time"):
+            response = self._sheet.client.request(
+                "get",
+                f"{DRIVE_FILES_API_V3_URL}/{self._sheet.id}",
+                params={"fields": "modifiedTime", "supportsAllDrives": True},
+            )
+            return response.json()["modifiedTime"]
+
+    def update_sheet(self, data: Table):
+        """
+        Synchronize the sheet with the given data. Only the differences against the last synchronized state are sent,
+        in a single `batch_update` request containing the row deletions, row insertions and cell updates.
+
+        Args:
+            data (Table): Full sheet content.
+
+        Raises:
+            RuntimeError: If `data` was returned by `get_table_paged` and its download failed, writing it would delete
+                the rows that were not downloaded.
+        """
+        if isinstance(data, PagedTable):
+            data.wait()
+            if data.error is not None:
+                raise RuntimeError(f"The sheet was not fully downloaded: {data.error}")
+        with self._lock:
+            rows = data.to_rows()
+            worksheet = self._get_worksheet()
+            if self._synced_rows is None:
+                modified_time = self._get_modified_time_before_write()
+                with PROFILER.span("sheets.update", rows=len(rows)):
+                    worksheet.update(_typed_rows(rows))
+            else:
+                with PROFILER.span("sheets.diff"):
+                    requests = changeset_to_requests(worksheet.id, diff_rows(self._synced_rows, rows))
+                if not requests:
+                    return
+                modified_time = self._get_modified_time_before_write()
+                with PROFILER.span("sheets.batch_update", requests=len(requests)):
+                    self._sheet.batch_update({"requests": requests})
+            self._synced_rows = rows
+            if self._mirror:
+                self._modified_time = modified_time
+                self._mirror.save(rows, modified_time)
+
+    def overwrite_sheet(self, rows: list[list[str]]):
+        """
+        Replace the whole sheet content with `rows` in a single `update` request, without comparing it with the
+        current content like `update_sheet` does. Used to fill a new sheet.
+
+        Args:
+            rows (list[list[str]]): New sheet content, header included.
+        """
+        rows = [tuple(row) for row in rows]
+        worksheet = self._get_worksheet()
+        with self._lock:
+            modified_time = self._get_modified_time_before_write()
+            with PROFILER.span("sheets.update", rows=len(rows)):
+                worksheet.update(_typed_rows(rows))
+            self._synced_rows = rows
+            if self._mirror:
+                self._modified_time = modified_time
+                self._mirror.save(rows, modified_time)
+
+    def append_rows(self, rows: list[list[str]]):
+        """
+        Add rows at the end of the sheet in a single `append_rows` request, without comparing the whole sheet like
+        `update_sheet` does. The sheet must have been downloaded with `get_table` or `pull_changes` first.
+
+        Args:
+            rows (list[list[str]]): Appended rows.
+        """
+        if not rows:
+            return
+        worksheet = self._get_worksheet()
+        with self._lock:
+            modified_time = self._get_modified_time_before_write()
+            with PROFILER.span("sheets.append_rows", rows=len(rows)):
+                worksheet.append_rows(_typed_rows(rows), value_input_option="RAW")
+            self._synced_rows.extend(tuple(row) for row in rows)
+            if self._mirror:
+                self._modified_time = modified_time
+                self._mirror.save(self._synced_rows, modified_time)
+
+    def _get_modified_time_before_write(self) -> str | None:
+        """
+        Get the modified time stored after a write, requested before writing. The time after the write could include
+        a change made by another user right after it, which would never be merged. The write itself changes the
+        modified time, so the next poll downloads the sheet once and finds no changes.
+        """
+        return self.get_modified_time() if self._mirror else None
+
+    def _get_worksheet(self) -> "gspread.Worksheet":
+        if self._worksheet is None:
+            with PROFILER.span("sheets.get_worksheet"):
+                self._worksheet = self._sheet.get_worksheet(0)
+        return self._worksheet
+
+
+class SheetOpener:
+    """
+    Open the sheet of a list when it is first needed and keep the `SheetWrapper` for the rest of the run. A failed
+    open is not kept: the next `get` call after an increasing delay tries again, so a short network drop does not
+    leave the list unable to synchronize until the program is started again.
+    """
+
+    _MAX_RETRY_DELAY = 60
+
+    def __init__(
+        self,
+        open_wrapper: callable,
+        sheet_wrapper: SheetWrapper | None = None,
+        retry_delay: float = 1.0,
+        on_error: callable = None,
+    ):
+        """
+        Args:
+            open_wrapper (callable): Function returning the opened `SheetWrapper`, it can raise if the sheet is not
+                reachable.
+            sheet_wrapper (SheetWrapper | None): Already opened wrapper, `open_wrapper` is not called if given.
+            retry_delay (float): Seconds to wait after the first failure, doubled after every failure.
+            on_error (callable): Function called with the error every time the sheet can not be opened.
+        """
+        self._open_wrapper = open_wrapper
+        self._sheet_wrapper = sheet_wrapper
+        self._retry_delay = retry_delay
+        self._on_error = on_error
+        self._retry_at = 0.0
+        self._failures = 0
+        self._lock = Lock()
+        self.error: Exception | None = None
+
+    def done(self) -> bool:
+        return self._sheet_wrapper is not None
+
+    def get(self) -> SheetWrapper:
+        """
+        Get the wrapper of the sheet, opening it if it is not opened yet. Concurrent calls wait for a single open.
+
+        Returns:
+            SheetWrapper of the opened sheet.
+
+        Raises:
+            Exception: The error of the last attempt if the sheet can not be opened, or if it failed less than the
+                retry delay ago.
+        """
+        with self._lock:
+            if self._sheet_wrapper is not None:
+                return self._sheet_wrapper
+            if time.monotonic() < self._retry_at:
+                raise self.error.with_traceback(None)
+            try:
+                sheet_wrapper = self._open_wrapper()
+            except Exception as error:
+                self.error = error
+                self._failures += 1
+                self._retry_at = time.monotonic() + min(
+                    self._retry_delay * 2 ** (self._failures - 1), self._MAX_RETRY_DELAY
+                )
+                if self._on_error:
+                    self._on_error(error)
+                raise
+            self._sheet_wrapper = sheet_wrapper
+            self.error = None
+            return sheet_wrapper
+
+
+def _pad_rows(rows: list[list[str]], width: int) -> list[list[str]]:
+    """
+    Make every row `width` cells long. The Sheets API omits the empty cells at the end of a row.
+    """
+    return [list(row[:width]) + [""] * (width - len(row)) for row in rows]
+
+
+def diff_rows(old_rows: list[tuple[str]], new_rows: list[tuple[str]]) -> list[tuple]:
+    """
+    Compute the minimal set of operations that transform `old_rows` into `new_rows`.
+
+    Operations are returned from the bottom to the top of the sheet, so applying them in order never shifts the row
+    index of an operation that is still pending. Row indexes are zero based and refer to `old_rows`. The operations
+    are tuples with one of the following shapes:
+        - ("delete", start, end): delete rows from `start` to `end` (exclusive).
+        - ("insert", start, rows): insert `rows` before row `start`.
+        - ("update", row, column, values): overwrite the cells of `row` starting at `column` with `values`.
+
+    Args:
+        old_rows (list[tuple[str]]): Last synchronized rows.
+        new_rows (list[tuple[str]]): Rows that should be synchronized.
+
+    Returns:
+        list[tuple]: operations that should be applied.
+    """
+    operations = []
+    for tag, i1, i2, j1, j2 in reversed(_row_opcodes(old_rows, new_rows)):
+        if tag == "equal":
+            continue
+
+        common = 0
+        if tag == "replace":
+            common = min(i2 - i1, j2 - j1)
+        if i2 - i1 > common:
+            operations.append(("delete", i1 + common, i2))
+        if j2 - j1 > common:
+            operations.append(("insert", i1 + common, new_rows[j1 + common : j2]))
+        for offset in reversed(range(common)):
+            operations.extend(_diff_cells(i1 + offset, old_rows[i1 + offset], new_rows[j1 + offset]))
+    return operations
+
+
+def _row_opcodes(old_rows: list[tuple[str]], new_rows: list[tuple[str]]) -> list[tuple[str, int, int, int, int]]:
+    """
+    Get the `difflib.SequenceMatcher` opcodes that transform `old_rows` into `new_rows`, covering both lists.
+    """
+    # skip the common head and tail before running the more expensive sequence matching
+    start = 0
+    max_start = min(len(old_rows), len(new_rows))
+    while start < max_start and old_rows[start] == new_rows[start]:
+        start += 1
+    end = 0
+    max_end = max_start - start
+    while end < max_end and old_rows[-end - 1] == new_rows[-end - 1]:
+        end += 1
+
+    matcher = SequenceMatcher(
+        None, old_rows[start : len(old_rows) - end], new_rows[start : len(new_rows) - end], autojunk=False
+    )
+    opcodes = [("equal", 0, start, 0, start)] if start else []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        opcodes.append((tag, i1 + start, i2 + start, j1 + start, j2 + start))
+    if end:
+        opcodes.append(("equal", len(old_rows) - end, len(old_rows), len(new_rows) - end, len(new_rows)))
+    return opcodes
+
+
+def _match_rows(old_rows: list[tuple[str]], new_rows: list[tuple[str]]) -> dict[int, int]:
+    """
+    Map every row of `old_rows` that is kept in `new_rows`, unchanged or with changed cells, to its new position. Rows
+    are matched like `diff_rows` does, changed rows are the ones replaced by the same number of rows.
+    """
+    matches = {}
+    for tag, i1, i2, j1, j2 in _row_opcodes(old_rows, new_rows):
+        if tag in ("equal", "replace"):
+            for offset in range(min(i2 - i1, j2 - j1)):
+                matches[i1 + offset] = j1 + offset
+    return matches
+
+
+def merge_rows(data: Table, base_rows: list[tuple[str]], remote_rows: list[tuple[str]]) -> MergeResult:
+    """
+    Three way merge of the changes made to the sheet by other users into the local table. Rows and cells changed
+    only remotely are applied to `data`, rows and cells changed only locally are kept. A cell changed on both sides
+    to different values is a conflict and keeps its local value, as well as a row deleted on one side and changed on
+    the other one. Remotely inserted rows are placed after the local copy of the row preceding them.
+
+    Only the rows around the remote changes are compared cell by cell, the rest are skipped as whole rows.
+
+    Args:
+        data (Table): Local table, modified in place.
+        base_rows (list[tuple[str]]): Last synchronized rows, header included.
+        remote_rows (list[tuple[str]]): Current sheet rows, header included, as wide as `data`.
+
+    Returns:
+        MergeResult: changed rows and conflicts.
+    """
+    remote_changes = [opcode for opcode in _row_opcodes(base_rows, remote_rows) if opcode[0] != "equal"]
+    if not remote_changes:
+        return MergeResult(rows=set(), deleted=0, conflicts=0)
+
+    changed: set[int] = set()
+    conflicts = 0
+    with data.lock:
+        local_rows = data.to_rows()
+        row_ids = data.row_ids()
+        to_local = _match_rows(base_rows, local_rows)
+        deleted = []
+        # (local position the rows go after, rows)
+        inserted: list[tuple[int, list[tuple[str]]]] = []
+        for tag, i1, i2, j1, j2 in remote_changes:
+            common = min(i2 - i1, j2 - j1) if tag == "replace" else 0
+            for base, remote in zip(range(i1, i1 + common), range(j1, j1 + common)):
+                local = to_local.get(base)
+                if local is None:
+                    # changed remotely and deleted locally, the local deletion wins
+                    conflicts += 1
+                    continue
+                for column, (base_cell, remote_cell, local_cell) in enumerate(
+                    zip(base_rows[base], remote_rows[remote], local_rows[local])
+                ):
+                    if remote_cell in (base_cell, local_cell):
+                        continue
+                    if local_cell != base_cell:
+                        conflicts += 1
+                        continue
+                    data.update(local - 1, column, remote_cell)
+                    changed.add(row_ids[local - 1])
+            for base in range(i1 + common, i2):
+                local = to_local.get(base)
+                if local is None:
+                    continue
+                if local_rows[local] == base_rows[base]:
+                    deleted.append(local - 1)
+                else:
+                    # deleted remotely and changed locally, the local row is kept
+                    conflicts += 1
+            if j2 - j1 > common:
+                # the closest preceding row that is still in the local table
+                anchor = i1 + common - 1
+                while anchor > 0 and anchor not in to_local:
+                    anchor -= 1
+                inserted.append((to_local[anchor] - 1 if anchor > 0 else -1, remote_rows[j1 + common : j2]))
+
+        # apply from the bottom to the top so pending positions are not shifted, rows inserted after a deleted row
+        # are inserted before deleting it
+        operations = [(position, 1, rows) for position, rows in inserted] + [
+            (position, 0, None) for position in deleted
+        ]
+        for position, is_insert, rows in sorted(operations, key=lambda operation: operation[:2], reverse=True):
+            if is_insert:
+                for offset, row in enumerate(rows, start=position + 1):
+                    changed.add(data.insert(offset, row))
+            else:
+                data.delete(position)
+    return MergeResult(rows=changed, deleted=len(deleted), conflicts=conflicts)
+
+
+def _diff_cells(row_index: int, old_row: tuple[str], new_row: tuple[str]) -> list[tuple]:
+    """
+    Compute the update operation for a single row. The operation covers from the first to the last changed cell.
+    """
+    old_row = old_row + ("",) * (len(new_row) - len(old_row))
+    new_row = new_row + ("",) * (len(old_row) - len(new_row))
+    changed = [i for i, (old, new) in enumerate(zip(old_row, new_row)) if old != new]
+    if not changed:
+        return []
+    return [("update", row_index, changed[0], new_row[changed[0] : changed[-1] + 1])]
+
+
+def changeset_to_requests(sheet_id: int, operations: list[tuple]) -> list[dict]:
+    """
+    Translate the operations returned by `diff_rows` into Google Sheets API `batchUpdate` requests.
+
+    Args:
+        sheet_id (int): ID of the worksheet where the operations are applied.
+        operations (list[tuple]): Operations returned by `diff_rows`.
+
+    Returns:
+        list[dict]: requests for the `spreadsheets.batchUpdate` body.
+    """
+    requests = []
+    for operation in operations:
+        match operation:
+            case ("delete", start, end):
+                requests.append(
+                    {
+                        "deleteDimension": {
+                            "range": {"sheetId": sheet_id, "dimension": "ROWS", "startIndex": start, "endIndex": end}
+                        }
+                    }
+                )
+            case ("insert", start, rows):
+                requests.append(
+                    {
+                        "insertDimension": {
+                            "range": {
+                                "sheetId": sheet_id,
+                                "dimension": "ROWS",
+                                "startIndex": start,
+                                "endIndex": start + len(rows),
+                            },
+                            "inheritFromBefore": start > 0,
+                        }
+                    }
+                )
+                requests.append(_update_cells_request(sheet_id, start, 0, rows))
+            case ("update", row, column, values):
+                requests.append(_update_cells_request(sheet_id, row, column, [values]))
+    return requests
+
+
+def _update_cells_request(sheet_id: int, row: int, column: int, rows: list[tuple[str]]) -> dict:
+    return {
+        "updateCells": {
+            "start": {"sheetId": sheet_id, "rowIndex": row, "columnIndex": column},
+            "rows": [{"values": [_cell_data(value) for value in values]} for values in rows],
+            "fields": "userEnteredValue",
+        }
+    }
+
+
+def _cell_data(value: str) -> dict:
+    """
+    Get the `CellData` of a cell value, with the type given by `_typed_cell`.
+    """
+    if not value:
+        return {}
+    value = _typed_cell(value)
+    if isinstance(value, bool):
+        return {"userEnteredValue": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"userEnteredValue": {"numberValue": value}}
+    return {"userEnteredValue": {"stringValue": value}}
+
+
+def _typed_cell(value: str) -> str | bool | int:
+    """
+    Get the value written to the sheet for a cell. `TRUE` and `FALSE` are written as booleans and integers as
+    numbers, like Google Sheets parses them when they are typed, so they are not stored as text. They are read back
+    with the same representation.
+
+    Args:
+        value (str): Cell value.
+
+    Returns:
+        str | bool | int with the typed value.
+    """
+    if value == "TRUE" or value == "FALSE":
+        return value == "TRUE"
+    if INTEGER_CELL_PATTERN.fullmatch(value):
+        return int(value)
+    return value
 
-    def get_array(self) -> np.ndarray:
-        return np.array(self._sheet.get_worksheet(0).get_all_values())
 
-    def update_sheet(self, data: np.ndarray):
-        self._sheet.get_worksheet(0).update(data.tolist())
+def _typed_rows(rows: list[tuple[str]]) -> list[list[str | bool | int]]:
+    """
+    Type the cells of rows written with `RAW` input, which stores JSON booleans and numbers with their type.
+    """
+    return [[_typed_cell(value) for value in row] for row in rows]
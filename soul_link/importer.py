@@ -0,0 +1,221 @@
+import hashlib
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import NamedTuple, TextIO
+
+from soul_link.collect_game_data import collect_steam_game_data_many, to_sheet_row
+from soul_link.data import SheetWrapper
+from soul_link.wrappers.steam import (
+    SteamAppNotFound,
+    SteamInvalidAppID,
+    SteamInvalidStoreURL,
+    get_app_id_from_store_url,
+)
+
+DEFAULT_CHECKPOINT_DIR = "~/.config/soulink/imports"
+DEFAULT_CHUNK_SIZE = 100
+
+# errors that will happen again if the URL is retried, other errors, like connection errors, are retried on resume
+PERMANENT_ERRORS = (SteamAppNotFound, SteamInvalidAppID, SteamInvalidStoreURL)
+
+
+class ImportSummary(NamedTuple):
+    """
+    Result of `import_games`.
+
+    Attributes:
+        added (int): Number of rows appended to the sheet.
+        duplicates (int): URLs skipped because their game is already in the sheet or repeated in the input.
+        failed (int): URLs whose game data could not be collected.
+        resumed (int): URLs skipped because they were processed by a previous interrupted import.
+    """
+
+    added: int
+    duplicates: int
+    failed: int
+    resumed: int
+
+
+class ImportCheckpoint:
+    """
+    Record of the URLs already processed by an import, so an interrupted import resumes where it stopped. The record
+    is an append only file with one URL per line, a line is only written after its row has been appended to the sheet,
+    so an interruption never loses or duplicates rows.
+    """
+
+    def __init__(self, path: str | Path):
+        """
+        Args:
+            path (str | Path): Path of the checkpoint file.
+        """
+        self.path = Path(path).expanduser()
+        self._processed: set[str] = set()
+        if self.path.exists():
+            with open(self.path, "r") as handler:
+                self._processed = {line.rstrip("\n") for line in handler}
+        self._handler: TextIO | None = None
+
+    @classmethod
+    def for_source(cls, list_name: str, source: str, directory: str = DEFAULT_CHECKPOINT_DIR) -> "ImportCheckpoint":
+        """
+        Get the checkpoint of importing `source` into a game list.
+
+        Args:
+            list_name (str): Game list name.
+            source (str): Imported file path, `-` for the standard input.
+            directory (str): Directory where checkpoints are stored.
+
+        Returns:
+            ImportCheckpoint: checkpoint of the import.
+        """
+        source = "-" if source == "-" else str(Path(source).expanduser().resolve())
+        digest = hashlib.sha1(f"{list_name}\n{source}".encode("utf-8")).hexdigest()
+        return cls(Path(directory).expanduser() / f"{digest}.txt")
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._processed
+
+    def __len__(self) -> int:
+        return len(self._processed)
+
+    def mark(self, urls: Iterable[str]):
+        """
+        Record URLs as processed. The file is flushed before returning.
+
+        Args:
+            urls (Iterable[str]): Processed URLs.
+        """
+        if self._handler is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._handler = open(self.path, "a")
+        for url in urls:
+            self._processed.add(url)
+            self._handler.write(f"{url}\n")
+        self._handler.flush()
+
+    def close(self):
+        if self._handler is not None:
+            self._handler.close()
+            self._handler = None
+
+    def remove(self):
+        """
+        Delete the checkpoint file, once the import has finished.
+        """
+        self.close()
+        self.path.unlink(missing_ok=True)
+
+
+def read_urls(source: TextIO) -> Iterator[str]:
+    """
+    Read URLs lazily, one per line. Empty lines and lines starting with `#` are skipped.
+
+    Args:
+        source (TextIO): Text stream with the URLs.
+
+    Yields:
+        str: read URLs.
+    """
+    for line in source:
+        url = line.strip()
+        if url and not url.startswith("#"):
+            yield url
+
+
+def import_games(
+    sheet_wrapper: SheetWrapper,
+    urls: Iterable[str],
+    checkpoint: ImportCheckpoint,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_workers: int = 8,
+    on_progress: callable = None,
+) -> ImportSummary:
+    """
+    Collect the game data of every URL and append the games to the sheet. URLs are read lazily and collected
+    concurrently, finished games are appended in chunks of `chunk_size` rows with a single request per chunk, so
+    memory use does not depend on the number of URLs.
+
+    URLs recorded in `checkpoint` are skipped, as well as games already in the sheet, compared by the `app_id` column,
+    or by name if the sheet has no `app_id` column.
+
+    Args:
+        sheet_wrapper (SheetWrapper): Wrapper of the game list sheet.
+        urls (Iterable[str]): Steam store URLs.
+        checkpoint (ImportCheckpoint): Checkpoint of the import.
+        chunk_size (int): Number of rows appended per request.
+        max_workers (int): Maximum number of concurrent Steam requests.
+        on_progress (callable): Function called after every appended chunk with the current `ImportSummary`.
+
+    Returns:
+        ImportSummary: counts of the processed URLs.
+
+    Raises:
+        ValueError: If the sheet header has neither an `app_id` nor a `name` column.
+    """
+    data = sheet_wrapper.get_table()
+    header = data.header
+    if "app_id" in header:
+        column, key = header.index("app_id"), "app_id"
+    elif "name" in header:
+        column, key = header.index("name"), "name"
+    else:
+        raise ValueError("The sheet header needs an `app_id` or `name` column to import games")
+    known = {_dedupe_key(value) for value in data.column_values(column)}
+    counts = {"added": 0, "duplicates": 0, "failed": 0, "resumed": 0}
+
+    def pending_urls() -> Iterator[str]:
+        for url in urls:
+            if url in checkpoint:
+                counts["resumed"] += 1
+                continue
+            if key == "app_id":
+                try:
+                    app_id = str(get_app_id_from_store_url(url))
+                except (SteamInvalidAppID, SteamInvalidStoreURL):
+                    # let the collection report the error
+                    app_id = None
+                if app_id in known:
+                    counts["duplicates"] += 1
+                    checkpoint.mark((url,))
+                    continue
+                if app_id:
+                    known.add(app_id)
+            yield url
+
+    rows = []
+    chunk_urls = []
+
+    def flush():
+        if not chunk_urls:
+            return
+        sheet_wrapper.append_rows(rows)
+        checkpoint.mark(chunk_urls)
+        counts["added"] += len(rows)
+        rows.clear()
+        chunk_urls.clear()
+        if on_progress:
+            on_progress(ImportSummary(**counts))
+
+    for result in collect_steam_game_data_many(pending_urls(), max_workers=max_workers):
+        if result.error or not result.data:
+            counts["failed"] += 1
+            if isinstance(result.error, PERMANENT_ERRORS):
+                chunk_urls.append(result.url)
+            continue
+        if key == "name":
+            name = _dedupe_key(result.data["name"])
+            if name in known:
+                counts["duplicates"] += 1
+                chunk_urls.append(result.url)
+                continue
+            known.add(name)
+        rows.append(to_sheet_row(result.data, header))
+        chunk_urls.append(result.url)
+        if len(rows) >= chunk_size:
+            flush()
+    flush()
+    return ImportSummary(**counts)
+
+
+def _dedupe_key(value: str) -> str:
+    return value.strip().lower()
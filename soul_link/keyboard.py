@@ -1,16 +1,185 @@
+from contextlib import contextmanager
+
 import readkeys
 
 KEY_ARROW_UP = "1b5b41"
 KEY_ARROW_DOWN = "1b5b42"
 KEY_ARROW_RIGHT = "1b5b43"
 KEY_ARROW_LEFT = "1b5b44"
+KEY_PAGE_UP = "1b5b357e"
+KEY_PAGE_DOWN = "1b5b367e"
+KEY_HOME = "1b5b48"
+KEY_HOME_VT = "1b5b317e"
+KEY_END = "1b5b46"
+KEY_END_VT = "1b5b347e"
+KEY_HOME_SS3 = "1b4f48"
+KEY_END_SS3 = "1b4f46"
+KEY_TAB = "09"
+KEY_SHIFT_TAB = "1b5b5a"
 KEY_ESC = "1b"
 KEY_X = "78"
+KEY_F = "66"
+KEY_G = "67"
+KEY_S = "73"
+KEY_P = "50"
+KEY_SLASH = "2f"
+KEY_ENTER = "0d"
 KEY_BACKSPACE = "7f"
 
 COM_CTRL_D = "04"
 COM_CTRL_C = "03"
 
+_ESC = 0x1B
+_CSI = ord("[")
+_SS3 = ord("O")
+
+
+def key_to_char(key: str) -> str | None:
+    """
+    Get the printable character typed with a key press.
+
+    Args:
+        key (str): hexadecimal `str` representation of the ANSI scape sequence.
+
+    Returns:
+        str with the typed character, `None` if the key press is not a single printable character.
+    """
+    try:
+        char = bytes.fromhex(key).decode("utf-8")
+    except ValueError:
+        return None
+    if len(char) != 1 or not char.isprintable():
+        return None
+    return char
+
+
+class KeyDecoder:
+    """
+    Split raw terminal input in key presses. Several key presses can be read at once, for example while a key is held
+    down, and an escape sequence can be split between two reads, so incomplete sequences are kept until more input
+    arrives or `KeyDecoder.flush` is called.
+
+    Keys are returned as the hexadecimal `str` representation of their bytes, like the `KEY_*` constants.
+    """
+
+    def __init__(self):
+        self._pending = b""
+
+    @property
+    def pending(self) -> bool:
+        """
+        `True` if the last fed input ended with an incomplete key.
+        """
+        return bool(self._pending)
+
+    def feed(self, data: bytes) -> list[str]:
+        """
+        Args:
+            data (bytes): Input read from the terminal.
+
+        Returns:
+            list[str] with the complete keys, in the order they were pressed.
+        """
+        data = self._pending + data
+        keys = []
+        i = 0
+        while i < len(data):
+            length = _key_length(data, i)
+            if length is None:
+                break
+            keys.append(data[i : i + length].hex())
+            i += length
+        self._pending = data[i:]
+        return keys
+
+    def flush(self) -> list[str]:
+        """
+        Get the pending incomplete key. Called when no more input arrives after an escape byte, which means that the
+        escape key itself was pressed.
+
+        Returns:
+            list[str] with the pending keys.
+        """
+        pending = self._pending
+        self._pending = b""
+        if not pending:
+            return []
+        return [pending[:1].hex()] + self.feed(pending[1:]) + self.flush()
+
+
+def coalesce_keys(keys: list[str], repeatable: tuple[str]) -> list[tuple[str, int]]:
+    """
+    Fold consecutive presses of the same repeatable key, like the arrows while they are held down, so they can be
+    handled once.
+
+    Args:
+        keys (list[str]): Keys as returned by `KeyDecoder.feed`.
+        repeatable (tuple[str]): Keys that can be folded.
+
+    Returns:
+        list[tuple[str, int]] with every key and its number of consecutive presses.
+    """
+    coalesced = []
+    for key in keys:
+        if coalesced and coalesced[-1][0] == key and key in repeatable:
+            coalesced[-1] = (key, coalesced[-1][1] + 1)
+        else:
+            coalesced.append((key, 1))
+    return coalesced
+
+
+@contextmanager
+def raw_input_mode(fd: int):
+    """
+    Context manager disabling line buffering, echo and signal keys of a terminal, so every key press, `Ctrl+C`
+    included, can be read as soon as it is pressed. The previous settings are restored on exit. It does nothing where
+    `termios` is not available.
+
+    Args:
+        fd (int): File descriptor of the terminal input.
+    """
+    try:
+        import termios
+    except ImportError:
+        yield
+        return
+
+    attributes = termios.tcgetattr(fd)
+    raw = termios.tcgetattr(fd)
+    raw[0] &= ~(termios.BRKINT | termios.ICRNL | termios.INPCK | termios.ISTRIP | termios.IXON)
+    raw[3] &= ~(termios.ECHO | termios.ICANON | termios.IEXTEN | termios.ISIG)
+    raw[6][termios.VMIN] = 1
+    raw[6][termios.VTIME] = 0
+    termios.tcsetattr(fd, termios.TCSAFLUSH, raw)
+    try:
+        yield
+    finally:
+        termios.tcsetattr(fd, termios.TCSAFLUSH, attributes)
+
+
+def _key_length(data: bytes, i: int) -> int | None:
+    """
+    Get the length of the key starting at `data[i]`, `None` if the key is incomplete.
+    """
+    byte = data[i]
+    if byte == _ESC:
+        if i + 1 >= len(data):
+            return None
+        if data[i + 1] == _CSI:
+            # parameter and intermediate bytes until a final byte in the range 0x40-0x7E
+            j = i + 2
+            while j < len(data) and 0x20 <= data[j] <= 0x3F:
+                j += 1
+            return j - i + 1 if j < len(data) else None
+        if data[i + 1] == _SS3:
+            return 3 if i + 2 < len(data) else None
+        return 1
+    if byte < 0xC0:
+        return 1
+    # UTF-8 lead byte
+    length = 2 if byte < 0xE0 else 3 if byte < 0xF0 else 4
+    return length if i + length <= len(data) else None
+
 
 def _default_on_key_press(key: str) -> bool:
     """
@@ -1,24 +1,117 @@
 import json
 import os
 import sys
-from argparse import ArgumentParser
+from argparse import ArgumentParser, Namespace
+from concurrent.futures import Future
 from pathlib import Path
+from threading import Lock, Thread
+from typing import TYPE_CHECKING
+
+from soul_link.app_index import DEFAULT_APP_LIST_PATH, load_app_index
+from soul_link.data import MergeResult, SheetOpener, SheetWrapper, merge_rows
+from soul_link.mirror import SheetMirror
+from soul_link.profiling import PROFILER
+from soul_link.session import DEFAULT_MAX_ROWS, LoadedList, Session
+from soul_link.snapshot import SNAPSHOT_FORMATS, is_snapshot
+from soul_link.sync import WriteBehindSync
+from soul_link.table import Table
+from soul_link.tui import TUI
+from soul_link.watch import RemoteChangeWatcher
 
-import gspread
+if TYPE_CHECKING:
+    # imported when needed, importing gspread takes longer than the rest of the program startup
+    import gspread
 
-from soul_link.data import SheetWrapper
-from soul_link.tui import TUI
+    from soul_link.refresh import StalenessRefresher
 
 DEFAULT_SERVICE_ACCOUNT_FILE_PATH = "./service_account.json"
 ENV_VAR_SEVICE_ACCOUNT_FILE_PATH = "SOUL_SERVICE_ACCOUNT"
 USER_DATA = "~/.config/soulink/user.data"
 
-DEFAULT_SHEET_HEADER = ["name", "is_free", "short_description", "categories", "genres", "released"]
+DEFAULT_SHEET_HEADER = ["name", "is_free", "short_description", "categories", "genres", "released", "app_id"]
+STORE_URL_PREFIX = "https://store.steampowered.com"
+PROFILE_FORMATS = ("summary", "trace")
+DEFAULT_PROFILE_OUTPUT = "soulink-trace.json"
+
+# user data can be written by the threads loading the lists of a session
+_USER_DATA_LOCK = Lock()
 
 
 def get_parser() -> ArgumentParser:
     parser = ArgumentParser()
     parser.add_argument("list", type=str, help="Game list name.")
+    parser.add_argument(
+        "--profile",
+        choices=PROFILE_FORMATS,
+        help="Time network calls, rendering and key presses and, on exit, print a summary or write a Chrome trace.",
+    )
+    parser.add_argument(
+        "--profile-output",
+        type=str,
+        default=DEFAULT_PROFILE_OUTPUT,
+        help=f"Path of the Chrome trace written with `--profile trace`. Defaults to {DEFAULT_PROFILE_OUTPUT}.",
+    )
+    parser.add_argument(
+        "--session",
+        action="store_true",
+        help="Load every list of the user data in the background and switch between them with Tab and Shift+Tab.",
+    )
+    parser.add_argument(
+        "--max-rows",
+        type=int,
+        default=DEFAULT_MAX_ROWS,
+        help=f"Rows kept in memory by `--session`, across every list. Defaults to {DEFAULT_MAX_ROWS}.",
+    )
+    subparsers = parser.add_subparsers(dest="command")
+
+    add_parser = subparsers.add_parser("add", help="Add a game to the list.")
+    add_parser.add_argument("game", type=str, nargs="+", help="Steam store URL or game name.")
+    add_parser.add_argument(
+        "--app-list",
+        type=str,
+        default=DEFAULT_APP_LIST_PATH,
+        help="Dump of the Steam GetAppList endpoint used to find games by name.",
+    )
+
+    import_parser = subparsers.add_parser("import", help="Add the games of a file with one Steam store URL per line.")
+    import_parser.add_argument(
+        "file", type=str, nargs="?", default="-", help="File with the URLs. Defaults to the standard input."
+    )
+    import_parser.add_argument(
+        "--chunk-size", type=int, default=100, help="Number of games appended to the sheet per request."
+    )
+    import_parser.add_argument("--workers", type=int, default=8, help="Maximum number of concurrent Steam requests.")
+    import_parser.add_argument(
+        "--restart", action="store_true", help="Ignore the progress of a previous interrupted import of the file."
+    )
+    import_parser.add_argument(
+        "--format",
+        choices=SNAPSHOT_FORMATS,
+        default=None,
+        help="Import a snapshot written by `export` instead of URLs. Detected from the file extension by default.",
+    )
+
+    export_parser = subparsers.add_parser("export", help="Write the list to a Parquet or Feather snapshot file.")
+    export_parser.add_argument("file", type=str, help="Snapshot path.")
+    export_parser.add_argument(
+        "--format",
+        choices=SNAPSHOT_FORMATS,
+        default=None,
+        help="Snapshot format. Detected from the file extension by default.",
+    )
+
+    refresh_parser = subparsers.add_parser(
+        "refresh", help="Download again the Steam data of the games whose data is stale and update the changed cells."
+    )
+    refresh_parser.add_argument(
+        "--limit", type=int, default=None, help="Maximum number of games downloaded. Defaults to every stale game."
+    )
+    refresh_parser.add_argument(
+        "--rate",
+        type=float,
+        default=None,
+        help="Maximum Steam requests per second. Defaults to the Steam store rate limit.",
+    )
     return parser
 
 
@@ -72,11 +165,11 @@ def write_user_data(user_data: dict):
     Args:
         dict that will be written to `user.data` file.
     """
-    with open(Path(USER_DATA).expanduser(), "w") as handler:
+    with _USER_DATA_LOCK, open(Path(USER_DATA).expanduser(), "w") as handler:
         json.dump(user_data, handler)
 
 
-def create_default_sheet(gc: gspread.client.Client, sheet_title: str) -> gspread.Spreadsheet:
+def create_default_sheet(gc: "gspread.Client", sheet_title: str) -> "gspread.Spreadsheet":
     """
     Create sheet with the given title.
 
@@ -94,17 +187,530 @@ def create_default_sheet(gc: gspread.client.Client, sheet_title: str) -> gspread
     permissionId = res.json()["id"]
     sheet.transfer_ownership(permissionId)
 
-    worksheet = sheet.get_worksheet(0)
-    for i, header in enumerate(DEFAULT_SHEET_HEADER, start=1):
-        worksheet.update_cell(1, i, header)
+    sheet.get_worksheet(0).update([DEFAULT_SHEET_HEADER])
     print(f"Sheet created and tranferred to {user_input}!")
+    return sheet
+
+
+def open_sheet(gc: "gspread.Client", user_data: dict, list_name: str, create: bool = True) -> "gspread.Spreadsheet":
+    """
+    Open the sheet of a list. The sheet is opened by its key, which is a single request that also downloads the first
+    page of the list, if the key is stored in `user_data`. Otherwise the sheet is searched by title in Google Drive, or
+    created if it does not exist, and its key is stored in `user_data` for the next runs.
+
+    Args:
+        user_data (dict): User data, as returned by `load_user_data`.
+        list_name (str): Game list name.
+        create (bool): If `False`, `gspread.SpreadsheetNotFound` is raised instead of creating a missing sheet.
+
+    Returns:
+        gspread.Spreadsheet: opened Sheet.
+
+    Raises:
+        gspread.SpreadsheetNotFound: If the sheet does not exist and `create` is `False`.
+    """
+    import gspread
+
+    from soul_link.wrappers.sheets import open_by_key
+
+    list_data = user_data[list_name]
+    if "key" in list_data:
+        try:
+            with PROFILER.span("sheets.open_by_key"):
+                # the first page of the list is downloaded in the same request
+                return open_by_key(gc, list_data["key"])
+        except gspread.SpreadsheetNotFound:
+            # the sheet was deleted or is not shared anymore, look for it by title
+            pass
+
+    sheet_title = list_data["title"]
+    try:
+        with PROFILER.span("sheets.open"):
+            sheet = gc.open(sheet_title)
+    except gspread.SpreadsheetNotFound:
+        if not create:
+            raise
+        print(f"There is not Google sheet with the title {sheet_title}!")
+        print(f"Creating sheet {sheet_title}...")
+        sheet = create_default_sheet(gc, sheet_title)
+    list_data["key"] = sheet.id
+    write_user_data(user_data)
+    return sheet
+
+
+def find_store_url(game: str, app_list_path: str) -> str | None:
+    """
+    Get the Steam store URL of a game. Names are looked up in the local index of the Steam application list, if
+    several games match the user chooses one of them.
+
+    Args:
+        game (str): Steam store URL or game name.
+        app_list_path (str): Path of the `GetAppList` JSON dump.
+
+    Returns:
+        str with the store URL, `None` if the game could not be found.
+    """
+    from soul_link.wrappers.steam import get_store_url
+
+    if game.startswith(STORE_URL_PREFIX):
+        return game
+
+    try:
+        app_index = load_app_index(app_list_path)
+    except FileNotFoundError:
+        print(
+            f"Missing Steam application list '{app_list_path}'. Download it from",
+            "https://api.steampowered.com/ISteamApps/GetAppList/v2/ or add the game with its store URL.",
+        )
+        return None
+
+    app_id = app_index.resolve(game)
+    if app_id is None:
+        matches = app_index.search(game, limit=9)
+        if not matches:
+            print(f"No Steam game found for '{game}'")
+            return None
+        for i, match in enumerate(matches, start=1):
+            print(f"{i}. {match.name} ({match.app_id})")
+        user_input = input("Choose a game [1]: ") or "1"
+        if not user_input.isdigit() or not 1 <= int(user_input) <= len(matches):
+            print("Invalid choice")
+            return None
+        app_id = matches[int(user_input) - 1].app_id
+    return get_store_url(app_id)
+
+
+def add_game(sheet: "gspread.Spreadsheet", mirror: SheetMirror, game: str, app_list_path: str) -> int:
+    """
+    Collect the data of a game and add it at the end of the sheet.
+
+    Args:
+        sheet (gspread.Spreadsheet): Game list sheet.
+        mirror (SheetMirror): Local mirror of the sheet.
+        game (str): Steam store URL or game name.
+        app_list_path (str): Path of the `GetAppList` JSON dump.
+
+    Returns:
+        int with the exit code.
+    """
+    from soul_link.collect_game_data import collect_steam_game_data, to_sheet_row
+
+    url = find_store_url(game, app_list_path)
+    if not url:
+        return 1
+    game_data = collect_steam_game_data(url)
+    if not game_data:
+        return 1
+
+    sheet_wrapper = SheetWrapper(sheet, mirror)
+    data = sheet_wrapper.get_table()
+    data.append(to_sheet_row(game_data, data.header))
+    sheet_wrapper.update_sheet(data)
+    print(f"Added {game_data['name']}")
+    return 0
+
+
+def import_games_file(sheet: "gspread.Spreadsheet", mirror: SheetMirror, list_name: str, args: Namespace) -> int:
+    """
+    Import the games of a file of Steam store URLs, resuming a previous interrupted import of the same file.
+
+    Args:
+        sheet (gspread.Spreadsheet): Game list sheet.
+        mirror (SheetMirror): Local mirror of the sheet.
+        list_name (str): Game list name.
+        args (Namespace): Parsed `import` command line arguments.
+
+    Returns:
+        int with the exit code.
+    """
+    from soul_link.importer import ImportCheckpoint, import_games, read_urls
+
+    checkpoint = ImportCheckpoint.for_source(list_name, args.file)
+    if args.restart:
+        checkpoint.remove()
+        checkpoint = ImportCheckpoint.for_source(list_name, args.file)
+    elif len(checkpoint):
+        print(f"Resuming import, {len(checkpoint)} URLs were already processed")
+
+    def on_progress(summary):
+        print(f"{summary.added} games added, {summary.duplicates} duplicates, {summary.failed} failed")
+
+    source = sys.stdin if args.file == "-" else open(args.file, "r")
+    try:
+        summary = import_games(
+            SheetWrapper(sheet, mirror),
+            read_urls(source),
+            checkpoint,
+            chunk_size=args.chunk_size,
+            max_workers=args.workers,
+            on_progress=on_progress,
+        )
+    except KeyboardInterrupt:
+        print("Import interrupted, run the same command again to resume it")
+        return 1
+    finally:
+        checkpoint.close()
+        if source is not sys.stdin:
+            source.close()
+
+    print(
+        f"Import finished: {summary.added} games added, {summary.duplicates} duplicates skipped,",
+        f"{summary.failed} failed, {summary.resumed} already imported",
+    )
+    if summary.failed:
+        print("Run the same command again to retry the failed URLs")
+        return 1
+    checkpoint.remove()
+    return 0
+
+
+def export_snapshot(sheet: "gspread.Spreadsheet", mirror: SheetMirror, args: Namespace) -> int:
+    """
+    Download the sheet and write it to a snapshot file with typed columns.
+
+    Args:
+        sheet (gspread.Spreadsheet): Game list sheet.
+        mirror (SheetMirror): Local mirror of the sheet.
+        args (Namespace): Parsed `export` command line arguments.
+
+    Returns:
+        int with the exit code.
+    """
+    from soul_link.snapshot import write_snapshot
+
+    data = SheetWrapper(sheet, mirror).get_table()
+    try:
+        write_snapshot(data, args.file, args.format)
+    except (ImportError, ValueError) as error:
+        print(error)
+        return 1
+    print(f"Exported {len(data)} games to {args.file}")
+    return 0
+
+
+def import_snapshot(sheet: "gspread.Spreadsheet", mirror: SheetMirror, args: Namespace) -> int:
+    """
+    Add the games of a snapshot file to the sheet. An empty sheet is filled with the whole snapshot, header included,
+    in a single request. Otherwise the games missing from the sheet, compared by `app_id` or by name, are appended in a
+    single request, with their columns placed by name in the sheet header.
+
+    Args:
+        sheet (gspread.Spreadsheet): Game list sheet.
+        mirror (SheetMirror): Local mirror of the sheet.
+        args (Namespace): Parsed `import` command line arguments.
+
+    Returns:
+        int with the exit code.
+    """
+    from soul_link.snapshot import frame_to_rows, read_snapshot
+
+    try:
+        rows = frame_to_rows(read_snapshot(args.file, snapshot_format=args.format))
+    except (ImportError, ValueError) as error:
+        print(error)
+        return 1
+
+    sheet_wrapper = SheetWrapper(sheet, mirror)
+    data = sheet_wrapper.get_table()
+    if not len(data):
+        # pad the rows to clear the header cells of a wider sheet header
+        width = max(len(rows[0]), data.width)
+        sheet_wrapper.overwrite_sheet([row + [""] * (width - len(row)) for row in rows])
+        print(f"Imported {len(rows) - 1} games")
+        return 0
+
+    key = next((column for column in ("app_id", "name") if column in data.header and column in rows[0]), None)
+    if key is None:
+        print("The sheet and the snapshot need a common `app_id` or `name` column to import games")
+        return 1
+    known = {value.strip().lower() for value in data.column_values(data.header.index(key))}
+    positions = [rows[0].index(name) if name in rows[0] else None for name in data.header]
+    added = []
+    for row in rows[1:]:
+        value = row[rows[0].index(key)].strip().lower()
+        if value in known:
+            continue
+        known.add(value)
+        added.append([row[position] if position is not None else "" for position in positions])
+    sheet_wrapper.append_rows(added)
+    print(f"Imported {len(added)} games, {len(rows) - 1 - len(added)} were already in the list")
+    return 0
+
+
+def refresh_games(sheet: "gspread.Spreadsheet", mirror: SheetMirror, list_name: str, args: Namespace) -> int:
+    """
+    Download again the Steam data of the stale games and write the changed cells to the sheet in a single update.
+
+    Args:
+        sheet (gspread.Spreadsheet): Game list sheet.
+        mirror (SheetMirror): Local mirror of the sheet.
+        list_name (str): Game list name.
+        args (Namespace): Parsed `refresh` command line arguments.
+
+    Returns:
+        int with the exit code.
+    """
+    from soul_link.refresh import FetchLog, StalenessRefresher
+
+    sheet_wrapper = SheetWrapper(sheet, mirror)
+    data = sheet_wrapper.get_table()
+    if "app_id" not in data.header:
+        print("The sheet header needs an `app_id` column to refresh games")
+        return 1
+
+    refresher = StalenessRefresher(
+        lambda: data,
+        FetchLog(list_name),
+        lambda changes: data.update_rows("app_id", changes),
+        rate=args.rate,
+    )
+    refresher.schedule()
+    summary = refresher.refresh_due(limit=args.limit)
+    if summary.changed_cells:
+        sheet_wrapper.update_sheet(data)
+    print(
+        f"Refresh finished: {summary.fetched} games downloaded, {summary.changed_cells} cells changed in",
+        f"{summary.changed_rows} games, {summary.failed} failed",
+    )
+    return 1 if summary.failed else 0
+
+
+def start_refresher(list_name: str, tui: TUI) -> "StalenessRefresher | None":
+    """
+    Refresh the stale Steam data of the displayed games in a background thread, the changes are displayed and written
+    like the user edits.
+
+    Args:
+        list_name (str): Game list name.
+        tui (TUI): Displayed interface.
+
+    Returns:
+        StalenessRefresher | None with the started refresher, `None` if the table has no `app_id` column.
+    """
+    from soul_link.refresh import FetchLog, StalenessRefresher
+
+    if "app_id" not in tui.data.header:
+        return None
+    refresher = StalenessRefresher(
+        lambda: tui.data, FetchLog(list_name), lambda changes: tui.update_rows("app_id", changes)
+    )
+    refresher.start()
+    return refresher
+
+
+def start_change_watcher(sheet_opener: SheetOpener, sync: WriteBehindSync, tui: TUI) -> RemoteChangeWatcher:
+    """
+    Merge the changes made to the sheet by other users into the displayed table from a background thread.
+
+    Args:
+        sheet_opener (SheetOpener): Opener of the sheet, the sheet is opened again by the polls if it failed.
+        sync (WriteBehindSync): Worker that writes the TUI changes.
+        tui (TUI): Displayed interface.
+
+    Returns:
+        RemoteChangeWatcher: started watcher.
+    """
+
+    watcher = RemoteChangeWatcher(
+        sheet_opener.get, lambda: tui.data, tui.merge_remote_rows, lambda result: apply_merge(result, sync, tui)
+    )
+    watcher.start()
+    return watcher
+
+
+def apply_merge(result: MergeResult, sync: WriteBehindSync, tui: TUI):
+    """
+    Display the result of merging remote changes into the displayed table and write the local values that won a
+    conflict.
+
+    Args:
+        result (MergeResult): Merged changes.
+        sync (WriteBehindSync): Worker that writes the TUI changes.
+        tui (TUI): Displayed interface.
+    """
+    if result.table is not None:
+        # the header changed, the pending data is written from the new table so it does not revert the header
+        tui.replace_data(result.table)
+        if sync.status != sync.STATUS_SYNCED:
+            sync.submit(result.table)
+    if result.conflicts:
+        tui.set_sync_status(f"{result.conflicts} cells edited remotely kept the local value")
+        # write the local values over the remote ones
+        sync.submit(tui.data)
+
+
+def open_mirrored_sheet(
+    gc: "gspread.Client",
+    user_data: dict,
+    list_name: str,
+    mirror: SheetMirror,
+    mirrored_rows: list[list[str]],
+    sync: WriteBehindSync,
+    tui: TUI,
+) -> SheetWrapper:
+    """
+    Open the sheet of a list displayed from its mirror and, only if it changed since it was mirrored, merge its
+    changes into the displayed table, keeping the local edits made meanwhile. Called by `SheetOpener` from a
+    background thread, again after every failure until it succeeds.
+
+    Args:
+        user_data (dict): User data, as returned by `load_user_data`.
+        list_name (str): Game list name.
+        mirror (SheetMirror): Local mirror of the sheet.
+        mirrored_rows (list[list[str]]): Rows loaded from `mirror` and displayed in `tui`.
+        sync (WriteBehindSync): Worker that writes the TUI changes.
+        tui (TUI): Displayed interface.
+
+    Returns:
+        SheetWrapper of the opened sheet.
+    """
+    wrapper = SheetWrapper(open_sheet(gc, user_data, list_name, create=False), mirror)
+    result = wrapper.pull_changes(tui.data, mirrored_rows, tui.merge_remote_rows)
+    # the sheet is reachable again, replace the offline status
+    tui.set_sync_status(sync.status)
+    if result is not None:
+        apply_merge(result, sync, tui)
+    return wrapper
+
+
+def open_in_background(sheet_opener: SheetOpener):
+    """
+    Open a sheet in a background thread so it is ready when it is first needed.
+
+    Args:
+        sheet_opener (SheetOpener): Opener of the sheet.
+    """
+
+    def run():
+        try:
+            sheet_opener.get()
+        except Exception:
+            # reported by the opener `on_error`, opened again by the next write or poll
+            pass
+
+    Thread(target=run, daemon=True).start()
+
+
+def run_session(gc: "gspread.Client", user_data: dict, list_name: str, max_rows: int) -> int:
+    """
+    Display a game list while every other list of `user_data` is loaded in the background, so the user can switch
+    between them from the TUI without waiting.
+
+    Args:
+        user_data (dict): User data, as returned by `load_user_data`.
+        list_name (str): Game list displayed first.
+        max_rows (int): Rows kept in memory across every list.
+
+    Returns:
+        int with the exit code.
+    """
+    tui: TUI | None = None
+    current = list_name
+
+    def show(name: str, future: Future):
+        if name != current:
+            # the user switched to another list while this one was loading
+            return
+        try:
+            loaded = future.result()
+        except Exception as error:
+            tui.set_sync_status(f"{name} could not be loaded: {error}")
+            return
+        tui.show_list(name, loaded.state, loaded.sync.submit)
+        tui.set_sync_status(loaded.sync.status)
+
+    def switch_list(direction: int):
+        nonlocal current
+        current = session.names[(session.names.index(current) + direction) % len(session.names)]
+        future = session.load(current)
+        if not future.done():
+            tui.set_sync_status(f"loading {current}")
+        future.add_done_callback(lambda future, name=current: show(name, future))
+
+    def on_list_update(loaded: LoadedList):
+        if tui and loaded.name == current:
+            tui.show_list(loaded.name, loaded.state, loaded.sync.submit)
+
+    def on_sync_status(name: str, status: str):
+        if tui and name == current:
+            tui.set_sync_status(status)
+
+    def merge(data: Table, base_rows: list[tuple[str]], remote_rows: list[tuple[str]]) -> MergeResult:
+        if tui is None:
+            return merge_rows(data, base_rows, remote_rows)
+        return tui.merge_remote_rows(data, base_rows, remote_rows)
+
+    def update_rows(data: Table, key_column: str, changes: dict[str, dict[str, str]]) -> int:
+        if tui is None:
+            return data.update_rows(key_column, changes)
+        return tui.update_table_rows(data, key_column, changes)
+
+    if "key" not in user_data[list_name]:
+        # the first list can be created interactively, the session only opens existing sheets
+        open_sheet(gc, user_data, list_name)
+    session = Session(
+        lambda name: open_sheet(gc, user_data, name, create=False),
+        [list_name] + [name for name in user_data if name != list_name],
+        max_rows=max_rows,
+        on_list_update=on_list_update,
+        on_sync_status=on_sync_status,
+        merge=merge,
+        update_rows=update_rows,
+    )
+    session.prefetch()
+    try:
+        loaded = session.load(list_name).result()
+        tui = TUI(loaded.state, on_data_update=loaded.sync.submit, on_switch_list=switch_list)
+        tui.show_list(list_name, loaded.state, loaded.sync.submit)
+        tui.init_tui()
+    finally:
+        print("Saving changes...")
+        failed = session.close()
+    for name, error in failed.items():
+        print(f"Changes of '{name}' could not be saved to the Google sheet: {error}")
+    return 1 if failed else 0
+
+
+def write_profile(profile_format: str, output: str):
+    """
+    Print the summary of the recorded spans or write them to a Chrome trace file.
+
+    Args:
+        profile_format (str): One of `PROFILE_FORMATS`.
+        output (str): Path of the Chrome trace file.
+    """
+    if profile_format == "trace":
+        PROFILER.write_chrome_trace(output)
+        print(f"Chrome trace written to {output}", file=sys.stderr)
+    else:
+        print(PROFILER.summary(), file=sys.stderr)
 
 
 def main() -> int:
     """Main function."""
     parser = get_parser()
     args = parser.parse_args()
+    if not args.profile:
+        return run(args)
+
+    PROFILER.enable()
+    try:
+        with PROFILER.span("main"):
+            return run(args)
+    finally:
+        write_profile(args.profile, args.profile_output)
+
 
+def run(args: Namespace) -> int:
+    """
+    Run the command given in the command line.
+
+    Args:
+        args (Namespace): Parsed command line arguments.
+
+    Returns:
+        int with the exit code.
+    """
     service_account_creds = get_service_account_cred_file_path()
     if not service_account_creds:
         print(
@@ -112,7 +718,10 @@ def main() -> int:
             f"directory or define the environment variable {ENV_VAR_SEVICE_ACCOUNT_FILE_PATH} pointing to the file.",
         )
         return 1
-    gc = gspread.service_account(filename=service_account_creds)
+    import gspread
+
+    with PROFILER.span("sheets.authorize"):
+        gc = gspread.service_account(filename=service_account_creds)
 
     user_data = load_user_data()
     if args.list not in user_data:
@@ -121,19 +730,53 @@ def main() -> int:
         user_data[args.list]["title"] = input(f"Google Sheet title [{args.list}]: ") or args.list
         write_user_data(user_data)
 
-    sheet_title = user_data[args.list]["title"]
+    if args.session and not args.command:
+        return run_session(gc, user_data, args.list, args.max_rows)
+
+    mirror = SheetMirror(args.list)
+    if args.command == "add":
+        return add_game(open_sheet(gc, user_data, args.list), mirror, " ".join(args.game), args.app_list)
+    if args.command == "import":
+        if args.format or is_snapshot(args.file):
+            return import_snapshot(open_sheet(gc, user_data, args.list), mirror, args)
+        return import_games_file(open_sheet(gc, user_data, args.list), mirror, args.list, args)
+    if args.command == "export":
+        return export_snapshot(open_sheet(gc, user_data, args.list), mirror, args)
+    if args.command == "refresh":
+        return refresh_games(open_sheet(gc, user_data, args.list), mirror, args.list, args)
+
+    with PROFILER.span("mirror.load"):
+        mirrored_rows = mirror.load()
+
+    sync = WriteBehindSync(lambda data: sheet_opener.get().update_sheet(data))
+    if mirrored_rows is None:
+        sheet_wrapper = SheetWrapper(open_sheet(gc, user_data, args.list), mirror)
+        data = sheet_wrapper.get_table_paged()
+        tui = TUI(data, on_data_update=sync.submit)
+        sheet_opener = SheetOpener(None, sheet_wrapper)
+    else:
+        tui = TUI(Table(mirrored_rows), on_data_update=sync.submit)
+        sheet_opener = SheetOpener(
+            lambda: open_mirrored_sheet(gc, user_data, args.list, mirror, mirrored_rows, sync, tui),
+            on_error=lambda error: tui.set_sync_status("offline"),
+        )
+        open_in_background(sheet_opener)
+    sync.on_status_change = tui.set_sync_status
+    sync.start()
+    refresher = start_refresher(args.list, tui)
+    watcher = start_change_watcher(sheet_opener, sync, tui)
     try:
-        sheet = gc.open(sheet_title)
-    except gspread.SpreadsheetNotFound:
-        print(f"There is not Google sheet with the title {sheet_title}!")
-        print(f"Creating sheet {sheet_title}...")
-        sheet = create_default_sheet(gc, sheet_title)
-
-    sheet = gc.open(user_data[args.list]["title"])
-    sheet_wrapper = SheetWrapper(sheet)
-
-    tui = TUI(sheet_wrapper.get_array(), on_data_update=sheet_wrapper.update_sheet)
-    tui.init_tui()
+        tui.init_tui()
+    finally:
+        watcher.stop()
+        if refresher is not None:
+            refresher.stop()
+        if sync.status != sync.STATUS_SYNCED:
+            print("Saving changes...")
+        saved = sync.close()
+    if not saved:
+        print(f"Changes could not be saved to the Google sheet: {sync.error}")
+        return 1
     return 0
 
 
@@ -0,0 +1,93 @@
+import json
+import sqlite3
+from pathlib import Path
+from threading import Lock
+
+DEFAULT_MIRROR_PATH = "~/.config/soulink/mirror.db"
+
+
+class SheetMirror:
+    """
+    Local copy of a game list stored in a SQLite database, used to display the list without waiting for Google
+    Sheets. Every list is identified by its name in `user.data` and all the lists share the same database file.
+    """
+
+    def __init__(self, list_name: str, path: str | Path = DEFAULT_MIRROR_PATH):
+        """
+        Args:
+            list_name (str): Game list name.
+            path (str | Path): SQLite database path.
+        """
+        self._list_name = list_name
+        self._path = Path(path).expanduser()
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(self._path, check_same_thread=False)
+        self._lock = Lock()
+        self._rows: list[tuple[str]] | None = None
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS lists (list TEXT PRIMARY KEY, modified_time TEXT, row_count INTEGER)"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS rows "
+                "(list TEXT, position INTEGER, cells TEXT, PRIMARY KEY (list, position))"
+            )
+
+    def load(self) -> list[list[str]] | None:
+        """
+        Load the mirrored rows.
+
+        Returns:
+            list[list[str]] with the mirrored rows, header included, or `None` if the list has never been mirrored.
+        """
+        with self._lock:
+            row_count = self._connection.execute(
+                "SELECT row_count FROM lists WHERE list = ?", (self._list_name,)
+            ).fetchone()
+            if row_count is None:
+                return None
+            cursor = self._connection.execute(
+                "SELECT cells FROM rows WHERE list = ? AND position < ? ORDER BY position",
+                (self._list_name, row_count[0]),
+            )
+            rows = [json.loads(cells) for cells, in cursor]
+            self._rows = [tuple(row) for row in rows]
+            return rows
+
+    def get_modified_time(self) -> str | None:
+        """
+        Returns:
+            str with the Google Drive modified time of the sheet when it was last mirrored, `None` if it is unknown.
+        """
+        with self._lock:
+            modified_time = self._connection.execute(
+                "SELECT modified_time FROM lists WHERE list = ?", (self._list_name,)
+            ).fetchone()
+        return modified_time[0] if modified_time else None
+
+    def save(self, rows: list[list[str]], modified_time: str | None = None):
+        """
+        Store `rows` as the mirrored content of the list. Only the rows whose content changed since the last load or
+        save are written.
+
+        Args:
+            rows (list[list[str]]): Rows to mirror, header included.
+            modified_time (str | None): Google Drive modified time of the sheet matching `rows`.
+        """
+        rows = [tuple(row) for row in rows]
+        with self._lock:
+            previous = self._rows or []
+            changed = [
+                (self._list_name, position, json.dumps(row))
+                for position, row in enumerate(rows)
+                if position >= len(previous) or previous[position] != row
+            ]
+            with self._connection:
+                self._connection.executemany("INSERT OR REPLACE INTO rows VALUES (?, ?, ?)", changed)
+                self._connection.execute(
+                    "DELETE FROM rows WHERE list = ? AND position >= ?", (self._list_name, len(rows))
+                )
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO lists VALUES (?, ?, ?)", (self._list_name, modified_time, len(rows))
+                )
+            self._rows = rows
@@ -0,0 +1,200 @@
+import json
+import math
+import os
+import threading
+import time
+from functools import wraps
+
+
+class Span:
+    """
+    Timed section of code, created with `Profiler.span` and used as a context manager. Arguments describing the
+    section, like the number of written bytes, can be added while it runs with `Span.set`.
+    """
+
+    __slots__ = ("_profiler", "name", "args", "_start")
+
+    def __init__(self, profiler: "Profiler", name: str, args: dict):
+        self._profiler = profiler
+        self.name = name
+        self.args = args
+
+    def __enter__(self) -> "Span":
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._profiler.record(self.name, self._start, time.perf_counter_ns() - self._start, self.args)
+
+    def set(self, **args):
+        """
+        Add arguments to the span.
+        """
+        self.args.update(args)
+
+
+class _NullSpan:
+    """
+    Span returned while the profiler is disabled, it does nothing.
+    """
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def set(self, **args):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Profiler:
+    """
+    Collector of timing spans. It is disabled by default and, while disabled, `Profiler.span` returns a shared no-op
+    span, so instrumented code only pays for an attribute check.
+
+    Recorded spans can be summarized with the count, p50, p95 and maximum duration per span name, or exported in the
+    Chrome trace event format, which can be opened with `chrome://tracing` or https://ui.perfetto.dev.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        # (name, start ns, duration ns, thread ID, args)
+        self._spans: list[tuple[str, int, int, int, dict]] = []
+        self._origin = time.perf_counter_ns()
+
+    def enable(self):
+        self._origin = time.perf_counter_ns()
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def clear(self):
+        self._spans = []
+
+    def span(self, name: str, **args) -> Span | _NullSpan:
+        """
+        Time a section of code:
+
+            with PROFILER.span("sheets.get_all_values") as span:
+                rows = worksheet.get_all_values()
+                span.set(rows=len(rows))
+
+        Args:
+            name (str): Span name, spans with the same name are summarized together.
+            **args: Arguments describing the section.
+
+        Returns:
+            Span | _NullSpan: context manager timing the section.
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return Span(self, name, args)
+
+    def record(self, name: str, start: int, duration: int, args: dict | None = None):
+        """
+        Record a span measured by the caller.
+
+        Args:
+            name (str): Span name.
+            start (int): Start time from `time.perf_counter_ns`.
+            duration (int): Duration in nanoseconds.
+            args (dict | None): Arguments describing the span.
+        """
+        if self.enabled:
+            # appending to a list is atomic, spans can be recorded from any thread without a lock
+            self._spans.append((name, start, duration, threading.get_ident(), args or {}))
+
+    def summary(self) -> str:
+        """
+        Returns:
+            str with a table of the recorded spans: count, total, p50, p95 and maximum milliseconds per span name,
+            and the sum of every numeric span argument, like written bytes.
+        """
+        durations: dict[str, list[int]] = {}
+        totals: dict[str, dict[str, float]] = {}
+        for name, _, duration, _, args in self._spans:
+            durations.setdefault(name, []).append(duration)
+            name_totals = totals.setdefault(name, {})
+            for key, value in args.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    name_totals[key] = name_totals.get(key, 0) + value
+
+        lines = [f"{'span':<28}{'count':>8}{'total ms':>12}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}  totals"]
+        for name in sorted(durations):
+            values = sorted(durations[name])
+            arguments = ", ".join(f"{key}={value:g}" for key, value in totals[name].items())
+            lines.append(
+                f"{name:<28}{len(values):>8}{sum(values) / 1e6:>12.2f}{_percentile(values, 50) / 1e6:>10.2f}"
+                f"{_percentile(values, 95) / 1e6:>10.2f}{values[-1] / 1e6:>10.2f}  {arguments}"
+            )
+        return "\n".join(lines)
+
+    def chrome_trace(self) -> dict:
+        """
+        Returns:
+            dict with the recorded spans in the Chrome trace event format.
+        """
+        pid = os.getpid()
+        return {
+            "traceEvents": [
+                {
+                    "name": name,
+                    "ph": "X",
+                    "ts": (start - self._origin) / 1000,
+                    "dur": duration / 1000,
+                    "pid": pid,
+                    "tid": thread_id,
+                    "args": args,
+                }
+                for name, start, duration, thread_id, args in self._spans
+            ],
+            "displayTimeUnit": "ms",
+        }
+
+    def write_chrome_trace(self, path: str):
+        """
+        Write the recorded spans to a Chrome trace JSON file.
+
+        Args:
+            path (str): Path of the written file.
+        """
+        with open(path, "w") as handler:
+            json.dump(self.chrome_trace(), handler, default=str)
+
+
+def traced(name: str) -> callable:
+    """
+    Decorator timing every call of a function with a span called `name` of the global `PROFILER`.
+
+    Args:
+        name (str): Span name.
+    """
+
+    def decorator(function: callable) -> callable:
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            if not PROFILER.enabled:
+                return function(*args, **kwargs)
+            with PROFILER.span(name):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def _percentile(values: list[int], percent: int) -> int:
+    """
+    Nearest rank percentile of sorted `values`.
+    """
+    return values[max(0, math.ceil(len(values) * percent / 100) - 1)]
+
+
+PROFILER = Profiler()
@@ -0,0 +1,291 @@
+import heapq
+import sqlite3
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from threading import Event, Lock, Thread
+from typing import NamedTuple
+
+from soul_link.collect_game_data import collect_steam_game_data_many, to_sheet_row
+from soul_link.importer import PERMANENT_ERRORS
+from soul_link.mirror import DEFAULT_MIRROR_PATH
+from soul_link.table import Table
+from soul_link.wrappers.http import RateLimiter
+from soul_link.wrappers.steam import get_app_id_from_store_url, get_store_url
+
+# columns written from the Steam store data that can change after a game is added, the name is left as the user
+# wrote it
+REFRESH_COLUMNS = ("is_free", "short_description", "categories", "genres", "released")
+# seconds after which the data of a game is stale
+RELEASED_INTERVAL = 7 * 24 * 60 * 60
+UNRELEASED_INTERVAL = 24 * 60 * 60
+# Steam store requests per second used by the background refresher, a fraction of the store rate limit so adding
+# games is never slowed down by it
+DEFAULT_REFRESH_RATE = 0.1
+DEFAULT_BATCH_SIZE = 20
+# seconds between two scans of the table looking for new games
+RESCAN_INTERVAL = 10 * 60
+# seconds `StalenessRefresher.stop` waits for the requests already sent, the thread is left behind after it
+STOP_TIMEOUT = 2.0
+
+
+class RefreshSummary(NamedTuple):
+    """
+    Result of `StalenessRefresher.refresh_due`.
+
+    Attributes:
+        fetched (int): Games whose Steam data was downloaded.
+        changed_rows (int): Games with at least one changed cell.
+        changed_cells (int): Changed cells.
+        failed (int): Games whose Steam data could not be downloaded.
+    """
+
+    fetched: int
+    changed_rows: int
+    changed_cells: int
+    failed: int
+
+
+class FetchLog:
+    """
+    Last time the Steam data of every game of a list was downloaded, stored in the mirror SQLite database.
+    """
+
+    def __init__(self, list_name: str, path: str | Path = DEFAULT_MIRROR_PATH):
+        """
+        Args:
+            list_name (str): Game list name.
+            path (str | Path): SQLite database path.
+        """
+        self._list_name = list_name
+        path = Path(path).expanduser()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = Lock()
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS fetched "
+                "(list TEXT, app_id TEXT, fetched_at REAL, PRIMARY KEY (list, app_id))"
+            )
+
+    def load(self) -> dict[str, float]:
+        """
+        Returns:
+            dict[str, float] mapping application IDs to the last time their data was downloaded.
+        """
+        with self._lock:
+            cursor = self._connection.execute(
+                "SELECT app_id, fetched_at FROM fetched WHERE list = ?", (self._list_name,)
+            )
+            return dict(cursor)
+
+    def mark(self, app_ids: list[str], fetched_at: float):
+        """
+        Record that the data of some games was downloaded.
+
+        Args:
+            app_ids (list[str]): Application IDs.
+            fetched_at (float): Download time from `time.time`.
+        """
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO fetched VALUES (?, ?, ?)",
+                [(self._list_name, app_id, fetched_at) for app_id in app_ids],
+            )
+
+
+class StalenessRefresher:
+    """
+    Downloads again the Steam data of the games whose data is stale and reports the cells that changed. Games are
+    kept in a priority queue by the time their data becomes stale: `UNRELEASED_INTERVAL` after the last download for
+    unreleased games, which change more often, and `RELEASED_INTERVAL` for the rest. Games never downloaded by the
+    refresher are stale right away.
+
+    Downloads are limited to `rate` requests per second on top of the Steam store rate limit. Changes are reported in
+    batches to `on_changes` as a `dict[str, dict[str, str]]` with the new cell values by column name, by application
+    ID, ready for `soul_link.table.Table.update_rows`, so a batch ends up as a single sheet update.
+
+    A batch that fails, like when a download fails past its retries, does not stop the refresher: the error is kept
+    in `error` and its games are downloaded again after the next scan.
+    """
+
+    def __init__(
+        self,
+        get_table: callable,
+        fetch_log: FetchLog,
+        on_changes: callable,
+        rate: float | None = DEFAULT_REFRESH_RATE,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ):
+        """
+        Args:
+            get_table (callable): Function returning the current `Table` of the list, called on every scan.
+            fetch_log (FetchLog): Download times of the list games.
+            on_changes (callable): Function called with every batch of changed cells.
+            rate (float | None): Maximum requests per second, `None` to only be limited by the Steam store rate limit.
+            batch_size (int): Games downloaded per batch.
+        """
+        self._get_table = get_table
+        self._fetch_log = fetch_log
+        self._on_changes = on_changes
+        self._rate_limiter = RateLimiter(rate) if rate else None
+        self._batch_size = batch_size
+        # (stale time, application ID)
+        self._queue: list[tuple[float, str]] = []
+        self._stop = Event()
+        self._thread: Thread | None = None
+        self.error: Exception | None = None
+
+    def schedule(self):
+        """
+        Scan the table and rebuild the priority queue.
+        """
+        table = self._get_table()
+        fetched = self._fetch_log.load()
+        queue = {}
+        for row in _game_rows(table):
+            released = row.get("released", "TRUE").upper() != "FALSE"
+            interval = RELEASED_INTERVAL if released else UNRELEASED_INTERVAL
+            queue[row["app_id"]] = fetched.get(row["app_id"], -interval) + interval
+        self._queue = [(stale_at, app_id) for app_id, stale_at in queue.items()]
+        heapq.heapify(self._queue)
+
+    def next_stale_time(self) -> float | None:
+        """
+        Returns:
+            float | None with the time from `time.time` when the next game becomes stale, `None` if there are no games.
+        """
+        return self._queue[0][0] if self._queue else None
+
+    def refresh_due(self, limit: int | None = None, now: float | None = None) -> RefreshSummary:
+        """
+        Download the data of the stale games and report the changed cells, blocking until done. Call `schedule` first.
+
+        Args:
+            limit (int | None): Maximum number of downloaded games, `None` for every stale game.
+            now (float | None): Time used to decide which games are stale, defaults to the current time.
+
+        Returns:
+            RefreshSummary: counts of the refresh.
+        """
+        now = time.time() if now is None else now
+        counts = {"fetched": 0, "changed_rows": 0, "changed_cells": 0, "failed": 0}
+        while not self._stop.is_set():
+            batch_size = self._batch_size
+            if limit is not None:
+                batch_size = min(batch_size, limit - counts["fetched"] - counts["failed"])
+            if batch_size <= 0:
+                break
+            batch = []
+            while self._queue and self._queue[0][0] <= now and len(batch) < batch_size:
+                batch.append(heapq.heappop(self._queue)[1])
+            if not batch:
+                break
+            try:
+                self._refresh_batch(batch, counts)
+                self.error = None
+            except Exception as error:
+                # the games are not marked as downloaded, the next scan schedules them again
+                self.error = error
+                counts["failed"] += len(batch)
+        return RefreshSummary(**counts)
+
+    def start(self):
+        """
+        Refresh stale games in a background thread until `stop` is called.
+        """
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = STOP_TIMEOUT):
+        """
+        Stop the background thread. No new request is sent after it is called, the running ones are not interrupted
+        and their changes are discarded.
+
+        Args:
+            timeout (float | None): Maximum seconds to wait for the running requests. The thread is a daemon, exiting
+                the program does not wait for it.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.schedule()
+            except Exception as error:
+                # the table or the fetch log could not be read, scanned again after waiting
+                self.error = error
+            else:
+                self.refresh_due()
+            next_stale_time = self.next_stale_time()
+            wait = RESCAN_INTERVAL if next_stale_time is None else next_stale_time - time.time()
+            self._stop.wait(max(1.0, min(wait, RESCAN_INTERVAL)))
+
+    def _refresh_batch(self, app_ids: list[str], counts: dict[str, int]):
+        table = self._get_table()
+        header = table.header
+        current = {row["app_id"]: row for row in _game_rows(table)}
+        changes = {}
+        fetched = []
+        results = collect_steam_game_data_many(self._urls(app_ids), max_workers=4, use_cache=False)
+        for result in results:
+            if self._stop.is_set():
+                # cancel the queued requests, the games are refreshed on the next run
+                results.close()
+                return
+            app_id = str(get_app_id_from_store_url(result.url))
+            if result.error is not None and not isinstance(result.error, PERMANENT_ERRORS):
+                # try again on the next scan
+                counts["failed"] += 1
+                continue
+            fetched.append(app_id)
+            if result.error is not None or app_id not in current:
+                # removed from the store or from the list
+                counts["failed" if result.error else "fetched"] += 1
+                continue
+            counts["fetched"] += 1
+            row = dict(zip(header, to_sheet_row(result.data, header)))
+            changed = {
+                column: row[column]
+                for column in REFRESH_COLUMNS
+                if column in row and row[column] != current[app_id].get(column)
+            }
+            if changed:
+                changes[app_id] = changed
+                counts["changed_rows"] += 1
+                counts["changed_cells"] += len(changed)
+        if self._stop.is_set():
+            return
+        if changes:
+            self._on_changes(changes)
+        # once applied, a batch whose changes could not be applied is downloaded again
+        self._fetch_log.mark(fetched, time.time())
+
+    def _urls(self, app_ids: list[str]) -> Iterator[str]:
+        """
+        Store URLs of the games, consumed lazily by the download so every one waits for the refresher rate limit.
+        """
+        for app_id in app_ids:
+            if self._stop.is_set():
+                return
+            if self._rate_limiter and not self._rate_limiter.acquire(self._stop):
+                return
+            yield get_store_url(app_id)
+
+
+def _game_rows(table: Table) -> list[dict[str, str]]:
+    """
+    Rows of the table with a valid Steam application ID, as dictionaries by column name.
+    """
+    if "app_id" not in table.header:
+        return []
+    with table.lock:
+        rows = table.rows()
+    column = table.header.index("app_id")
+    return [dict(zip(table.header, row)) for row in rows if _is_app_id(row[column])]
+
+
+def _is_app_id(value: str) -> bool:
+    return value.isascii() and value.isdigit() and int(value) > 0
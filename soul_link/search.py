@@ -0,0 +1,225 @@
+import re
+from bisect import bisect_left, insort
+from functools import lru_cache
+
+from soul_link.table import Table
+
+SEARCH_COLUMNS = ("name", "categories", "genres")
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+_TOKEN_SEPARATOR = "\x00"
+# below this number of previous results, narrowing them is cheaper than intersecting postings
+_NARROW_LIMIT = 2048
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Split a text in lowercase words.
+
+    Args:
+        text (str): Text to split.
+
+    Returns:
+        list[str] with the found words.
+    """
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def split_values(cell: str) -> list[str]:
+    """
+    Split a cell in its lowercase values. Cells of list columns, like `categories`, contain comma separated values.
+
+    Args:
+        cell (str): Cell value.
+
+    Returns:
+        list[str] with the cell values.
+    """
+    return [value.strip().lower() for value in cell.split(",") if value.strip()]
+
+
+@lru_cache(maxsize=4096)
+def _tokenize_cell(cell: str) -> tuple[str]:
+    """
+    Cached `tokenize` for cells, list columns like `genres` repeat the same few values in most rows.
+    """
+    return tuple(tokenize(cell))
+
+
+class InvertedIndex:
+    """
+    Inverted index over the rows of a `soul_link.table.Table`, used to search and filter rows without scanning the
+    whole table.
+
+    Words of the `SEARCH_COLUMNS` columns are indexed when the index is created. The values of any column used in a
+    filter are indexed on the first filter by that column. Both are updated incrementally by listening to the table
+    changes.
+    """
+
+    def __init__(self, table: Table, columns: tuple[str] = SEARCH_COLUMNS):
+        """
+        Args:
+            table (Table): Indexed table.
+            columns (tuple[str]): Names of the columns whose words are searched.
+        """
+        self._table = table
+        self._columns = [i for i, name in enumerate(table.header) if name in columns]
+        self._postings: dict[str, set[int]] = {}
+        self._tokens: list[str] = []
+        self._row_tokens: dict[int, frozenset[str]] = {}
+        self._row_texts: dict[int, str] = {}
+        self._values: dict[int, dict[str, set[int]]] = {}
+        self._last_query: tuple[tuple[str], set[int]] | None = None
+        with table.lock:
+            for row_id in table.row_ids():
+                self._add_row(row_id, table.row_by_id(row_id), sort_tokens=False)
+            self._tokens.sort()
+            table.subscribe(self._on_change)
+
+    def close(self):
+        """
+        Stop listening to the table changes.
+        """
+        self._table.unsubscribe(self._on_change)
+
+    def search(self, query: str) -> set[int] | None:
+        """
+        Find the rows containing every word of `query`. The last word is matched as a prefix, so results can be
+        displayed while the query is being typed. If the new query extends the previous one, only the previous results
+        are checked.
+
+        Args:
+            query (str): Searched text.
+
+        Returns:
+            set[int] with the IDs of the matching rows, `None` if the query has no words.
+        """
+        tokens = tuple(tokenize(query))
+        if not tokens:
+            return None
+
+        last_query = self._last_query
+        if last_query and len(last_query[1]) <= _NARROW_LIMIT and self._extends(tokens, last_query[0]):
+            results = self._narrow(last_query[1], tokens)
+        else:
+            postings = [self._postings.get(token, set()) for token in tokens[:-1]]
+            postings.sort(key=len)
+            results = None
+            for token_postings in postings:
+                results = set(token_postings) if results is None else results & token_postings
+                if not results:
+                    break
+            if results is None or results:
+                results = self._prefix_postings(tokens[-1], results)
+        self._last_query = (tokens, results)
+        return results
+
+    def filter(self, column: int, value: str) -> set[int]:
+        """
+        Find the rows where `column` contains `value`. The comparison ignores the case and, for list columns like
+        `genres`, matches any of the comma separated values.
+
+        Args:
+            column (int): Column position.
+            value (str): Expected value.
+
+        Returns:
+            set[int] with the IDs of the matching rows.
+        """
+        return self._get_values(column).get(value.strip().lower(), set())
+
+    def values(self, column: int) -> list[str]:
+        """
+        Args:
+            column (int): Column position.
+
+        Returns:
+            list[str] with the sorted distinct lowercase values of `column`.
+        """
+        return sorted(value for value, row_ids in self._get_values(column).items() if row_ids)
+
+    def _get_values(self, column: int) -> dict[str, set[int]]:
+        if column not in self._values:
+            values = {}
+            with self._table.lock:
+                for row_id in self._table.row_ids():
+                    for value in split_values(self._table.row_by_id(row_id)[column]):
+                        values.setdefault(value, set()).add(row_id)
+            self._values[column] = values
+        return self._values[column]
+
+    def _prefix_postings(self, prefix: str, candidates: set[int] | None) -> set[int]:
+        """
+        Get the rows containing a word starting with `prefix`, limited to `candidates` if given.
+        """
+        start = bisect_left(self._tokens, prefix)
+        end = bisect_left(self._tokens, f"{prefix}\U0010ffff", start)
+        if candidates is not None and (end - start) * 8 > len(candidates):
+            # many words share the prefix, checking the words of each candidate is cheaper
+            return self._narrow(candidates, (prefix,))
+
+        results = set()
+        for token in self._tokens[start:end]:
+            if candidates is None:
+                results |= self._postings[token]
+            else:
+                results |= candidates & self._postings[token]
+        return results
+
+    @staticmethod
+    def _extends(tokens: tuple[str], previous: tuple[str]) -> bool:
+        """
+        Check if every row matching `tokens` also matches `previous`.
+        """
+        return (
+            len(tokens) >= len(previous)
+            and tokens[: len(previous) - 1] == previous[:-1]
+            and tokens[len(previous) - 1].startswith(previous[-1])
+        )
+
+    def _narrow(self, candidates: set[int], tokens: tuple[str]) -> set[int]:
+        """
+        Get the `candidates` containing every word of `tokens`, the last one matched as a prefix.
+        """
+        words = frozenset(tokens[:-1])
+        # row words are joined with a separator, a prefix match is a substring match after a separator
+        needle = f"{_TOKEN_SEPARATOR}{tokens[-1]}"
+        row_tokens = self._row_tokens
+        row_texts = self._row_texts
+        return {row_id for row_id in candidates if needle in row_texts[row_id] and words <= row_tokens[row_id]}
+
+    def _add_row(self, row_id: int, row: tuple[str], sort_tokens: bool = True):
+        tokens = frozenset(token for column in self._columns for token in _tokenize_cell(row[column]))
+        self._row_tokens[row_id] = tokens
+        self._row_texts[row_id] = _TOKEN_SEPARATOR + _TOKEN_SEPARATOR.join(tokens)
+        for token in tokens:
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = set()
+                if sort_tokens:
+                    insort(self._tokens, token)
+                else:
+                    self._tokens.append(token)
+            postings.add(row_id)
+        for column, values in self._values.items():
+            for value in split_values(row[column]):
+                values.setdefault(value, set()).add(row_id)
+
+    def _remove_row(self, row_id: int, row: tuple[str]):
+        self._row_texts.pop(row_id, None)
+        for token in self._row_tokens.pop(row_id, ()):
+            self._postings[token].discard(row_id)
+        for column, values in self._values.items():
+            for value in split_values(row[column]):
+                values.get(value, set()).discard(row_id)
+
+    def _on_change(self, event: str, row_id: int, row: tuple[str]):
+        self._last_query = None
+        match event:
+            case Table.EVENT_INSERT:
+                self._add_row(row_id, row)
+            case Table.EVENT_DELETE:
+                self._remove_row(row_id, row)
+            case Table.EVENT_UPDATE:
+                self._remove_row(row_id, row)
+                self._add_row(row_id, self._table.row_by_id(row_id))
@@ -0,0 +1,304 @@
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Lock
+from typing import TYPE_CHECKING
+
+from soul_link.data import MergeResult, SheetOpener, SheetWrapper
+from soul_link.mirror import SheetMirror
+from soul_link.profiling import PROFILER
+from soul_link.sync import WriteBehindSync
+from soul_link.table import Table
+from soul_link.tui import TableState
+from soul_link.watch import RemoteChangeWatcher
+
+if TYPE_CHECKING:
+    from soul_link.refresh import StalenessRefresher
+
+# rows kept in memory across every loaded list, least recently used lists are evicted above it
+DEFAULT_MAX_ROWS = 200_000
+DEFAULT_MAX_WORKERS = 4
+
+
+class LoadedList:
+    """
+    Game list loaded by a `Session`.
+
+    Attributes:
+        name (str): Game list name.
+        state (TableState): Displayed table of the list, replaced when the header of the sheet changes.
+        sheet_opener (SheetOpener): Opener of the sheet, the sheet is opened again by the next write if it failed.
+        sync (WriteBehindSync): Worker writing the changes of the list.
+        watcher (RemoteChangeWatcher | None): Worker merging the changes made to the sheet by other users.
+        refresher (StalenessRefresher | None): Worker refreshing the stale Steam data of the games, `None` if the list
+            has no `app_id` column.
+    """
+
+    def __init__(self, name: str, state: TableState, sheet_opener: SheetOpener, sync: WriteBehindSync):
+        self.name = name
+        self.state = state
+        self.sheet_opener = sheet_opener
+        self.sync = sync
+        self.watcher: RemoteChangeWatcher | None = None
+        self.refresher: "StalenessRefresher | None" = None
+
+    def __len__(self) -> int:
+        return len(self.state.data)
+
+    def stop_workers(self):
+        """
+        Stop the remote change watcher and the refresher of the list, its pending changes are not written.
+        """
+        if self.watcher is not None:
+            self.watcher.stop()
+        if self.refresher is not None:
+            self.refresher.stop()
+
+
+class Session:
+    """
+    Every game list of `user.data` opened at once with a single authorized client, so the displayed list can be
+    switched without starting the program again.
+
+    Lists are loaded concurrently in background threads: the local mirror is displayed as soon as it is read and the
+    sheet is downloaded afterwards only if it changed, like a single list is. Every loaded list merges the changes made
+    by other users and refreshes its stale Steam data in the background, also like a single list does. Loaded lists
+    are kept in memory while their rows fit in `max_rows`, above it the least recently used lists whose changes are
+    already written are evicted and loaded again, from the mirror, the next time they are requested.
+    """
+
+    def __init__(
+        self,
+        open_list: callable,
+        list_names: list[str],
+        max_rows: int = DEFAULT_MAX_ROWS,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        on_list_update: callable = None,
+        on_sync_status: callable = None,
+        merge: callable = None,
+        update_rows: callable = None,
+        refresh: bool = True,
+    ):
+        """
+        Args:
+            open_list (callable): Function receiving a game list name and returning its `gspread.Spreadsheet`.
+            list_names (list[str]): Names of the game lists.
+            max_rows (int): Rows kept in memory across every loaded list.
+            max_workers (int): Maximum number of lists loaded at the same time.
+            on_list_update (callable): Function called with the `LoadedList` when its state is replaced after
+                downloading remote changes.
+            on_sync_status (callable): Function called with the list name and the new status every time the
+                synchronization status of a list changes.
+            merge (callable): Function merging remote changes into the table of a list, refer to
+                `soul_link.data.SheetWrapper.merge_remote_changes`. Defaults to `soul_link.data.merge_rows`.
+            update_rows (callable): Function called with the table of a list, a key column and the refreshed cells,
+                like `soul_link.tui.TUI.update_table_rows`, returning the number of changed cells. Defaults to
+                `soul_link.table.Table.update_rows`.
+            refresh (bool): If `False`, the stale Steam data is not refreshed.
+        """
+        self.names = list(list_names)
+        self._open_list = open_list
+        self._max_rows = max_rows
+        self._on_list_update = on_list_update
+        self._on_sync_status = on_sync_status
+        self._merge = merge
+        self._update_rows = update_rows
+        self._refresh = refresh
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="soulink-list")
+        self._lock = Lock()
+        # list name -> future resolved with the `LoadedList`, from the least to the most recently used
+        self._lists: OrderedDict[str, Future] = OrderedDict()
+
+    def prefetch(self):
+        """
+        Start loading every list in the background, in the order of `names`.
+        """
+        for name in self.names:
+            self._submit(name)
+
+    def load(self, name: str) -> Future:
+        """
+        Get a list, loading it in the background if it is not loaded, and mark it as the most recently used one.
+
+        Args:
+            name (str): Game list name.
+
+        Returns:
+            Future resolved with the `LoadedList`.
+        """
+        future = self._submit(name)
+        with self._lock:
+            self._lists.move_to_end(name)
+        return future
+
+    def close(self) -> dict[str, Exception | None]:
+        """
+        Write the pending changes of every loaded list and stop the background threads.
+
+        Returns:
+            dict[str, Exception | None] with the lists whose changes could not be written and the last error.
+        """
+        # lists not loaded yet and downloads not started are cancelled
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        with self._lock:
+            futures = list(self._lists.items())
+        failed = {}
+        for name, future in futures:
+            if future.cancelled() or future.exception():
+                continue
+            # a list whose sheet is not opened yet opens it to write its pending changes
+            loaded = future.result()
+            loaded.stop_workers()
+            if not loaded.sync.close():
+                failed[name] = loaded.sync.error
+        return failed
+
+    def _submit(self, name: str) -> Future:
+        with self._lock:
+            future = self._lists.get(name)
+            if future is None:
+                future = self._lists[name] = self._executor.submit(self._load, name)
+                submitted = True
+            else:
+                submitted = False
+        if submitted:
+            # outside the lock, the callback runs right away if the list is already loaded
+            future.add_done_callback(lambda future: self._evict())
+        return future
+
+    def _load(self, name: str) -> LoadedList:
+        """
+        Load a list from its mirror, or from the sheet if it was never mirrored, and download the remote changes of a
+        mirrored list afterwards. Runs in the session threads.
+        """
+        with PROFILER.span("session.load", list=name):
+            mirror = SheetMirror(name)
+            mirrored_rows = mirror.load()
+            if mirrored_rows is None:
+                sheet_wrapper = SheetWrapper(self._open_list(name), mirror)
+                data = sheet_wrapper.get_table_paged()
+                sheet_opener = SheetOpener(None, sheet_wrapper)
+            else:
+                data = Table(mirrored_rows)
+                sheet_opener = SheetOpener(
+                    lambda: self._open_mirrored_list(loaded, mirror, mirrored_rows),
+                    on_error=lambda error: self._report_offline(name),
+                )
+            sync = WriteBehindSync(lambda data: sheet_opener.get().update_sheet(data))
+            loaded = LoadedList(name, TableState(data), sheet_opener, sync)
+            if self._on_sync_status:
+                sync.on_status_change = lambda status: self._on_sync_status(name, status)
+            sync.start()
+            self._start_workers(loaded)
+
+        if mirrored_rows is not None:
+            # return before downloading, the mirrored rows can be displayed meanwhile
+            try:
+                self._executor.submit(self._open_in_background, loaded)
+            except RuntimeError:
+                # the session is closing, `close` opens the sheet if there are changes to write
+                pass
+        return loaded
+
+    def _open_mirrored_list(
+        self, loaded: LoadedList, mirror: SheetMirror, mirrored_rows: list[list[str]]
+    ) -> SheetWrapper:
+        """
+        Open the sheet of a list loaded from its mirror and merge its changes if it changed since it was mirrored,
+        keeping the local edits made meanwhile. Called by the `SheetOpener` of the list, again after every failure
+        until it succeeds.
+        """
+        with PROFILER.span("session.pull", list=loaded.name):
+            wrapper = SheetWrapper(self._open_list(loaded.name), mirror)
+            result = wrapper.pull_changes(loaded.state.data, mirrored_rows, self._merge)
+        if self._on_sync_status:
+            # the sheet is reachable again, replace the offline status
+            self._on_sync_status(loaded.name, loaded.sync.status)
+        if result is not None:
+            self._on_merge(loaded, result)
+        return wrapper
+
+    def _replace_state(self, loaded: LoadedList, data: Table):
+        previous = loaded.state
+        loaded.state = TableState(data)
+        if self._on_list_update:
+            self._on_list_update(loaded)
+        previous.close()
+
+    def _start_workers(self, loaded: LoadedList):
+        """
+        Start the remote change watcher and, if the list has an `app_id` column, the refresher of a list.
+        """
+        loaded.watcher = RemoteChangeWatcher(
+            loaded.sheet_opener.get,
+            lambda: loaded.state.data,
+            self._merge,
+            lambda result: self._on_merge(loaded, result),
+        )
+        loaded.watcher.start()
+        if not self._refresh or "app_id" not in loaded.state.data.header:
+            return
+        from soul_link.refresh import FetchLog, StalenessRefresher
+
+        loaded.refresher = StalenessRefresher(
+            lambda: loaded.state.data, FetchLog(loaded.name), lambda changes: self._on_refresh(loaded, changes)
+        )
+        loaded.refresher.start()
+
+    def _on_merge(self, loaded: LoadedList, result: MergeResult):
+        if result.table is not None:
+            # the header changed, the pending data is written from the new table so it does not revert the header
+            self._replace_state(loaded, result.table)
+            if loaded.sync.status != loaded.sync.STATUS_SYNCED:
+                loaded.sync.submit(result.table)
+        if result.conflicts:
+            if self._on_sync_status:
+                self._on_sync_status(loaded.name, f"{result.conflicts} cells edited remotely kept the local value")
+            # write the local values over the remote ones
+            loaded.sync.submit(loaded.state.data)
+
+    def _on_refresh(self, loaded: LoadedList, changes: dict[str, dict[str, str]]):
+        data = loaded.state.data
+        if self._update_rows:
+            changed = self._update_rows(data, "app_id", changes)
+        else:
+            changed = data.update_rows("app_id", changes)
+        if changed:
+            loaded.sync.submit(data)
+
+    def _report_offline(self, name: str):
+        if self._on_sync_status:
+            self._on_sync_status(name, "offline")
+
+    def _open_in_background(self, loaded: LoadedList):
+        try:
+            loaded.sheet_opener.get()
+        except Exception:
+            # reported by the opener `on_error`, opened again by the next write
+            pass
+
+    def _evict(self):
+        """
+        Drop the least recently used lists while the loaded rows do not fit in `max_rows`. The two most recently used
+        lists, the displayed one and the one being switched to, and lists with changes not written yet are never
+        evicted.
+        """
+        with self._lock:
+            loaded = [
+                (name, future.result())
+                for name, future in self._lists.items()
+                if future.done() and not future.cancelled() and not future.exception()
+            ]
+            rows = sum(len(item) for _, item in loaded)
+            evicted = []
+            for name, item in loaded[:-2]:
+                if rows <= self._max_rows:
+                    break
+                if item.sync.status != item.sync.STATUS_SYNCED:
+                    continue
+                del self._lists[name]
+                evicted.append(item)
+                rows -= len(item)
+        for item in evicted:
+            item.stop_workers()
+            item.sync.close()
+            item.state.close()
@@ -0,0 +1,176 @@
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from soul_link.table import Table
+
+if TYPE_CHECKING:
+    # imported when needed, pandas and pyarrow take longer to import than the rest of the program
+    import pandas
+
+SNAPSHOT_FORMATS = ("parquet", "feather")
+SNAPSHOT_SUFFIXES = {".parquet": "parquet", ".pq": "parquet", ".feather": "feather", ".arrow": "feather"}
+
+# typed columns, the rest of the columns are stored as strings
+BOOLEAN_COLUMNS = ("is_free", "released")
+LIST_COLUMNS = ("categories", "genres")
+INTEGER_COLUMNS = ("app_id",)
+# separator of the values of list columns in the sheet cells, as written by `collect_game_data.to_sheet_row`
+LIST_SEPARATOR = ", "
+
+
+def get_snapshot_format(path: str | Path, snapshot_format: str | None = None) -> str:
+    """
+    Get the format of a snapshot file.
+
+    Args:
+        path (str | Path): Snapshot path.
+        snapshot_format (str | None): Explicit format, one of `SNAPSHOT_FORMATS`.
+
+    Returns:
+        str with the given format, or the one matching the path suffix.
+
+    Raises:
+        ValueError: If no format is given and the path suffix is not a snapshot suffix.
+    """
+    if snapshot_format:
+        return snapshot_format
+    suffix = Path(path).suffix.lower()
+    if suffix not in SNAPSHOT_SUFFIXES:
+        raise ValueError(f"Unknown snapshot format of '{path}', use one of {', '.join(SNAPSHOT_SUFFIXES)}")
+    return SNAPSHOT_SUFFIXES[suffix]
+
+
+def is_snapshot(path: str | Path) -> bool:
+    return Path(path).suffix.lower() in SNAPSHOT_SUFFIXES
+
+
+def table_to_frame(data: Table) -> "pandas.DataFrame":
+    """
+    Convert a table to a data frame with typed columns: nullable booleans for `BOOLEAN_COLUMNS`, lists of strings for
+    `LIST_COLUMNS` and nullable integers for `INTEGER_COLUMNS`. Columns with cells that do not match their type are
+    kept as strings.
+
+    Args:
+        data (Table): Converted table.
+
+    Returns:
+        pandas.DataFrame with one column per table column.
+    """
+    import pandas
+
+    with data.lock:
+        columns = {name: _typed_column(name, data.column_values(column)) for column, name in enumerate(data.header)}
+    return pandas.DataFrame(columns)
+
+
+def frame_to_rows(frame: "pandas.DataFrame") -> list[list[str]]:
+    """
+    Convert a data frame to sheet rows, the opposite of `table_to_frame`. Booleans are written as `TRUE` or `FALSE`,
+    lists as comma separated values and missing values as empty cells.
+
+    Args:
+        frame (pandas.DataFrame): Converted data frame.
+
+    Returns:
+        list[list[str]] with the header and the rows.
+    """
+    columns = [_column_cells(frame[name]) for name in frame.columns]
+    return [[str(name) for name in frame.columns]] + [list(row) for row in zip(*columns)]
+
+
+def write_snapshot(data: Table, path: str | Path, snapshot_format: str | None = None):
+    """
+    Write a table to a columnar snapshot file with typed columns. Feather files are written uncompressed so they can
+    be memory mapped by `read_snapshot` without decoding them.
+
+    Args:
+        data (Table): Written table.
+        path (str | Path): Snapshot path.
+        snapshot_format (str | None): One of `SNAPSHOT_FORMATS`, defaults to the one matching the path suffix.
+
+    Raises:
+        ImportError: If `pyarrow` is not installed.
+        ValueError: If no format is given and the path suffix is not a snapshot suffix.
+    """
+    snapshot_format = get_snapshot_format(path, snapshot_format)
+    _require_pyarrow()
+    frame = table_to_frame(data)
+    if snapshot_format == "feather":
+        frame.to_feather(path, compression="uncompressed")
+    else:
+        frame.to_parquet(path, index=False)
+
+
+def read_snapshot(
+    path: str | Path, columns: list[str] | None = None, snapshot_format: str | None = None
+) -> "pandas.DataFrame":
+    """
+    Read a snapshot written by `write_snapshot`. The file is memory mapped, only the pages of the requested columns
+    are read from disk.
+
+    Args:
+        path (str | Path): Snapshot path.
+        columns (list[str] | None): Columns to read, `None` for every column.
+        snapshot_format (str | None): One of `SNAPSHOT_FORMATS`, defaults to the one matching the path suffix.
+
+    Returns:
+        pandas.DataFrame with the snapshot columns.
+
+    Raises:
+        ImportError: If `pyarrow` is not installed.
+        ValueError: If no format is given and the path suffix is not a snapshot suffix.
+    """
+    snapshot_format = get_snapshot_format(path, snapshot_format)
+    _require_pyarrow()
+    if snapshot_format == "feather":
+        from pyarrow import feather
+
+        arrow_table = feather.read_table(path, columns=columns, memory_map=True)
+    else:
+        from pyarrow import parquet
+
+        arrow_table = parquet.read_table(path, columns=columns, memory_map=True)
+    return arrow_table.to_pandas()
+
+
+def _typed_column(name: str, values: list[str]) -> "pandas.Series":
+    import pandas
+
+    distinct = set(values)
+    if name in BOOLEAN_COLUMNS and distinct <= {"TRUE", "FALSE", ""}:
+        return pandas.Series([{"TRUE": True, "FALSE": False}.get(value) for value in values], dtype="boolean")
+    if name in INTEGER_COLUMNS and all(value.isdigit() for value in distinct if value):
+        return pandas.Series([int(value) if value else None for value in values], dtype="Int64")
+    if name in LIST_COLUMNS:
+        return pandas.Series([value.split(LIST_SEPARATOR) if value else [] for value in values], dtype="object")
+    return pandas.Series(values, dtype="string")
+
+
+def _column_cells(column: "pandas.Series") -> list[str]:
+    """
+    Convert the values of a data frame column to sheet cells.
+    """
+    import pandas
+
+    cells = []
+    for value in column.tolist():
+        if isinstance(value, str):
+            cells.append(value)
+        elif isinstance(value, bool):
+            cells.append("TRUE" if value else "FALSE")
+        elif hasattr(value, "__len__"):
+            # list values are read back as numpy arrays
+            cells.append(LIST_SEPARATOR.join(str(item) for item in value))
+        elif pandas.isna(value):
+            # `None`, `NaN` and `pandas.NA`
+            cells.append("")
+        else:
+            cells.append(str(value))
+    return cells
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as error:
+        raise ImportError("Snapshots need the `pyarrow` package, install it with `pip install pyarrow`") from error
@@ -0,0 +1,151 @@
+from bisect import bisect_left, bisect_right
+
+from soul_link.search import split_values
+from soul_link.table import Table
+
+GROUP_COLUMNS = ("categories", "genres")
+
+
+class SortCache:
+    """
+    Cache of sort permutations of a `soul_link.table.Table`. A permutation is the list of row IDs ordered by the
+    values of a column, the table itself is never reordered.
+
+    Permutations are computed with a vectorized stable sort the first time they are requested and kept updated by
+    listening to the table changes: inserted or updated rows are placed with a binary search and deleted rows are
+    removed, so the permutation is never computed again. Rows with the same value keep their table order, like a
+    fresh stable sort would give. Permutations are only computed again after `Table.reorder`.
+    """
+
+    def __init__(self, table: Table):
+        """
+        Args:
+            table (Table): Sorted table.
+        """
+        self._table = table
+        # (column, group) -> (sort keys, row IDs) sorted by key
+        self._permutations: dict[tuple[int, bool], tuple[list[str], list[int]]] = {}
+        self._ranks: dict[tuple[int, bool, bool], dict[int, int]] = {}
+        # permutations are computed again when the table is reordered
+        self._order_version = table.order_version
+        table.subscribe(self._on_change)
+
+    def close(self):
+        """
+        Stop listening to the table changes.
+        """
+        self._table.unsubscribe(self._on_change)
+
+    def permutation(self, column: int, descending: bool = False, group: bool = False) -> list[int]:
+        """
+        Get the row IDs ordered by the values of `column`. Integers are compared by their numeric value and placed
+        before the rest of values, which are compared ignoring the case.
+
+        Args:
+            column (int): Column position.
+            descending (bool): If `True`, the order is reversed.
+            group (bool): If `True`, rows are ordered by the first value of a comma separated list column, like
+                `genres`, so rows sharing it are displayed together.
+
+        Returns:
+            list[int] with the ordered row IDs. It must not be modified.
+        """
+        with self._table.lock:
+            if self._order_version != self._table.order_version:
+                # ties follow the new table order
+                self._permutations.clear()
+                self._ranks.clear()
+                self._order_version = self._table.order_version
+            if (column, group) not in self._permutations:
+                self._permutations[(column, group)] = self._compute(column, group)
+            row_ids = self._permutations[(column, group)][1]
+            return row_ids[::-1] if descending else row_ids
+
+    def rank(self, column: int, descending: bool = False, group: bool = False) -> dict[int, int]:
+        """
+        Get the position of every row in a permutation. Refer to `SortCache.permutation` for the arguments.
+
+        Returns:
+            dict[int, int] mapping row IDs to their position in the permutation.
+        """
+        with self._table.lock:
+            key = (column, descending, group)
+            permutation = self.permutation(column, descending, group)
+            if key not in self._ranks:
+                self._ranks[key] = {row_id: position for position, row_id in enumerate(permutation)}
+            return self._ranks[key]
+
+    def group_of(self, column: int, row_id: int) -> str:
+        """
+        Args:
+            column (int): Column position.
+            row_id (int): Row ID.
+
+        Returns:
+            str with the group of the row when grouping by `column`.
+        """
+        return _group_key(self._table.row_by_id(row_id)[column])
+
+    def _compute(self, column: int, group: bool) -> tuple[list[str], list[int]]:
+        # numpy is only imported when a column is sorted, it slows down the startup
+        import numpy as np
+
+        key = _group_key if group else _sort_key
+        keys = [key(value) for value in self._table.column_values(column)]
+        # sort the distinct keys and argsort their integer codes, cells are never copied into a fixed width array
+        codes = {value: code for code, value in enumerate(sorted(set(keys)))}
+        order = np.argsort(
+            np.fromiter((codes[value] for value in keys), dtype=np.int64, count=len(keys)), kind="stable"
+        )
+        row_ids = np.array(self._table.row_ids(), dtype=np.int64)
+        return [keys[i] for i in order], row_ids[order].tolist()
+
+    def _on_change(self, event: str, row_id: int, row: tuple[str]):
+        self._ranks.clear()
+        for (column, group), (keys, row_ids) in self._permutations.items():
+            key = _group_key if group else _sort_key
+            if event in (Table.EVENT_DELETE, Table.EVENT_UPDATE):
+                old_key = key(row[column])
+                start = bisect_left(keys, old_key)
+                position = row_ids.index(row_id, start, bisect_right(keys, old_key, start))
+                del keys[position]
+                del row_ids[position]
+            if event in (Table.EVENT_INSERT, Table.EVENT_UPDATE):
+                new_key = key(self._table.row_by_id(row_id)[column])
+                position = self._tie_position(keys, row_ids, new_key, row_id)
+                keys.insert(position, new_key)
+                row_ids.insert(position, row_id)
+
+    def _tie_position(self, keys: list[str], row_ids: list[int], key: str, row_id: int) -> int:
+        """
+        Get the position of a row in a permutation, after the rows with a lower key and among the rows with the same
+        key by table position. Rows with the same key are in table order, so it is found with a binary search.
+        """
+        low = bisect_left(keys, key)
+        high = bisect_right(keys, key, low)
+        if low == high:
+            return low
+        table_position = self._table.index_of(row_id)
+        while low < high:
+            middle = (low + high) // 2
+            if self._table.index_of(row_ids[middle]) < table_position:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+
+def _sort_key(value: str) -> str:
+    """
+    Values are compared ignoring the case. Integers, like `app_id`, are compared by their value and placed before
+    the rest: their key is a character lower than any text followed by the number of digits and the digits.
+    """
+    if value.isascii() and value.isdecimal():
+        digits = value.lstrip("0") or "0"
+        return f"\0{len(digits):05d}{digits}"
+    return value.lower()
+
+
+def _group_key(value: str) -> str:
+    values = split_values(value)
+    return values[0] if values else ""
@@ -0,0 +1,157 @@
+import time
+from threading import Condition, Thread
+
+
+class WriteBehindSync:
+    """
+    Background worker that sits between the TUI and `soul_link.data.SheetWrapper`. Submitted data is not written
+    immediately, the worker waits until no new data has been submitted for `delay` seconds and then flushes only the
+    latest submission, so a burst of edits ends up as a single write.
+
+    Failed flushes are retried with an increasing delay as long as there is no newer data to write.
+    """
+
+    STATUS_SYNCED = "synced"
+    STATUS_PENDING = "pending"
+    STATUS_IN_FLIGHT = "in-flight"
+    STATUS_FAILED = "failed"
+
+    _MAX_RETRY_DELAY = 60
+
+    def __init__(self, flush: callable, delay: float = 1.0, max_delay: float = 5.0, on_status_change: callable = None):
+        """
+        Args:
+            flush (callable): Function that writes the submitted data, it receives the data as its only argument.
+            delay (float): Seconds without new submissions to wait before flushing.
+            max_delay (float): Maximum seconds that a submission can wait before being flushed, even if new data keeps
+                arriving.
+            on_status_change (callable): Function called from the worker thread every time the status changes. It
+                receives the new status as its only argument.
+        """
+        self._flush = flush
+        self._delay = delay
+        self._max_delay = max_delay
+        self.on_status_change = on_status_change
+        self._condition = Condition()
+        self._data = None
+        self._has_data = False
+        self._first_submit = 0.0
+        self._last_submit = 0.0
+        self._retry_at = 0.0
+        self._failures = 0
+        self._closing = False
+        self._thread = Thread(target=self._run, daemon=True)
+        self.status = self.STATUS_SYNCED
+        self.error: Exception | None = None
+
+    def start(self):
+        """
+        Start the background worker.
+        """
+        self._thread.start()
+
+    def submit(self, data):
+        """
+        Queue `data` to be written, replacing any data that has not been flushed yet. This function returns
+        immediately.
+
+        Args:
+            data: Data passed to the `flush` function. It is read when it is flushed, so submitting the same mutable
+                object after every change writes its latest state.
+        """
+        with self._condition:
+            now = time.monotonic()
+            if not self._has_data:
+                self._first_submit = now
+            self._data = data
+            self._has_data = True
+            self._last_submit = now
+            self._retry_at = 0.0
+            self.status = self.STATUS_PENDING
+            self._condition.notify()
+        self._notify_status()
+
+    def close(self, timeout: float | None = None) -> bool:
+        """
+        Flush any pending data without waiting for the debounce delay and stop the worker.
+
+        Args:
+            timeout (float | None): Maximum seconds to wait for the pending data to be written.
+
+        Returns:
+            bool: `True` if everything was written, `False` if the last flush failed or timed out.
+        """
+        with self._condition:
+            self._closing = True
+            self._condition.notify()
+        if self._thread.is_alive():
+            self._thread.join(timeout)
+        return not self._has_data and self.status == self.STATUS_SYNCED
+
+    def _run(self):
+        while True:
+            with self._condition:
+                data = self._wait_for_data()
+                if data is None:
+                    return
+                self._has_data = False
+                self.status = self.STATUS_IN_FLIGHT
+            self._notify_status()
+
+            try:
+                self._flush(data)
+            except Exception as error:
+                with self._condition:
+                    self.error = error
+                    self._failures += 1
+                    if not self._has_data:
+                        self._data = data
+                        self._has_data = True
+                        self._retry_at = time.monotonic() + min(self._delay * 2**self._failures, self._MAX_RETRY_DELAY)
+                    self.status = self.STATUS_FAILED
+                    # do not keep retrying on exit, report the failure instead
+                    stop = self._closing and self._retry_at
+                self._notify_status()
+                if stop:
+                    return
+                continue
+
+            with self._condition:
+                self.error = None
+                self._failures = 0
+                self.status = self.STATUS_PENDING if self._has_data else self.STATUS_SYNCED
+            self._notify_status()
+
+    def _wait_for_data(self):
+        """
+        Block until there is data ready to be flushed. Must be called while holding `_condition`.
+
+        Returns:
+            The data to flush or `None` if the worker should stop.
+        """
+        while True:
+            if not self._has_data:
+                if self._closing:
+                    return None
+                self._condition.wait()
+                continue
+
+            if self._closing:
+                return self._data
+
+            now = time.monotonic()
+            if self._retry_at:
+                flush_at = self._retry_at
+            else:
+                flush_at = min(self._last_submit + self._delay, self._first_submit + self._max_delay)
+            if now >= flush_at:
+                return self._data
+            self._condition.wait(flush_at - now)
+
+    def _notify_status(self):
+        """
+        Call `on_status_change` with the current status. It is called without holding `_condition` so the callback
+        can safely wait for locks held by threads that submit data.
+        """
+        if self.on_status_change:
+            self.on_status_change(self.status)
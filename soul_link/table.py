@@ -0,0 +1,601 @@
+import sys
+from collections.abc import Iterable, Iterator
+from itertools import chain, islice
+from threading import Event, Lock, RLock
+
+INTERNED_COLUMNS = ("is_free", "categories", "genres", "released")
+
+
+class Table:
+    """
+    Game list storage shared by `soul_link.tui.TUI` and `soul_link.data.SheetWrapper`.
+
+    Cells are stored by column as regular variable length `str`, so a row does not pay for the longest cell of the
+    sheet. Columns with few distinct values (`INTERNED_COLUMNS`) share a single `str` object per distinct value.
+
+    Every row gets a stable row ID when it is added. Row storage is indexed by row ID and the display order is kept in
+    a separate `_BlockList` of row IDs, so deleting or inserting a row only moves the row IDs of one block, cells are
+    never copied and the cost does not grow linearly with the table size. Slots of deleted rows are tombstoned and
+    reused by the next insertions.
+
+    Reading methods hold the table lock, so rows can be read from any thread while another one changes the table.
+    Listeners registered with `subscribe` are called after every change, while holding the table lock, with the
+    arguments `(event, row_id, row)`, where `event` is one of `Table.EVENT_INSERT`, `Table.EVENT_DELETE` or
+    `Table.EVENT_UPDATE` and `row` the row content (the old content for deletions and updates).
+    """
+
+    EVENT_INSERT = "insert"
+    EVENT_DELETE = "delete"
+    EVENT_UPDATE = "update"
+
+    def __init__(self, rows: list[list[str]], interned_columns: Iterable[str] = INTERNED_COLUMNS):
+        """
+        Args:
+            rows (list[list[str]]): Table content with the header as first row, like the one returned by
+                `gspread.Worksheet.get_all_values`.
+            interned_columns (Iterable[str]): Names of the columns whose values are interned.
+        """
+        self.header: tuple[str] = tuple(rows[0]) if rows else ()
+        self._pools: list[dict[str, str] | None] = [{} if name in interned_columns else None for name in self.header]
+        self._columns: list[list[str | None]] = [[] for _ in self.header]
+        self._order = _BlockList()
+        self._free: list[int] = []
+        self._slots = 0
+        self._listeners: list[callable] = []
+        self._lock = RLock()
+        self._positions: dict[int, int] | None = None
+        self.version = 0
+        # changed by `reorder`, which does not notify the listeners
+        self.order_version = 0
+        self._order.extend(self._store(row) for row in rows[1:])
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    @property
+    def width(self) -> int:
+        return len(self.header)
+
+    @property
+    def lock(self) -> RLock:
+        """
+        Lock held while the table is modified. Hold it to read several rows from a thread that does not modify the
+        table.
+        """
+        return self._lock
+
+    def subscribe(self, listener: callable):
+        """
+        Register a function called after every change. Refer to the class docstring for its arguments.
+
+        Args:
+            listener (callable): Function called after every change.
+        """
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: callable):
+        """
+        Remove a function registered with `subscribe`.
+
+        Args:
+            listener (callable): Registered function.
+        """
+        self._listeners.remove(listener)
+
+    def row(self, index: int) -> tuple[str]:
+        """
+        Args:
+            index (int): Row position, the header is not counted.
+
+        Returns:
+            tuple[str] with the row cells.
+        """
+        with self._lock:
+            return self.row_by_id(self._order[index])
+
+    def row_by_id(self, row_id: int) -> tuple[str]:
+        """
+        Args:
+            row_id (int): Row ID.
+
+        Returns:
+            tuple[str] with the row cells.
+        """
+        return tuple(column[row_id] for column in self._columns)
+
+    def row_id(self, index: int) -> int:
+        """
+        Args:
+            index (int): Row position, the header is not counted.
+
+        Returns:
+            int with the row ID.
+        """
+        with self._lock:
+            return self._order[index]
+
+    def row_ids(self) -> list[int]:
+        """
+        Returns:
+            list[int] with the row IDs in display order.
+        """
+        with self._lock:
+            return list(self._order)
+
+    def index_of(self, row_id: int) -> int:
+        """
+        Args:
+            row_id (int): Row ID.
+
+        Returns:
+            int with the row position.
+
+        Raises:
+            ValueError: If the row does not exist.
+        """
+        with self._lock:
+            return self._order.index(row_id)
+
+    def positions(self) -> dict[int, int]:
+        """
+        Get the position of every row. The mapping is cached until the table changes, so it is cheap to call it
+        several times between changes.
+
+        Returns:
+            dict[int, int] mapping row IDs to row positions.
+        """
+        with self._lock:
+            if self._positions is None:
+                self._positions = {row_id: position for position, row_id in enumerate(self._order)}
+            return self._positions
+
+    def rows(self, start: int = 0, stop: int | None = None) -> list[tuple[str]]:
+        """
+        Get a slice of rows, only the cells of the requested rows are read.
+
+        Args:
+            start (int): First row position.
+            stop (int | None): Position after the last row. If `None`, rows are returned until the end of the table.
+
+        Returns:
+            list[tuple[str]] with the requested rows.
+        """
+        with self._lock:
+            return [self.row_by_id(row_id) for row_id in self._order[start:stop]]
+
+    def cell(self, index: int, column: int) -> str:
+        """
+        Args:
+            index (int): Row position.
+            column (int): Column position.
+
+        Returns:
+            str with the cell value.
+        """
+        with self._lock:
+            return self._columns[column][self._order[index]]
+
+    def column_values(self, column: int) -> list[str]:
+        """
+        Args:
+            column (int): Column position.
+
+        Returns:
+            list[str] with the column values in display order.
+        """
+        values = self._columns[column]
+        with self._lock:
+            return [values[row_id] for row_id in self._order]
+
+    def to_rows(self) -> list[tuple[str]]:
+        """
+        Returns:
+            list[tuple[str]] with the full table content, header included.
+        """
+        with self._lock:
+            return [self.header] + [self.row_by_id(row_id) for row_id in self._order]
+
+    def insert(self, index: int, row: Iterable[str]) -> int:
+        """
+        Insert a row.
+
+        Args:
+            index (int): Position where the row is inserted.
+            row (Iterable[str]): Row cells.
+
+        Returns:
+            int with the ID of the inserted row.
+        """
+        with self._lock:
+            row_id = self._store(row)
+            self._order.insert(index, row_id)
+            self._notify(self.EVENT_INSERT, row_id)
+        return row_id
+
+    def append(self, row: Iterable[str]) -> int:
+        """
+        Add a row at the end of the table.
+
+        Args:
+            row (Iterable[str]): Row cells.
+
+        Returns:
+            int with the ID of the added row.
+        """
+        return self.insert(len(self._order), row)
+
+    def delete(self, index: int) -> tuple[str]:
+        """
+        Delete a row.
+
+        Args:
+            index (int): Row position.
+
+        Returns:
+            tuple[str] with the deleted row cells.
+        """
+        with self._lock:
+            row_id = self._order.pop(index)
+            row = self.row_by_id(row_id)
+            for column in self._columns:
+                column[row_id] = None
+            self._free.append(row_id)
+            self._notify(self.EVENT_DELETE, row_id, row)
+        return row
+
+    def update(self, index: int, column: int, value: str):
+        """
+        Change the value of a cell.
+
+        Args:
+            index (int): Row position.
+            column (int): Column position.
+            value (str): New cell value.
+        """
+        with self._lock:
+            row_id = self._order[index]
+            row = self.row_by_id(row_id)
+            self._columns[column][row_id] = self._intern(column, value)
+            self._notify(self.EVENT_UPDATE, row_id, row)
+
+    def update_rows(self, key_column: str, changes: dict[str, dict[str, str]]) -> int:
+        """
+        Change cells of the rows identified by the value of a key column, like `app_id`, which unlike row positions
+        does not change when other rows are edited.
+
+        Args:
+            key_column (str): Name of the column identifying the rows.
+            changes (dict[str, dict[str, str]]): New cell values by column name, by key value. Missing rows and columns
+                are ignored.
+
+        Returns:
+            int with the number of changed cells.
+        """
+        if key_column not in self.header:
+            return 0
+        keys = self._columns[self.header.index(key_column)]
+        columns = {name: i for i, name in enumerate(self.header)}
+        changed = 0
+        with self._lock:
+            for index, row_id in enumerate(self._order):
+                for name, value in changes.get(keys[row_id], {}).items():
+                    column = columns.get(name)
+                    if column is not None and self._columns[column][row_id] != value:
+                        self.update(index, column, value)
+                        changed += 1
+        return changed
+
+    def reorder(self, row_ids: list[int]):
+        """
+        Change the display order of the rows.
+
+        Args:
+            row_ids (list[int]): Every row ID of the table in the new order.
+
+        Raises:
+            ValueError: If `row_ids` does not contain exactly the table row IDs.
+        """
+        with self._lock:
+            if len(row_ids) != len(self._order) or set(row_ids) != set(self._order):
+                raise ValueError("The new order must contain every row of the table exactly once")
+            self._order = _BlockList(row_ids)
+            self.order_version += 1
+            self._changed()
+
+    def _store(self, row: Iterable[str]) -> int:
+        """
+        Store the row cells in a free slot and return its row ID.
+        """
+        row = list(row)[: self.width]
+        row += [""] * (self.width - len(row))
+        if self._free:
+            row_id = self._free.pop()
+        else:
+            row_id = self._slots
+            self._slots += 1
+            for column in self._columns:
+                column.append(None)
+        for i, value in enumerate(row):
+            self._columns[i][row_id] = self._intern(i, value)
+        return row_id
+
+    def _intern(self, column: int, value: str) -> str:
+        pool = self._pools[column]
+        if pool is None:
+            return value
+        return pool.setdefault(value, value)
+
+    def _changed(self):
+        self.version += 1
+        self._positions = None
+
+    def _notify(self, event: str, row_id: int, row: tuple[str] | None = None):
+        self._changed()
+        if not self._listeners:
+            return
+        if row is None:
+            row = self.row_by_id(row_id)
+        for listener in list(self._listeners):
+            listener(event, row_id, row)
+
+
+class _BlockList:
+    """
+    List of row IDs split in blocks of up to `2 * _BLOCK_SIZE` items. Inserting or deleting an item only moves the
+    items of its block, and the block lengths are kept in a Fenwick tree, so finding the block of a position and
+    updating the lengths after a change take O(log n). Inserting, deleting and finding an item cost O(sqrt(n)) at
+    most instead of the O(n) of a plain list, editing a large table costs about the same as editing a small one.
+
+    Items must be non-negative integers, the block holding each item is kept in a list indexed by item to find the
+    position of an item without scanning the whole list.
+    """
+
+    _BLOCK_SIZE = 512
+
+    def __init__(self, items: Iterable[int] = ()):
+        """
+        Args:
+            items (Iterable[int]): Initial items.
+        """
+        self._blocks: list[list[int]] = []
+        self._block_of: list[list[int] | None] = []
+        self._length = 0
+        # Fenwick tree of the block lengths and position of every block by its `id`, both `None` after blocks are
+        # added or removed and built again when they are needed
+        self._tree: list[int] | None = None
+        self._block_positions: dict[int, int] | None = None
+        self.extend(items)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[int]:
+        return chain.from_iterable(self._blocks)
+
+    def __getitem__(self, index: int | slice) -> int | list[int]:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._length)
+            if step != 1:
+                return list(self)[index]
+            if start >= stop:
+                return []
+            position, offset = self._locate(start)
+            items = chain(self._blocks[position][offset:], chain.from_iterable(self._blocks[position + 1 :]))
+            return list(islice(items, stop - start))
+        position, offset = self._locate(index)
+        return self._blocks[position][offset]
+
+    def extend(self, items: Iterable[int]):
+        items = list(items)
+        if not items:
+            return
+        if max(items) >= len(self._block_of):
+            self._block_of.extend([None] * (max(items) + 1 - len(self._block_of)))
+        block_of = self._block_of
+        start = 0
+        if self._blocks and len(self._blocks[-1]) < self._BLOCK_SIZE:
+            # fill the last block first
+            block = self._blocks[-1]
+            start = self._BLOCK_SIZE - len(block)
+            block.extend(items[:start])
+            for item in items[:start]:
+                block_of[item] = block
+            self._add_length(len(self._blocks) - 1, len(items[:start]))
+        for i in range(start, len(items), self._BLOCK_SIZE):
+            block = items[i : i + self._BLOCK_SIZE]
+            self._blocks.append(block)
+            for item in block:
+                block_of[item] = block
+            self._blocks_changed()
+        self._length += len(items)
+
+    def insert(self, index: int, item: int):
+        """
+        Insert an item before position `index`, positions past the end append it.
+        """
+        if index < 0:
+            index = max(index + self._length, 0)
+        if index >= self._length:
+            self.extend((item,))
+            return
+        position, offset = self._locate(index)
+        block = self._blocks[position]
+        block.insert(offset, item)
+        self._set_block(item, block)
+        self._length += 1
+        if len(block) > 2 * self._BLOCK_SIZE:
+            new_block = block[self._BLOCK_SIZE :]
+            del block[self._BLOCK_SIZE :]
+            self._blocks.insert(position + 1, new_block)
+            for moved in new_block:
+                self._block_of[moved] = new_block
+            self._blocks_changed()
+        else:
+            self._add_length(position, 1)
+
+    def pop(self, index: int = -1) -> int:
+        position, offset = self._locate(index)
+        block = self._blocks[position]
+        item = block.pop(offset)
+        self._block_of[item] = None
+        self._length -= 1
+        if block:
+            self._add_length(position, -1)
+        else:
+            del self._blocks[position]
+            self._blocks_changed()
+        return item
+
+    def index(self, item: int) -> int:
+        """
+        Raises:
+            ValueError: If the item is not in the list.
+        """
+        block = self._block_of[item] if 0 <= item < len(self._block_of) else None
+        if block is None:
+            raise ValueError(f"{item} is not in list")
+        if self._block_positions is None:
+            self._block_positions = {id(block): position for position, block in enumerate(self._blocks)}
+        # sum of the lengths of the blocks before it
+        tree = self._get_tree()
+        start = 0
+        i = self._block_positions[id(block)]
+        while i > 0:
+            start += tree[i]
+            i -= i & -i
+        return start + block.index(item)
+
+    def _set_block(self, item: int, block: list[int]):
+        if item >= len(self._block_of):
+            self._block_of.extend([None] * (item + 1 - len(self._block_of)))
+        self._block_of[item] = block
+
+    def _blocks_changed(self):
+        self._tree = None
+        self._block_positions = None
+
+    def _get_tree(self) -> list[int]:
+        if self._tree is None:
+            tree = [0] + [len(block) for block in self._blocks]
+            for i in range(1, len(tree)):
+                parent = i + (i & -i)
+                if parent < len(tree):
+                    tree[parent] += tree[i]
+            self._tree = tree
+        return self._tree
+
+    def _add_length(self, position: int, delta: int):
+        tree = self._tree
+        if tree is None:
+            return
+        i = position + 1
+        while i < len(tree):
+            tree[i] += delta
+            i += i & -i
+
+    def _locate(self, index: int) -> tuple[int, int]:
+        """
+        Get the block position and the offset inside that block of a list position.
+        """
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("list index out of range")
+        tree = self._get_tree()
+        position = 0
+        step = 1 << (len(tree) - 1).bit_length()
+        while step:
+            following = position + step
+            if following < len(tree) and tree[following] <= index:
+                position = following
+                index -= tree[following]
+            step >>= 1
+        return position, index
+
+
+class PagedTable(Table):
+    """
+    `Table` filled page by page in the background, created by `soul_link.data.SheetWrapper.get_table_paged`. It can be
+    displayed and edited while the rest of the rows are still being downloaded, downloaded rows are always added at
+    the end of the table.
+
+    `on_page` is called, from the download thread, after every added page and once the download finishes or fails.
+    """
+
+    def __init__(self, rows: list[list[str]], expected_rows: int | None = None, **kwargs):
+        """
+        Args:
+            rows (list[list[str]]): First page, with the header as first row.
+            expected_rows (int | None): Upper bound of the number of rows of the complete table, if known.
+            **kwargs: Arguments of `Table`.
+        """
+        super().__init__(rows, **kwargs)
+        self.expected_rows = expected_rows
+        self.on_page: callable = None
+        self.error: Exception | None = None
+        self._complete = Event()
+        self._wanted_lock = Lock()
+        self._wanted_rows = 0
+
+    @property
+    def complete(self) -> bool:
+        """
+        `True` once every row has been downloaded or the download has failed.
+        """
+        return self._complete.is_set()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """
+        Block until the download finishes.
+
+        Args:
+            timeout (float | None): Maximum seconds to wait.
+
+        Returns:
+            bool: `True` if the download finished.
+        """
+        return self._complete.wait(timeout)
+
+    def request_rows(self, count: int | None):
+        """
+        Ask the download to reach `count` rows with its next request, instead of page by page. Used when the user jumps
+        past the downloaded rows.
+
+        Args:
+            count (int | None): Number of wanted rows, `None` for every row.
+        """
+        with self._wanted_lock:
+            self._wanted_rows = max(self._wanted_rows, count if count is not None else sys.maxsize)
+
+    def take_wanted_rows(self) -> int:
+        """
+        Get and reset the number of rows requested with `request_rows`. Called by the download thread.
+        """
+        with self._wanted_lock:
+            wanted, self._wanted_rows = self._wanted_rows, 0
+            return wanted
+
+    def add_page(self, rows: list[list[str]]):
+        """
+        Add downloaded rows at the end of the table. Called by the download thread.
+
+        Args:
+            rows (list[list[str]]): Downloaded rows.
+        """
+        with self._lock:
+            for row in rows:
+                self.append(row)
+        if self.on_page:
+            self.on_page()
+
+    def finish(self, error: Exception | None = None):
+        """
+        Mark the download as finished. Called by the download thread.
+
+        Args:
+            error (Exception | None): Error that stopped the download, if any.
+        """
+        self.error = error
+        self._complete.set()
+        if self.on_page:
+            self.on_page()
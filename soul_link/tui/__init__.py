@@ -0,0 +1,768 @@
+import os
+from threading import Lock
+
+from colorama import Back, Style, init
+
+from soul_link import keyboard
+from soul_link.data import MergeResult, merge_rows
+from soul_link.profiling import PROFILER, traced
+from soul_link.search import InvertedIndex
+from soul_link.sort import GROUP_COLUMNS, SortCache
+from soul_link.table import PagedTable, Table
+from soul_link.tui.layout import ColumnLayout
+from soul_link.tui.loop import EventLoop
+from soul_link.tui.screen import Screen
+
+
+class TableState:
+    """
+    Table displayed by the TUI with the structures derived from it: the search index, the sort cache and the column
+    layout. Building them takes a while for long lists, so they can be built in a background thread, before the table
+    is displayed.
+    """
+
+    def __init__(self, data: Table):
+        """
+        Args:
+            data (Table): Displayed table.
+        """
+        self.data = data
+        self.index = InvertedIndex(data)
+        self.sorts = SortCache(data)
+        self.layout = ColumnLayout(data)
+
+    def close(self):
+        """
+        Stop updating the derived structures, once the table is not displayed anymore.
+        """
+        self.index.close()
+        self.sorts.close()
+        self.layout.close()
+
+
+class TUI:
+    _MODE_TABLE = "table"
+    _MODE_ROW = "row"
+    _MODE_COLUMN = "column"
+    _MODE_SEARCH = "search"
+    _MODE_FILTER = "filter"
+
+    _EXIT_KEYS = (keyboard.COM_CTRL_C, keyboard.COM_CTRL_D)
+    # keys whose consecutive presses, like the ones sent while the key is held down, are handled at once
+    _REPEATABLE_KEYS = (
+        keyboard.KEY_ARROW_UP,
+        keyboard.KEY_ARROW_DOWN,
+        keyboard.KEY_ARROW_LEFT,
+        keyboard.KEY_ARROW_RIGHT,
+        keyboard.KEY_PAGE_UP,
+        keyboard.KEY_PAGE_DOWN,
+    )
+
+    _CURSOR_UP = -1
+    _CURSOR_DOWN = 1
+    _CURSOR_LEFT = -1
+    _CURSOR_RIGHT = 1
+    _CURSOR_INITIAL_POS = (0, 0)
+
+    def __init__(self, data: Table | TableState, on_data_update: callable, on_switch_list: callable = None):
+        """
+        Args:
+            data (Table | TableState): Displayed table.
+            on_data_update (callable): Function called with the table after every change made by the user.
+            on_switch_list (callable): Function called when the user asks for the next (`1`) or previous (`-1`) game
+                list, which it displays with `TUI.show_list`. List switching is disabled if it is not given.
+        """
+        state = data if isinstance(data, TableState) else TableState(data)
+        # states passed by the caller are closed by the caller
+        self._owns_state = state is not data
+        self._state = state
+        self._data: Table = state.data
+        self._on_data_update: callable = on_data_update
+        self._on_switch_list: callable = on_switch_list
+        self._list_name = ""
+        self._cursor_line: int = 0
+        self._cursor_column: int = 0
+        self._top_index: int = 0
+        self._bottom_index: int = len(self._data)
+        self._terminal_size = ()
+        self._mode = self._MODE_TABLE
+        self._lock = Lock()
+        self._running = False
+        self._sync_status = ""
+        self._screen = Screen()
+        self._loop: EventLoop | None = None
+        self._index = state.index
+        self._search_query = ""
+        self._filters: dict[int, str] = {}
+        self._filter_input = ""
+        self._sorts = state.sorts
+        self._layout = state.layout
+        # sorted column, descending and group flags, `None` if rows are displayed in table order
+        self._sort: tuple[int, bool, bool] | None = None
+        # row IDs matching the search query and filters in display order, `None` if every row is displayed in table
+        # order
+        self._view: list[int] | None = None
+        # keep the cursor on the last row while the table is downloaded, after jumping to the end
+        self._follow_end = False
+        self._watch_pages()
+        init()
+
+    @property
+    def data(self) -> Table:
+        """
+        Displayed table, replaced when another list or a newer version of the sheet is displayed.
+        """
+        return self._data
+
+    @traced("tui.frame")
+    def _display(self):
+        """
+        Display the main TUI interface containing the table. The whole frame is composed in memory and only the lines
+        that changed since the previous frame are written to the terminal.
+        """
+        self._update_terminal_size()
+        self._calculate_columns_widths()
+        self._update_viewport()
+
+        lines = [self._format_row(self._format_header(), select_row=True)]
+        for i, row in enumerate(self._get_rows(self._top_index, self._bottom_index), start=self._top_index):
+            is_cursor_line = i == self._cursor_line
+            lines.append(
+                self._format_row(
+                    row,
+                    select_row=is_cursor_line and self._mode == self._MODE_ROW,
+                    select_col=is_cursor_line and self._mode == self._MODE_COLUMN,
+                )
+            )
+        lines.extend([""] * (self._terminal_size[0] - len(lines)))
+        lines.append(self._format_status_line())
+        # terminal lines are one based and the first one is used by the header
+        with PROFILER.span("tui.paint") as span:
+            span.set(bytes=self._screen.render(lines, cursor=(self._cursor_line - self._top_index + 2, 1)))
+
+    def _update_viewport(self):
+        """
+        Calculate the range of rows that fit in the terminal, `_top_index` to `_bottom_index`, moving it only as
+        much as needed to keep the cursor line visible.
+        """
+        # one line for the header and another one for the status line
+        height = max(1, self._terminal_size[0] - 1)
+        last_line = max(0, self._row_count() - 1)
+        self._cursor_line = max(0, min(self._cursor_line, last_line))
+        if self._cursor_line < self._top_index:
+            self._top_index = self._cursor_line
+        elif self._cursor_line >= self._top_index + height:
+            self._top_index = self._cursor_line - height + 1
+        self._top_index = max(0, min(self._top_index, last_line - height + 1))
+        self._bottom_index = min(self._row_count(), self._top_index + height)
+
+    def _row_count(self) -> int:
+        """
+        Returns:
+            int with the number of displayed rows, after applying the search query and filters.
+        """
+        return len(self._view) if self._view is not None else len(self._data)
+
+    def _get_rows(self, start: int, stop: int) -> list[tuple[str]]:
+        """
+        Get a slice of the displayed rows.
+
+        Args:
+            start (int): First displayed row position.
+            stop (int): Position after the last displayed row.
+
+        Returns:
+            list[tuple[str]] with the requested rows.
+        """
+        if self._view is None:
+            return self._data.rows(start, stop)
+        return [self._data.row_by_id(row_id) for row_id in self._view[start:stop]]
+
+    def _update_view(self):
+        """
+        Calculate the displayed rows from the search query, the filters and the sorted column. Matching rows are
+        looked up in the inverted index and ordered with the cached sort permutation, or in table order if no column
+        is sorted. Must be called while holding `_lock`, the table lock is also taken because the index and the sort
+        permutations are updated by the threads changing the table, like the page download.
+        """
+        with self._data.lock:
+            results = self._index.search(self._search_query)
+            for column, value in self._filters.items():
+                matches = self._index.filter(column, value)
+                results = set(matches) if results is None else results & matches
+            if results is None:
+                self._view = list(self._sorts.permutation(*self._sort)) if self._sort else None
+                return
+            order = self._sorts.rank(*self._sort) if self._sort else self._data.positions()
+            self._view = sorted(results, key=order.__getitem__)
+
+    def _request_display(self):
+        """
+        Display the interface in the next frame of the event loop, or right away if the loop is not running.
+        """
+        if self._loop is not None and self._loop.running:
+            self._loop.request_frame()
+        else:
+            self._display()
+
+    def _handle_keys(self) -> callable:
+        """
+        Build the handler of the key presses read by the event loop.
+
+        Returns:
+            callable receiving a `list[str]` of keys and returning `False` to exit the interface.
+        """
+        lock = self._lock
+
+        def move_line(direction: int, count: int = 1):
+            with lock:
+                if self._mode == self._MODE_TABLE:
+                    # the first press only selects the cursor row
+                    count -= 1
+                self._add_cursor_line(direction * count)
+                self._mode = self._MODE_ROW
+                self._follow_end = False
+                self._request_rows()
+                self._request_display()
+
+        def jump_line(direction: int, page: bool = False, count: int = 1):
+            with lock:
+                if page:
+                    add_line = direction * (self._bottom_index - self._top_index) * count
+                else:
+                    add_line = direction * self._row_count()
+                self._mode = self._MODE_ROW
+                self._add_cursor_line(add_line)
+                self._follow_end = not page and direction == self._CURSOR_DOWN
+                self._request_rows(every_row=self._follow_end)
+                self._request_display()
+
+        def move_column(direction: int, count: int = 1):
+            with lock:
+                if self._mode != self._MODE_COLUMN:
+                    count -= 1
+                # the cursor wraps around the first and last columns
+                self._cursor_column = (self._cursor_column + direction * count) % max(1, self._data.width)
+                self._mode = self._MODE_COLUMN
+                self._request_display()
+
+        def delete_row():
+            with lock:
+                if not self._row_count():
+                    return
+                if self._view is None:
+                    self._data.delete(self._cursor_line)
+                else:
+                    self._data.delete(self._data.positions()[self._view.pop(self._cursor_line)])
+                self._request_display()
+            self._on_data_update(self._data)
+
+        def edit_search(key: str):
+            with lock:
+                match key:
+                    case keyboard.KEY_ENTER:
+                        self._mode = self._MODE_TABLE
+                    case keyboard.KEY_ESC:
+                        self._search_query = ""
+                        self._mode = self._MODE_TABLE
+                    case keyboard.KEY_BACKSPACE:
+                        self._search_query = self._search_query[:-1]
+                    case _:
+                        char = keyboard.key_to_char(key)
+                        if not char:
+                            return
+                        self._search_query += char
+                self._cursor_line = 0
+                self._update_view()
+                self._request_display()
+
+        def edit_filter(key: str):
+            with lock:
+                match key:
+                    case keyboard.KEY_ENTER:
+                        if self._filter_input.strip():
+                            self._filters[self._cursor_column] = self._filter_input
+                        else:
+                            self._filters.pop(self._cursor_column, None)
+                        self._cursor_line = 0
+                        self._update_view()
+                        self._mode = self._MODE_COLUMN
+                    case keyboard.KEY_ESC:
+                        self._mode = self._MODE_COLUMN
+                    case keyboard.KEY_BACKSPACE:
+                        self._filter_input = self._filter_input[:-1]
+                    case _:
+                        char = keyboard.key_to_char(key)
+                        if not char:
+                            return
+                        self._filter_input += char
+                self._request_display()
+
+        def sort_column():
+            with lock:
+                column = self._cursor_column
+                match self._sort:
+                    case (sorted_column, False, group) if sorted_column == column:
+                        self._sort = (column, True, group)
+                    case (sorted_column, True, _) if sorted_column == column:
+                        self._sort = None
+                    case _:
+                        self._sort = (column, False, False)
+                self._update_view()
+                self._request_display()
+
+        def group_column():
+            with lock:
+                column = self._cursor_column
+                if self._data.header[column] not in GROUP_COLUMNS:
+                    return
+                if self._sort and self._sort[0] == column and self._sort[2]:
+                    self._sort = None
+                else:
+                    self._sort = (column, False, True)
+                self._update_view()
+                self._request_display()
+
+        def persist_order():
+            with lock:
+                if not self._sort:
+                    return
+                self._data.reorder(self._sorts.permutation(*self._sort))
+                self._sort = None
+                self._update_view()
+                self._request_display()
+            self._on_data_update(self._data)
+
+        def start_input(mode: str):
+            with lock:
+                self._mode = mode
+                self._filter_input = self._filters.get(self._cursor_column, "")
+                self._request_display()
+
+        def switch_list(direction: int):
+            if self._on_switch_list:
+                self._on_switch_list(direction)
+
+        def on_key_press(key: str, count: int):
+            if self._mode == self._MODE_SEARCH:
+                edit_search(key)
+                return True
+            if self._mode == self._MODE_FILTER:
+                edit_filter(key)
+                return True
+
+            match key:
+                case keyboard.KEY_ARROW_UP:
+                    move_line(self._CURSOR_UP, count)
+                case keyboard.KEY_ARROW_DOWN:
+                    move_line(self._CURSOR_DOWN, count)
+                case keyboard.KEY_ARROW_LEFT:
+                    move_column(self._CURSOR_LEFT, count)
+                case keyboard.KEY_ARROW_RIGHT:
+                    move_column(self._CURSOR_RIGHT, count)
+                case keyboard.KEY_PAGE_UP:
+                    jump_line(self._CURSOR_UP, page=True, count=count)
+                case keyboard.KEY_PAGE_DOWN:
+                    jump_line(self._CURSOR_DOWN, page=True, count=count)
+                case keyboard.KEY_HOME | keyboard.KEY_HOME_VT | keyboard.KEY_HOME_SS3:
+                    jump_line(self._CURSOR_UP)
+                case keyboard.KEY_END | keyboard.KEY_END_VT | keyboard.KEY_END_SS3:
+                    jump_line(self._CURSOR_DOWN)
+                case keyboard.KEY_ESC:
+                    with lock:
+                        self._exit_mode()
+                case keyboard.KEY_X:
+                    if self._mode == self._MODE_TABLE:
+                        return False
+                case keyboard.KEY_BACKSPACE:
+                    if self._mode == self._MODE_ROW:
+                        delete_row()
+                case keyboard.KEY_SLASH:
+                    if self._mode != self._MODE_COLUMN:
+                        start_input(self._MODE_SEARCH)
+                case keyboard.KEY_F:
+                    if self._mode == self._MODE_COLUMN:
+                        start_input(self._MODE_FILTER)
+                case keyboard.KEY_S:
+                    if self._mode == self._MODE_COLUMN:
+                        sort_column()
+                case keyboard.KEY_G:
+                    if self._mode == self._MODE_COLUMN:
+                        group_column()
+                case keyboard.KEY_P:
+                    persist_order()
+                case keyboard.KEY_TAB:
+                    switch_list(1)
+                case keyboard.KEY_SHIFT_TAB:
+                    switch_list(-1)
+            return True
+
+        def on_keys(keys: list[str]) -> bool:
+            for key, count in keyboard.coalesce_keys(keys, self._REPEATABLE_KEYS):
+                if key in self._EXIT_KEYS or not on_key_press(key, count):
+                    return False
+            return True
+
+        return on_keys
+
+    def _display_frame(self):
+        with self._lock:
+            self._display()
+
+    def _on_resize(self):
+        """
+        Called by the event loop when the terminal is resized. The layout is fitted to the new size and the viewport
+        displayed again, without waiting for a key press.
+        """
+        with self._lock:
+            self._update_terminal_size()
+            self._request_display()
+
+    def init_tui(self):
+        """
+        Initialize the text user interface and run its event loop in the calling thread until the user exits.
+        """
+        self._loop = EventLoop(on_keys=self._handle_keys(), on_frame=self._display_frame, on_resize=self._on_resize)
+        with self._lock:
+            self._screen.open()
+            self._display()
+            self._running = True
+        try:
+            self._loop.run()
+        finally:
+            with self._lock:
+                self._running = False
+                self._screen.close()
+
+    def replace_data(self, data: Table):
+        """
+        Replace the displayed data, for example after downloading a newer version of the sheet. This function can be
+        called from any thread.
+
+        Args:
+            data (Table): New data.
+        """
+        # build the index outside the lock, the interface keeps responding meanwhile
+        state = TableState(data)
+        with self._lock:
+            self._set_state(state, owned=True)
+
+    def update_rows(self, key_column: str, changes: dict[str, dict[str, str]]):
+        """
+        Change cells of the displayed table that were not edited by the user, like the Steam data refreshed in the
+        background, and save them as if the user had edited them. This function can be called from any thread.
+
+        Args:
+            key_column (str): Name of the column identifying the rows.
+            changes (dict[str, dict[str, str]]): New cell values by column name, by key value.
+        """
+        with self._lock:
+            data = self._data
+        if self.update_table_rows(data, key_column, changes):
+            self._on_data_update(data)
+
+    def update_table_rows(self, data: Table, key_column: str, changes: dict[str, dict[str, str]]) -> int:
+        """
+        Change cells of a table with `soul_link.table.Table.update_rows`, without saving them. If the table is
+        displayed, the view is updated. This function can be called from any thread.
+
+        Args:
+            data (Table): Changed table.
+            key_column (str): Name of the column identifying the rows.
+            changes (dict[str, dict[str, str]]): New cell values by column name, by key value.
+
+        Returns:
+            int with the number of changed cells.
+        """
+        with self._lock:
+            changed = data.update_rows(key_column, changes)
+            if not changed or data is not self._data:
+                return changed
+            if self._search_query or self._filters or self._sort:
+                self._update_view()
+            if self._running:
+                self._loop.request_frame()
+        return changed
+
+    def merge_remote_rows(
+        self, data: Table, base_rows: list[tuple[str]], remote_rows: list[tuple[str]]
+    ) -> MergeResult:
+        """
+        Merge the changes made to the sheet by other users into a table with `soul_link.data.merge_rows`, keeping the
+        cursor on the same row. If the table is displayed, only the lines of the changed rows are painted again. This
+        function can be called from any thread and can be passed to `soul_link.data.SheetWrapper.merge_remote_changes`.
+
+        Args:
+            data (Table): Local table.
+            base_rows (list[tuple[str]]): Last synchronized rows, header included.
+            remote_rows (list[tuple[str]]): Current sheet rows, header included.
+
+        Returns:
+            MergeResult: changed rows and conflicts.
+        """
+        with self._lock:
+            if data is not self._data:
+                return merge_rows(data, base_rows, remote_rows)
+            cursor_row = self._cursor_row_id()
+            result = merge_rows(data, base_rows, remote_rows)
+            if not result.rows and not result.deleted:
+                return result
+            if self._search_query or self._filters or self._sort:
+                self._update_view()
+            if cursor_row is not None and not self._follow_end:
+                self._cursor_line = self._display_position(cursor_row, self._cursor_line)
+            if self._running:
+                self._loop.request_frame()
+        return result
+
+    def _cursor_row_id(self) -> int | None:
+        """
+        Returns:
+            int | None with the ID of the row under the cursor, `None` if no row is displayed.
+        """
+        if not self._row_count():
+            return None
+        if self._view is None:
+            return self._data.row_id(min(self._cursor_line, len(self._data) - 1))
+        return self._view[min(self._cursor_line, len(self._view) - 1)]
+
+    def _display_position(self, row_id: int, default: int) -> int:
+        """
+        Returns:
+            int with the displayed position of a row, `default` if it is not displayed anymore.
+        """
+        if self._view is None:
+            return self._data.positions().get(row_id, default)
+        try:
+            return self._view.index(row_id)
+        except ValueError:
+            return default
+
+    def show_list(self, name: str, state: TableState, on_data_update: callable):
+        """
+        Display another game list. The search query, filters and sorted column are kept if `name` is the displayed
+        list, for example when it is shown again after downloading remote changes, and cleared otherwise. This
+        function can be called from any thread.
+
+        Args:
+            name (str): Game list name, displayed in the status line.
+            state (TableState): Table of the list, closed by the caller once it is not displayed.
+            on_data_update (callable): Function called with the table after every change made by the user.
+        """
+        with self._lock:
+            if name != self._list_name:
+                self._list_name = name
+                self._search_query = ""
+                self._filters = {}
+                self._sort = None
+                self._cursor_line = 0
+                self._cursor_column = 0
+                self._mode = self._MODE_TABLE
+            self._on_data_update = on_data_update
+            self._set_state(state, owned=False)
+
+    def _set_state(self, state: TableState, owned: bool):
+        """
+        Display a table. Must be called while holding `_lock`.
+
+        Args:
+            state (TableState): Table to display.
+            owned (bool): If `True`, the state is closed when it is replaced.
+        """
+        if self._owns_state:
+            self._state.close()
+        self._state = state
+        self._owns_state = owned
+        self._data = state.data
+        self._index = state.index
+        self._sorts = state.sorts
+        self._layout = state.layout
+        if self._sort and self._sort[0] >= self._data.width:
+            self._sort = None
+        self._filters = {column: value for column, value in self._filters.items() if column < self._data.width}
+        self._cursor_column = min(self._cursor_column, max(0, self._data.width - 1))
+        self._update_view()
+        self._watch_pages()
+        if self._running:
+            self._loop.request_frame()
+
+    def _watch_pages(self):
+        """
+        Display the rows of a table that is still being downloaded as they arrive.
+        """
+        data = self._data
+        if isinstance(data, PagedTable) and not data.complete:
+            data.on_page = lambda: self._on_page_loaded(data)
+
+    def _on_page_loaded(self, data: PagedTable):
+        """
+        Called from the download thread after every page of a `PagedTable`.
+        """
+        with self._lock:
+            if data is not self._data:
+                return
+            if self._search_query or self._filters or self._sort:
+                # the view is a snapshot of the matching rows, add the downloaded ones
+                self._update_view()
+            if self._follow_end:
+                self._cursor_line = self._row_count() - 1
+            if self._running:
+                self._loop.request_frame()
+
+    def _request_rows(self, every_row: bool = False):
+        """
+        Ask a table that is still being downloaded for the rows past the cursor, when it gets close to the last
+        downloaded row. Must be called while holding `_lock`.
+
+        Args:
+            every_row (bool): Ask for every row, when the cursor jumps to the end of the table.
+        """
+        data = self._data
+        if not isinstance(data, PagedTable) or data.complete:
+            return
+        if every_row:
+            data.request_rows(None)
+            return
+        # keep two screens of rows ahead of the cursor
+        wanted = self._cursor_line + 2 * max(1, self._terminal_size[0] if self._terminal_size else 0)
+        if wanted >= len(data):
+            data.request_rows(wanted)
+
+    def set_sync_status(self, status: str):
+        """
+        Update the synchronization status displayed in the bottom line of the interface. This function can be called
+        from any thread.
+
+        Args:
+            status (str): Status text, usually one of the `soul_link.sync.WriteBehindSync` statuses.
+        """
+        with self._lock:
+            self._sync_status = status
+            if self._running:
+                self._loop.request_frame()
+
+    def _format_status_line(self) -> str:
+        """
+        Returns:
+            str with the status line displayed in the last terminal line.
+        """
+        match self._mode:
+            case self._MODE_SEARCH:
+                return f"/{self._search_query}  ({self._row_count()} matches)"
+            case self._MODE_FILTER:
+                return f"filter {self._data.header[self._cursor_column]} = {self._filter_input}"
+
+        status = []
+        if self._list_name:
+            status.append(f"[{self._list_name}]")
+        if self._search_query:
+            status.append(f"/{self._search_query}")
+        for column, value in self._filters.items():
+            status.append(f"{self._data.header[column]} = {value}")
+        if self._view is not None and len(self._view) != len(self._data):
+            status.append(f"{self._row_count()} of {len(self._data)} rows")
+        if self._sort:
+            column, descending, group = self._sort
+            name = self._data.header[column]
+            if group:
+                row_id = self._view[self._cursor_line] if self._view else None
+                group_name = self._sorts.group_of(column, row_id) if row_id is not None else ""
+                status.append(f"grouped by {name}: {group_name or '-'}  (P to save order)")
+            else:
+                status.append(f"sorted by {name} {'desc' if descending else 'asc'}  (P to save order)")
+        if self._sync_status:
+            status.append(f"sync: {self._sync_status}")
+        if isinstance(self._data, PagedTable):
+            if self._data.error is not None:
+                status.append(f"download failed: {self._data.error}")
+            elif not self._data.complete:
+                status.append(f"loading {len(self._data)} of ~{self._data.expected_rows} rows")
+        return f"{Style.DIM}{'  '.join(status)}{Style.RESET_ALL}"
+
+    def _format_header(self) -> tuple[str]:
+        """
+        Returns:
+            tuple[str] with the header cells, the sorted column marked with its direction.
+        """
+        if not self._sort:
+            return self._data.header
+        column, descending, _ = self._sort
+        header = list(self._data.header)
+        header[column] = f"{header[column]} {'v' if descending else '^'}"
+        return tuple(header)
+
+    def _update_terminal_size(self):
+        """
+        Get ther terminal size to avoid having more lines that can be displayed. The last line is reserved for the
+        status line.
+        """
+        size = os.get_terminal_size()
+        terminal_size = (size.lines - 1, size.columns)
+        if terminal_size != self._terminal_size:
+            self._screen.invalidate()
+        self._terminal_size = terminal_size
+
+    def _calculate_columns_widths(self):
+        """
+        Calculate column widths that fit the terminal width from the length of the column cells. Refer to
+        `soul_link.tui.layout.ColumnLayout` for the details.
+        """
+        self._column_widths = self._layout.widths(self._terminal_size[1])
+
+    def _format_row(
+        self,
+        row: tuple[str],
+        select_row: bool = False,
+        select_col: bool = False,
+    ) -> str:
+        """
+        Format a table row.
+
+        Args:
+            row (tuple[str]): Row that needs to be formatted.
+            select_row (bool): If `False` and `select_col` is also `False`, add style `colorama.Style.DIM` to the row.
+                Useful for selecting rows.
+            select_col (bool): Add background color `colorama.Back.LIGHTBLUE_EX` to the cursor column. Useful for
+                selecting cols.
+
+        Returns:
+            str with the formatted row, ready to be displayed as a single terminal line.
+        """
+        row_str = "|"
+        for i, column in enumerate(row):
+            color = ""
+            reset = ""
+            if select_col and i == self._cursor_column:
+                color = Back.LIGHTBLUE_EX
+                reset = Style.RESET_ALL
+            display_data = column
+            if len(column) > self._column_widths[i]:
+                display_data = f"{column[:self._column_widths[i] - 3]}..."
+            row_str += f"{color}{display_data: ^{self._column_widths[i]}}{reset}|"
+
+        if select_row or select_col:
+            return row_str
+        return f"{Style.DIM}{row_str}{Style.RESET_ALL}"
+
+    def _add_cursor_line(self, add_line: int):
+        """
+        Add position to current cursor line position. The position is clamped to the first and last rows, the
+        viewport follows the cursor the next time the interface is displayed.
+
+        Args:
+            add_line (int): lines that should be add to the current line position.
+        """
+        self._cursor_line = max(0, min(self._cursor_line + add_line, self._row_count() - 1))
+
+    def _exit_mode(self):
+        """
+        Call this function to properly exit current mode.
+        If the current mode is `TUI._MODE_ROW`, re-display the current cursor row without background while keeping
+        the cursor on the same position.
+        """
+        match self._mode:
+            case self._MODE_ROW:
+                self._mode = self._MODE_TABLE
+            case self._MODE_COLUMN:
+                self._mode = self._MODE_ROW
+        self._request_display()
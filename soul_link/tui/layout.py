@@ -0,0 +1,169 @@
+import math
+from collections import Counter
+
+from soul_link.table import Table
+
+# cell length percentile that columns try to fit without truncation, longer cells are truncated
+FIT_PERCENTILE = 90
+# spaces around the cell content
+CELL_PADDING = 2
+# room for the sort direction marker added to the header of the sorted column
+HEADER_MARKER = 2
+MIN_COLUMN_WIDTH = 5
+
+
+class ColumnStats:
+    """
+    Histogram of the cell lengths of every column of a `soul_link.table.Table`, used to size the columns from their
+    content. Histograms are computed once and kept updated by listening to the table changes, so percentiles never
+    scan the table again.
+    """
+
+    def __init__(self, table: Table):
+        """
+        Args:
+            table (Table): Measured table.
+        """
+        self._table = table
+        # column -> number of cells per length
+        self._histograms: list[list[int]] = []
+        with table.lock:
+            for column in range(table.width):
+                counts = Counter(map(len, table.column_values(column)))
+                histogram = [0] * (max(counts, default=0) + 1)
+                for length, count in counts.items():
+                    histogram[length] = count
+                self._histograms.append(histogram)
+            self._count = len(table)
+            # incremented after every change, layouts computed from the statistics are cached by version
+            self.version = 0
+            # last, the listener can be called by other threads as soon as the lock is released
+            table.subscribe(self._on_change)
+
+    def close(self):
+        """
+        Stop listening to the table changes.
+        """
+        self._table.unsubscribe(self._on_change)
+
+    def percentile(self, column: int, percent: float) -> int:
+        """
+        Nearest rank percentile of the cell lengths of a column.
+
+        Args:
+            column (int): Column position.
+            percent (float): Percentile, `100` is the longest cell.
+
+        Returns:
+            int with the cell length, `0` if the table is empty.
+        """
+        histogram = self._histograms[column]
+        rank = max(1, math.ceil(self._count * percent / 100))
+        seen = 0
+        for length, count in enumerate(histogram):
+            seen += count
+            if seen >= rank:
+                return length
+        return 0
+
+    def _add(self, row: tuple[str], count: int):
+        for column, cell in enumerate(row):
+            histogram = self._histograms[column]
+            if len(cell) >= len(histogram):
+                histogram.extend([0] * (len(cell) + 1 - len(histogram)))
+            histogram[len(cell)] += count
+
+    def _on_change(self, event: str, row_id: int, row: tuple[str]):
+        if event in (Table.EVENT_DELETE, Table.EVENT_UPDATE):
+            self._add(row, -1)
+            self._count -= 1
+        if event in (Table.EVENT_INSERT, Table.EVENT_UPDATE):
+            self._add(self._table.row_by_id(row_id), 1)
+            self._count += 1
+        self.version += 1
+
+
+class ColumnLayout:
+    """
+    Column widths of a table fitted to the terminal width.
+
+    Every column asks for the width of its `FIT_PERCENTILE` cell length, so a few very long cells do not take the
+    space of the other columns. If the terminal is wider, the extra space goes to the columns with longer cells, up to
+    their longest cell. If it is narrower, the widest columns are shrunk first, down to their header length.
+    """
+
+    def __init__(self, table: Table):
+        """
+        Args:
+            table (Table): Displayed table.
+        """
+        self._header = table.header
+        self._stats = ColumnStats(table)
+        # (terminal width, statistics version) of the cached widths
+        self._key: tuple[int, int] | None = None
+        self._widths: list[int] = []
+
+    def close(self):
+        self._stats.close()
+
+    def widths(self, total_width: int) -> list[int]:
+        """
+        Get the column widths for a terminal width. Results are cached until the terminal width or the table change.
+
+        Args:
+            total_width (int): Terminal columns.
+
+        Returns:
+            list[int] with the width of every column, column separators excluded.
+        """
+        key = (total_width, self._stats.version)
+        if key != self._key:
+            self._widths = self._fit(total_width)
+            self._key = key
+        return self._widths
+
+    def _fit(self, total_width: int) -> list[int]:
+        # a row is displayed as `|cell|cell|`, one separator per column plus the first one
+        available = total_width - 1 - len(self._header)
+        minimum, preferred, maximum = [], [], []
+        for column, name in enumerate(self._header):
+            header_width = len(name) + HEADER_MARKER + CELL_PADDING
+            minimum.append(min(header_width, max(MIN_COLUMN_WIDTH, len(name))))
+            preferred.append(max(header_width, self._stats.percentile(column, FIT_PERCENTILE) + CELL_PADDING))
+            maximum.append(max(header_width, self._stats.percentile(column, 100) + CELL_PADDING))
+        if sum(preferred) <= available:
+            return _fill(minimum=preferred, desired=maximum, available=available)
+        return _fill(minimum=minimum, desired=preferred, available=available)
+
+
+def _fill(minimum: list[int], desired: list[int], available: int) -> list[int]:
+    """
+    Get the widths closest to `desired` that fit in `available` columns, shrinking the widest columns first but never
+    below `minimum`.
+    """
+    if sum(desired) <= available:
+        return list(desired)
+    if sum(minimum) >= available:
+        return list(minimum)
+
+    def capped(cap: int) -> list[int]:
+        return [max(low, min(high, cap)) for low, high in zip(minimum, desired)]
+
+    # binary search of the highest width cap that fits
+    low, high = 0, max(desired)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if sum(capped(middle)) <= available:
+            low = middle
+        else:
+            high = middle - 1
+    widths = capped(low)
+    # share the columns left by the rounding between the capped columns, from the left
+    spare = available - sum(widths)
+    for i, width in enumerate(widths):
+        if spare <= 0:
+            break
+        if width < desired[i]:
+            widths[i] += 1
+            spare -= 1
+    return widths
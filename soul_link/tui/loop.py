@@ -0,0 +1,257 @@
+import heapq
+import itertools
+import os
+import selectors
+import signal
+import socket
+import sys
+import threading
+import time
+from collections import deque
+from typing import TextIO
+
+from soul_link import keyboard
+from soul_link.profiling import PROFILER
+
+DEFAULT_FRAME_INTERVAL = 1 / 60
+# seconds waited for the rest of an escape sequence before reading a lone escape byte as the escape key
+ESCAPE_TIMEOUT = 0.025
+
+
+class TimerHandle:
+    """
+    Callback scheduled with `EventLoop.call_later`.
+    """
+
+    __slots__ = ("deadline", "callback", "cancelled")
+
+    def __init__(self, deadline: float, callback: callable):
+        self.deadline = deadline
+        self.callback = callback
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class EventLoop:
+    """
+    Single threaded loop running the text user interface. It waits at the same time for key presses, timers and
+    events posted from other threads with `call_soon_threadsafe`, and renders the frames requested from any thread.
+    The loop does not own the interface state: worker threads, like the sheet download or the remote change watcher,
+    change it directly while holding the interface lock and only request a frame from the loop.
+
+    Every key available in the terminal input is read at once and handed to `on_keys` as a batch, which lets key
+    repeats be folded, and frames are rendered at most once every `frame_interval` seconds, however many events
+    requested one. Terminal resizes (`SIGWINCH`) are delivered to `on_resize` as soon as they happen. The
+    `tui.key_to_paint` span measures the time from reading a batch of keys to painting its result.
+    """
+
+    def __init__(
+        self,
+        on_keys: callable,
+        on_frame: callable,
+        on_resize: callable = None,
+        frame_interval: float = DEFAULT_FRAME_INTERVAL,
+        input_file: TextIO | None = None,
+    ):
+        """
+        Args:
+            on_keys (callable): Function called with a `list[str]` of read keys, the loop stops if it returns `False`.
+            on_frame (callable): Function rendering a frame.
+            on_resize (callable): Function called in the loop thread when the terminal is resized.
+            frame_interval (float): Minimum seconds between two frames.
+            input_file (TextIO | None): Terminal input, defaults to `sys.stdin`.
+        """
+        self._on_keys = on_keys
+        self._on_frame = on_frame
+        self._on_resize = on_resize
+        self._frame_interval = frame_interval
+        self._input = input_file or sys.stdin
+        self._decoder = keyboard.KeyDecoder()
+        self._callbacks: deque[callable] = deque()
+        self._timers: list[tuple[float, int, TimerHandle]] = []
+        self._timers_lock = threading.Lock()
+        self._sequence = itertools.count()
+        self._wake_reader, self._wake_writer = socket.socketpair()
+        self._wake_reader.setblocking(False)
+        self._wake_writer.setblocking(False)
+        self._frame_requested = False
+        self._last_frame = 0.0
+        self._last_input = 0.0
+        # `time.perf_counter_ns` of the first batch of keys not painted yet
+        self._unpainted_keys: int | None = None
+        self._running = False
+        self._thread_id: int | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def call_soon_threadsafe(self, callback: callable):
+        """
+        Run `callback` in the loop thread as soon as possible. This function can be called from any thread.
+        """
+        self._callbacks.append(callback)
+        self._wake()
+
+    def call_later(self, delay: float, callback: callable) -> TimerHandle:
+        """
+        Run `callback` in the loop thread after `delay` seconds. This function can be called from any thread.
+
+        Args:
+            delay (float): Seconds to wait.
+            callback (callable): Function to call.
+
+        Returns:
+            TimerHandle: handle that can cancel the call.
+        """
+        timer = TimerHandle(time.monotonic() + delay, callback)
+        with self._timers_lock:
+            heapq.heappush(self._timers, (timer.deadline, next(self._sequence), timer))
+        self._wake()
+        return timer
+
+    def request_frame(self):
+        """
+        Render a frame as soon as the frame interval allows it. Several requests before the frame is rendered only
+        render one frame. This function can be called from any thread.
+        """
+        self._frame_requested = True
+        if threading.get_ident() != self._thread_id:
+            self._wake()
+
+    def stop(self):
+        """
+        Stop the loop after the current iteration. This function can be called from any thread.
+        """
+        self._running = False
+        self._wake()
+
+    def run(self):
+        """
+        Run the loop in the calling thread until `stop` is called or `on_keys` returns `False`.
+        """
+        self._running = True
+        self._thread_id = threading.get_ident()
+        selector = selectors.DefaultSelector()
+        selector.register(self._wake_reader, selectors.EVENT_READ, self._drain_wake)
+        previous_handler = self._handle_resize_signal()
+        try:
+            fd = self._input.fileno()
+            with keyboard.raw_input_mode(fd):
+                if os.name == "posix":
+                    selector.register(fd, selectors.EVENT_READ, lambda: self._read_input(fd))
+                else:
+                    # console input can not be waited with `select` on Windows, read it from a thread
+                    threading.Thread(target=self._read_console, daemon=True).start()
+                while self._running:
+                    for key, _ in selector.select(self._next_timeout()):
+                        key.data()
+                    self._run_pending()
+        finally:
+            self._running = False
+            if previous_handler is not None:
+                signal.signal(signal.SIGWINCH, previous_handler)
+            selector.close()
+            self._wake_reader.close()
+            self._wake_writer.close()
+
+    def _handle_resize_signal(self) -> callable:
+        """
+        Install the `SIGWINCH` handler, where the platform has it and the loop runs in the main thread, the only
+        one that can handle signals.
+
+        Returns:
+            callable with the previous handler, `None` if the handler was not installed.
+        """
+        if self._on_resize is None or not hasattr(signal, "SIGWINCH"):
+            return None
+        if threading.current_thread() is not threading.main_thread():
+            return None
+        # the handler only posts the resize, it runs between two loop steps and must not touch the interface state
+        return signal.signal(signal.SIGWINCH, lambda signum, frame: self.call_soon_threadsafe(self._on_resize))
+
+    def _run_pending(self):
+        """
+        Run everything due in this iteration: a pending escape key, posted callbacks, expired timers and the
+        requested frame.
+        """
+        now = time.monotonic()
+        if self._decoder.pending and now - self._last_input >= ESCAPE_TIMEOUT:
+            self._dispatch(self._decoder.flush())
+        while self._callbacks and self._running:
+            self._callbacks.popleft()()
+        while self._timers and self._timers[0][0] <= now and self._running:
+            with self._timers_lock:
+                _, _, timer = heapq.heappop(self._timers)
+            if not timer.cancelled:
+                timer.callback()
+        if self._frame_requested and self._running and now - self._last_frame >= self._frame_interval:
+            self._render(now)
+
+    def _render(self, now: float):
+        self._frame_requested = False
+        self._last_frame = now
+        self._on_frame()
+        if self._unpainted_keys is not None:
+            PROFILER.record("tui.key_to_paint", self._unpainted_keys, time.perf_counter_ns() - self._unpainted_keys)
+            self._unpainted_keys = None
+
+    def _next_timeout(self) -> float | None:
+        """
+        Returns:
+            float | None with the seconds until something is due, `None` to wait for input or events.
+        """
+        now = time.monotonic()
+        timeouts = []
+        if self._frame_requested:
+            timeouts.append(self._last_frame + self._frame_interval - now)
+        if self._decoder.pending:
+            timeouts.append(self._last_input + ESCAPE_TIMEOUT - now)
+        if self._timers:
+            timeouts.append(self._timers[0][0] - now)
+        if self._callbacks:
+            timeouts.append(0)
+        return max(0, min(timeouts)) if timeouts else None
+
+    def _read_input(self, fd: int):
+        data = os.read(fd, 4096)
+        if not data:
+            # end of input, there will be no more key presses
+            self._running = False
+            return
+        self._feed(data)
+
+    def _read_console(self):
+        import readkeys
+
+        while self._running:
+            data = readkeys.getkey().encode("utf-8")
+            self.call_soon_threadsafe(lambda data=data: self._feed(data))
+
+    def _feed(self, data: bytes):
+        self._last_input = time.monotonic()
+        self._dispatch(self._decoder.feed(data))
+
+    def _dispatch(self, keys: list[str]):
+        if not keys or not self._running:
+            return
+        if self._unpainted_keys is None:
+            self._unpainted_keys = time.perf_counter_ns()
+        if self._on_keys(keys) is False:
+            self._running = False
+
+    def _drain_wake(self):
+        try:
+            while self._wake_reader.recv(4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def _wake(self):
+        try:
+            self._wake_writer.send(b"\0")
+        except (BlockingIOError, OSError):
+            # the loop is already awake or closed
+            pass
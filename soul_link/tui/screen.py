@@ -0,0 +1,92 @@
+import sys
+
+_CSI = "\x1b["
+_CLEAR_SCREEN = f"{_CSI}2J"
+_CLEAR_LINE_END = f"{_CSI}K"
+_DISABLE_LINE_WRAP = f"{_CSI}?7l"
+_ENABLE_LINE_WRAP = f"{_CSI}?7h"
+_RESET_STYLE = f"{_CSI}0m"
+
+
+class Screen:
+    """
+    Double buffered terminal output. Every frame is composed in memory as a list of lines and compared with the
+    previous frame, only the lines that changed are sent to the terminal, in a single write using ANSI cursor
+    addressing.
+
+    Line wrapping is disabled while the screen is open so a line wider than the terminal never moves the lines below
+    it.
+    """
+
+    def __init__(self, output=None):
+        """
+        Args:
+            output: Text stream where frames are written. Defaults to `sys.stdout`.
+        """
+        self._output = output or sys.stdout
+        self._previous: list[str] = []
+        self._clear = True
+        self._cursor: tuple[int, int] | None = None
+        self.bytes_written = 0
+
+    def open(self):
+        """
+        Prepare the terminal to display frames.
+        """
+        self._write(_DISABLE_LINE_WRAP)
+        self.invalidate()
+
+    def close(self):
+        """
+        Clear the terminal and restore its default settings.
+        """
+        self._write(f"{_RESET_STYLE}{_CLEAR_SCREEN}{_CSI}1;1H{_ENABLE_LINE_WRAP}")
+        self._previous = []
+
+    def invalidate(self):
+        """
+        Forget the previous frame, so the next rendered frame clears the terminal and is fully written. Useful when the
+        terminal content can not be trusted anymore, for example after a resize.
+        """
+        self._previous = []
+        self._cursor = None
+        self._clear = True
+
+    def render(self, lines: list[str], cursor: tuple[int, int] | None = None) -> int:
+        """
+        Display a frame.
+
+        Args:
+            lines (list[str]): Frame lines from the top of the terminal. They can contain ANSI style sequences but not
+                new lines.
+            cursor (tuple[int, int] | None): One based `y` and `x` position where the cursor is left after the frame is
+                written.
+
+        Returns:
+            int: number of characters written to the terminal.
+        """
+        buffer = []
+        if self._clear:
+            buffer.append(_CLEAR_SCREEN)
+            self._clear = False
+
+        previous = self._previous
+        for y, line in enumerate(lines):
+            if y < len(previous) and previous[y] == line:
+                continue
+            buffer.append(f"{_CSI}{y + 1};1H{line}{_RESET_STYLE}{_CLEAR_LINE_END}")
+        for y in range(len(lines), len(previous)):
+            buffer.append(f"{_CSI}{y + 1};1H{_CLEAR_LINE_END}")
+        self._previous = list(lines)
+
+        if cursor and (buffer or cursor != self._cursor):
+            buffer.append(f"{_CSI}{cursor[0]};{cursor[1]}H")
+        self._cursor = cursor
+        return self._write("".join(buffer))
+
+    def _write(self, data: str) -> int:
+        if data:
+            self._output.write(data)
+            self._output.flush()
+            self.bytes_written += len(data)
+        return len(data)
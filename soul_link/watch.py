@@ -0,0 +1,82 @@
+from threading import Event, Thread
+
+from soul_link.data import MergeResult, SheetWrapper
+from soul_link.profiling import PROFILER
+from soul_link.table import PagedTable
+
+# seconds between two checks of the sheet modified time
+DEFAULT_POLL_INTERVAL = 15.0
+
+
+class RemoteChangeWatcher:
+    """
+    Background worker that merges the changes made by other users of a shared sheet into the displayed table. Every
+    poll is a single Google Drive metadata request, the sheet is only downloaded after its modified time changes, and
+    the rows are merged with `soul_link.data.SheetWrapper.merge_remote_changes`.
+
+    Failed polls, for example while offline, are retried on the next interval.
+    """
+
+    def __init__(
+        self,
+        get_sheet_wrapper: callable,
+        get_table: callable,
+        merge: callable = None,
+        on_merge: callable = None,
+        interval: float = DEFAULT_POLL_INTERVAL,
+    ):
+        """
+        Args:
+            get_sheet_wrapper (callable): Function returning the `SheetWrapper` of the list, like `SheetOpener.get`. It
+                can block until the sheet is opened and raise if it can not be opened.
+            get_table (callable): Function returning the current `Table` of the list, called on every poll.
+            merge (callable): Function applying the changes, refer to `SheetWrapper.merge_remote_changes`.
+            on_merge (callable): Function called with the `MergeResult` after every merge.
+            interval (float): Seconds between two polls.
+        """
+        self._get_sheet_wrapper = get_sheet_wrapper
+        self._get_table = get_table
+        self._merge = merge
+        self._on_merge = on_merge
+        self._interval = interval
+        self._stop = Event()
+        self._thread: Thread | None = None
+        self.error: Exception | None = None
+
+    def poll(self) -> MergeResult | None:
+        """
+        Check the sheet once and merge its changes, blocking until done.
+
+        Returns:
+            MergeResult | None with the merged changes, `None` if the sheet did not change or the displayed table is
+            still being downloaded.
+        """
+        data = self._get_table()
+        if isinstance(data, PagedTable) and not data.complete:
+            return None
+        sheet_wrapper: SheetWrapper = self._get_sheet_wrapper()
+        with PROFILER.span("watch.poll"):
+            result = sheet_wrapper.merge_remote_changes(data, self._merge)
+        if result is not None and self._on_merge:
+            self._on_merge(result)
+        return result
+
+    def start(self):
+        """
+        Poll the sheet in a background thread until `stop` is called.
+        """
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self._interval):
+            try:
+                self.poll()
+                self.error = None
+            except Exception as error:
+                self.error = error
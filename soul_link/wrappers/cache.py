@@ -0,0 +1,189 @@
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+from threading import Lock
+
+DEFAULT_CACHE_DIR = "~/.config/soulink/cache"
+
+
+class TTLCache:
+    """
+    Two level key/value cache. Entries live in a size-bounded in-memory LRU and are mirrored to a directory on disk
+    (one JSON file per entry) so they survive between runs. Every entry has its own time to live, expired entries are
+    treated as misses and removed when found.
+
+    Keys are strings and values anything that can be serialized with `json`.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path | None = None,
+        ttl: float = 24 * 60 * 60,
+        max_entries: int = 512,
+        max_disk_entries: int = 8192,
+    ):
+        """
+        Args:
+            directory (str | Path | None): Directory where entries are persisted. If `None`, the cache only lives in
+                memory.
+            ttl (float): Default time to live in seconds for new entries.
+            max_entries (int): Maximum number of entries kept in memory. Least recently used entries are evicted first.
+            max_disk_entries (int): Maximum number of entries kept on disk. Oldest entries are evicted first.
+        """
+        self._directory = Path(directory).expanduser() if directory else None
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._max_disk_entries = max_disk_entries
+        self._memory: OrderedDict[str, tuple[float, object]] = OrderedDict()
+        self._disk_index: OrderedDict[str, float] | None = None
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str):
+        """
+        Get the value stored for `key`.
+
+        Args:
+            key (str): Entry key.
+
+        Returns:
+            The stored value or `None` if the key is missing or expired.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                entry = self._read_disk_entry(key)
+                if entry is not None:
+                    self._store_memory_entry(key, entry)
+            elif entry[0] > now:
+                self._memory.move_to_end(key)
+
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    self._remove_entry(key)
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: str, value, ttl: float | None = None):
+        """
+        Store `value` for `key`.
+
+        Args:
+            key (str): Entry key.
+            value: Value that can be serialized with `json`.
+            ttl (float | None): Time to live in seconds for this entry. If `None`, the cache default is used.
+        """
+        entry = (time.time() + (self._ttl if ttl is None else ttl), value)
+        with self._lock:
+            self._store_memory_entry(key, entry)
+            self._write_disk_entry(key, entry)
+
+    def invalidate(self, key: str | None = None):
+        """
+        Remove the given `key` from the cache. If `key` is `None`, the whole cache is cleared.
+
+        Args:
+            key (str | None): Entry key.
+        """
+        with self._lock:
+            if key is not None:
+                self._remove_entry(key)
+                return
+
+            self._memory.clear()
+            if self._directory:
+                for name in list(self._get_disk_index()):
+                    self._remove_disk_file(name)
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: the dictionary has the following keys:
+                - hits (int): Number of lookups served from the cache.
+                - misses (int): Number of lookups that were missing or expired.
+                - entries (int): Number of entries currently held in memory.
+        """
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._memory)}
+
+    def _store_memory_entry(self, key: str, entry: tuple[float, object]):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._max_entries:
+            self._memory.popitem(last=False)
+
+    def _remove_entry(self, key: str):
+        self._memory.pop(key, None)
+        self._remove_disk_entry(key)
+
+    def _entry_path(self, key: str) -> Path:
+        return self._directory / f"{hashlib.sha1(key.encode('utf-8')).hexdigest()}.json"
+
+    def _get_disk_index(self) -> OrderedDict[str, float]:
+        """
+        Lazily build an index of the entries stored on disk, sorted from oldest to newest, used for eviction.
+        """
+        if self._disk_index is None:
+            self._disk_index = OrderedDict()
+            if self._directory and self._directory.exists():
+                paths = [(path.stat().st_mtime, path.stem) for path in self._directory.glob("*.json")]
+                for mtime, name in sorted(paths):
+                    self._disk_index[name] = mtime
+        return self._disk_index
+
+    def _read_disk_entry(self, key: str) -> tuple[float, object] | None:
+        if not self._directory:
+            return None
+        try:
+            with open(self._entry_path(key), "r") as handler:
+                data = json.load(handler)
+        except (OSError, ValueError):
+            return None
+        if data.get("key") != key:
+            return None
+        return (data["expires_at"], data["value"])
+
+    def _write_disk_entry(self, key: str, entry: tuple[float, object]):
+        """
+        Persist an entry. If the directory can not be written, for example a read-only or full disk, the entry is
+        only kept in memory.
+        """
+        if not self._directory:
+            return
+        path = self._entry_path(key)
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            self._directory.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w") as handler:
+                json.dump({"key": key, "expires_at": entry[0], "value": entry[1]}, handler)
+            os.replace(tmp_path, path)
+        except OSError:
+            try:
+                tmp_path.unlink(missing_ok=True)
+            except OSError:
+                pass
+            return
+
+        disk_index = self._get_disk_index()
+        disk_index[path.stem] = time.time()
+        disk_index.move_to_end(path.stem)
+        while len(disk_index) > self._max_disk_entries:
+            name, _ = disk_index.popitem(last=False)
+            self._remove_disk_file(name)
+
+    def _remove_disk_entry(self, key: str):
+        if self._directory:
+            self._remove_disk_file(self._entry_path(key).stem)
+
+    def _remove_disk_file(self, name: str):
+        self._get_disk_index().pop(name, None)
+        try:
+            (self._directory / f"{name}.json").unlink(missing_ok=True)
+        except OSError:
+            pass
@@ -0,0 +1,114 @@
+import random
+import time
+from threading import Event, Lock
+
+import requests
+from requests.adapters import HTTPAdapter
+
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+class RateLimiter:
+    """
+    Thread safe token bucket. The bucket holds up to `burst` tokens and is refilled at `rate` tokens per second, every
+    request consumes one token.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        Args:
+            rate (float): Tokens added to the bucket per second.
+            burst (int): Bucket capacity, number of requests that can be done back to back.
+        """
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = Lock()
+
+    def acquire(self, stop: Event | None = None) -> bool:
+        """
+        Take a token from the bucket, blocking until one is available.
+
+        Args:
+            stop (Event | None): If given, the wait is interrupted as soon as it is set.
+
+        Returns:
+            bool: `True` if a token was taken, `False` if `stop` was set before.
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            if stop is None:
+                time.sleep(wait)
+            elif stop.wait(wait):
+                return False
+
+
+def create_session(pool_size: int = 16) -> requests.Session:
+    """
+    Create a `requests.Session` that keeps up to `pool_size` connections alive per host, so concurrent requests reuse
+    TCP and TLS connections instead of opening a new one per request.
+
+    Args:
+        pool_size (int): Maximum number of pooled connections per host.
+
+    Returns:
+        requests.Session: the created session.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_with_retry(
+    session: requests.Session,
+    url: str,
+    rate_limiter: RateLimiter | None = None,
+    max_retries: int = 4,
+    backoff: float = 1.0,
+    **kwargs,
+) -> requests.Response:
+    """
+    Send a GET request retrying with exponential backoff when the server answers with one of `RETRY_STATUS_CODES`.
+    If the response has a `Retry-After` header, it is used instead of the computed backoff.
+
+    Args:
+        session (requests.Session): Session used to send the request.
+        url (str): Requested URL.
+        rate_limiter (RateLimiter | None): If given, a token is taken before every attempt.
+        max_retries (int): Maximum number of retries after the first attempt.
+        backoff (float): Base delay in seconds, doubled on every retry.
+        **kwargs: Extra arguments passed to `requests.Session.get`.
+
+    Returns:
+        requests.Response: the last received response.
+
+    Raises:
+        requests.exceptions.HTTPError: If the last attempt still answered with one of `RETRY_STATUS_CODES`.
+        requests.exceptions.ConnectionError: If the connection can not be stablished.
+    """
+    for attempt in range(max_retries + 1):
+        if rate_limiter:
+            rate_limiter.acquire()
+        response = session.get(url, **kwargs)
+        if response.status_code not in RETRY_STATUS_CODES:
+            return response
+        if attempt == max_retries:
+            break
+
+        delay = backoff * 2**attempt + random.uniform(0, backoff)
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            delay = int(retry_after)
+        time.sleep(delay)
+    response.raise_for_status()
+    return response
@@ -0,0 +1,105 @@
+from http import HTTPStatus
+
+from gspread import Client, Spreadsheet, Worksheet
+from gspread.exceptions import APIError, SpreadsheetNotFound
+
+from soul_link.data import FIRST_PAGE_ROWS
+
+# parts of the spreadsheet resource requested when opening it, the formatted values are the ones returned by
+# `gspread.Worksheet.get`
+PREFETCH_FIELDS = "properties,sheets(properties,data(rowData(values(formattedValue))))"
+
+
+class PrefetchedSpreadsheet(Spreadsheet):
+    """
+    `gspread.Spreadsheet` whose opening request also returns the properties of the first worksheet and its first rows,
+    so the first page of a list can be displayed after a single API call. `gspread.Spreadsheet` discards the worksheet
+    properties it downloads when it is opened and requests them again every time a worksheet is got.
+    """
+
+    def __init__(self, client: Client, properties: dict, first_rows: int = FIRST_PAGE_ROWS + 1):
+        """
+        Args:
+            client (gspread.Client): Authorized client.
+            properties (dict): Spreadsheet properties, with at least its `id`.
+            first_rows (int): Rows of the first worksheet downloaded when opening it, header included.
+        """
+        self._first_rows_count = first_rows
+        self._first_rows: list[list[str]] | None = None
+        self._first_worksheet: Worksheet | None = None
+        super().__init__(client, properties)
+
+    def fetch_sheet_metadata(self, params: dict | None = None) -> dict:
+        if params is not None or self._first_worksheet is not None:
+            return super().fetch_sheet_metadata(params)
+        try:
+            metadata = super().fetch_sheet_metadata(
+                {"includeGridData": "true", "ranges": f"1:{self._first_rows_count}", "fields": PREFETCH_FIELDS}
+            )
+        except APIError as error:
+            # the range is past the grid of a worksheet with less rows, open it without its rows
+            if error.response.status_code != HTTPStatus.BAD_REQUEST:
+                raise
+            return super().fetch_sheet_metadata(params)
+
+        sheet = metadata["sheets"][0]
+        rows = [[cell.get("formattedValue", "") for cell in row.get("values", [])] for row in _row_data(sheet)]
+        # the values API omits the empty rows at the end of a range
+        while rows and not any(rows[-1]):
+            rows.pop()
+        self._first_rows = rows
+        self._first_worksheet = Worksheet(self, sheet["properties"])
+        return metadata
+
+    def get_worksheet(self, index: int) -> Worksheet:
+        if index == 0 and self._first_worksheet is not None:
+            return self._first_worksheet
+        return super().get_worksheet(index)
+
+    def take_first_rows(self, count: int) -> list[list[str]] | None:
+        """
+        Get the rows downloaded when the spreadsheet was opened. They are only returned once, later calls would get
+        outdated rows.
+
+        Args:
+            count (int): Wanted rows, header included.
+
+        Returns:
+            list[list[str]] | None with the first `count` rows, `None` if they were already taken or less rows were
+            downloaded.
+        """
+        rows, self._first_rows = self._first_rows, None
+        if rows is None or count > self._first_rows_count:
+            return None
+        return rows[:count]
+
+
+def open_by_key(client: Client, key: str) -> PrefetchedSpreadsheet:
+    """
+    Open a spreadsheet by its key, like `gspread.Client.open_by_key`, downloading the first rows of its first worksheet
+    in the same request.
+
+    Args:
+        client (gspread.Client): Authorized client.
+        key (str): Spreadsheet key.
+
+    Returns:
+        PrefetchedSpreadsheet: opened spreadsheet.
+
+    Raises:
+        gspread.SpreadsheetNotFound: If the spreadsheet does not exist.
+        PermissionError: If the spreadsheet is not shared with the client.
+    """
+    try:
+        return PrefetchedSpreadsheet(client, {"id": key})
+    except APIError as error:
+        if error.response.status_code == HTTPStatus.NOT_FOUND:
+            raise SpreadsheetNotFound(error.response) from error
+        if error.response.status_code == HTTPStatus.FORBIDDEN:
+            raise PermissionError from error
+        raise
+
+
+def _row_data(sheet: dict) -> list[dict]:
+    data = sheet.get("data") or [{}]
+    return data[0].get("rowData", [])
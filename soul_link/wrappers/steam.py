@@ -1,9 +1,14 @@
 import re
+from collections.abc import Iterable
 
-import requests
+from soul_link.profiling import PROFILER
+from soul_link.wrappers.cache import DEFAULT_CACHE_DIR, TTLCache
+from soul_link.wrappers.http import RateLimiter, create_session, get_with_retry
 
 
-def get_app_details(app_id: int | str, language: str = "en"):
+def get_app_details(
+    app_id: int | str, language: str = "en", use_cache: bool = True, fields: Iterable[str] | None = None
+):
     """
     Get Steam application shop details. In the documentation it is displayed that `appids` is a comma-separated
     list of application IDs but this is not working anymore, this is the reasson behind having `app_id` instead
@@ -13,6 +18,14 @@ def get_app_details(app_id: int | str, language: str = "en"):
     Args:
         app_id (int | str): Steam application ID.
         language (str): Two character string representing the language for the response.
+        use_cache (bool): If `True`, responses are served from and stored in `APP_DETAILS_CACHE`. If `False`, the
+            store is always requested but the cache is still refreshed with the new response.
+        fields (Iterable[str] | None): Keys of the application `data` to get, like `APP_DETAILS_FIELDS`. Only the
+            `filters` groups containing them are requested, and the rest of keys returned in those groups are dropped
+            before caching. If `None`, the full details are requested.
+
+    Requests are sent through the shared `STORE_SESSION` connection pool, limited by `STORE_RATE_LIMITER` and
+    retried with backoff if Steam answers with a rate limit or server error.
 
     Returns:
         dict: Response from  the REST API.
@@ -20,10 +33,46 @@ def get_app_details(app_id: int | str, language: str = "en"):
     Raises:
         wrappers.steam.SteamInvalidAppID: Raised if the given `app_id` is not a valida number or equal or less than 0.
         requests.exceptions.ConnectionError: If the connection to steam can not be stablished.
+        requests.exceptions.HTTPError: If Steam keeps answering with a rate limit or server error after retrying.
     """
     _validate_app_str_id(app_id)
     app_id = int(app_id)
-    return requests.get(f"{STORE_API_BASE_URL}/appdetails?appids={app_id}&l={language}").json()
+    fields = tuple(fields) if fields is not None else None
+    cache_key = _cache_key(app_id, language, fields)
+    if use_cache:
+        app_details = APP_DETAILS_CACHE.get(cache_key)
+        if app_details is not None:
+            return app_details
+
+    with PROFILER.span("steam.appdetails", app_id=str(app_id)) as span:
+        url = f"{STORE_API_BASE_URL}/appdetails?appids={app_id}&l={language}"
+        if fields is not None:
+            url += f"&filters={','.join(_filters(fields))}"
+        response = get_with_retry(STORE_SESSION, url, rate_limiter=STORE_RATE_LIMITER, timeout=STORE_API_TIMEOUT)
+        app_details = response.json()
+        if fields is not None:
+            app_details = _select_fields(app_details, fields)
+        span.set(bytes=len(response.content))
+    # do not keep failed lookups for the whole TTL, a game page can be published at any time
+    ttl = None if (app_details or {}).get(str(app_id), {}).get("success") else APP_DETAILS_FAILED_TTL
+    APP_DETAILS_CACHE.set(cache_key, app_details, ttl=ttl)
+    return app_details
+
+
+def invalidate_app_details(app_id: int | str | None = None, language: str = "en"):
+    """
+    Remove cached application details.
+
+    Args:
+        app_id (int | str | None): Steam application ID. If `None`, every cached response is removed.
+        language (str): Two character string representing the language of the cached response.
+    """
+    if app_id is None:
+        APP_DETAILS_CACHE.invalidate()
+        return
+    _validate_app_str_id(app_id)
+    APP_DETAILS_CACHE.invalidate(_cache_key(int(app_id), language, None))
+    APP_DETAILS_CACHE.invalidate(_cache_key(int(app_id), language, APP_DETAILS_FIELDS))
 
 
 def get_app_id_from_store_url(url: str) -> int:
@@ -48,6 +97,57 @@ def get_app_id_from_store_url(url: str) -> int:
     return int(str_id)
 
 
+def get_store_url(app_id: int | str) -> str:
+    """
+    Build the Steam store URL of an application.
+
+    Args:
+        app_id (int | str): Steam application ID.
+
+    Returns:
+        str with the store URL.
+
+    Raises:
+        wrappers.steam.SteamInvalidAppID: Raised if the given `app_id` is not a valida number or equal or less than 0.
+    """
+    _validate_app_str_id(app_id)
+    return f"https://store.steampowered.com/app/{int(app_id)}/"
+
+
+def _cache_key(app_id: int, language: str, fields: tuple[str] | None) -> str:
+    """
+    Responses of different fields are different entries, a trimmed response can not be served to a full request.
+    """
+    if fields is None:
+        return f"{app_id}:{language}"
+    return f"{app_id}:{language}:{','.join(sorted(fields))}"
+
+
+def _filters(fields: tuple[str]) -> list[str]:
+    """
+    Get the `filters` parameter values returning the given fields: `basic` for the fields in `BASIC_FIELDS` and the
+    field name for the rest.
+    """
+    filters = {"basic" if field in BASIC_FIELDS else field for field in fields}
+    return sorted(filters)
+
+
+def _select_fields(app_details: dict | None, fields: tuple[str]) -> dict | None:
+    """
+    Drop the keys of the application `data` that were not requested, `filters` groups like `basic` return more keys
+    than needed.
+    """
+    if not app_details:
+        return app_details
+    selected = {}
+    for app_id, details in app_details.items():
+        if isinstance(details, dict) and isinstance(details.get("data"), dict):
+            data = details["data"]
+            details = dict(details, data={field: data[field] for field in fields if field in data})
+        selected[app_id] = details
+    return selected
+
+
 def _validate_app_str_id(app_id: str | int):
     """
     Validate if the given `app_id` is valid.
@@ -76,6 +176,14 @@ class SteamInvalidAppID(Exception):
         return f"{self.message}. Steam application IDs have to be a number greater than 0."
 
 
+class SteamAppNotFound(Exception):
+    def __init__(self, message):
+        self.message = message
+
+    def __str__(self):
+        return f"{self.message}. The Steam store does not have details for this application."
+
+
 class SteamInvalidStoreURL(Exception):
     def __init__(self, message):
         self.message = message
@@ -86,3 +194,43 @@ class SteamInvalidStoreURL(Exception):
 
 STORE_API_BASE_URL = "https://store.steampowered.com/api"
 STORE_URL_PATTERN = "^https:\/\/store.steampowered.com\/app\/.*[0-9]\/"
+APP_DETAILS_CACHE_TTL = 24 * 60 * 60
+APP_DETAILS_FAILED_TTL = 60 * 60
+APP_DETAILS_CACHE = TTLCache(f"{DEFAULT_CACHE_DIR}/steam", ttl=APP_DETAILS_CACHE_TTL)
+# keys of the application `data` read by `collect_game_data`
+APP_DETAILS_FIELDS = ("name", "is_free", "short_description", "categories", "genres", "release_date")
+# keys returned by the `basic` value of the `appdetails` `filters` parameter, the rest of keys are requested by name
+BASIC_FIELDS = frozenset(
+    (
+        "type",
+        "name",
+        "steam_appid",
+        "required_age",
+        "is_free",
+        "controller_support",
+        "dlc",
+        "detailed_description",
+        "about_the_game",
+        "short_description",
+        "fullgame",
+        "supported_languages",
+        "header_image",
+        "capsule_image",
+        "capsule_imagev5",
+        "website",
+        "pc_requirements",
+        "mac_requirements",
+        "linux_requirements",
+        "legal_notice",
+        "drm_notice",
+        "ext_user_account_notice",
+        "developers",
+        "publishers",
+        "demos",
+        "reviews",
+    )
+)
+# Steam allows around 200 appdetails requests every 5 minutes
+STORE_RATE_LIMITER = RateLimiter(rate=200 / 300, burst=10)
+STORE_SESSION = create_session()
+STORE_API_TIMEOUT = 30
@@ -0,0 +1,82 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from benchmarks.fakes import FakeSpreadsheet, make_rows
+from soul_link.data import SheetWrapper
+from soul_link.mirror import SheetMirror
+from soul_link.table import Table
+
+
+class PullChangesTest(unittest.TestCase):
+    def test_pending_local_edit_and_remote_append_at_startup(self):
+        mirrored_rows = [list(row) for row in make_rows(10)]
+        spreadsheet = FakeSpreadsheet([list(row) for row in mirrored_rows])
+        # appended by another user after the mirror was saved
+        appended = list(make_rows(1, seed=1)[1])
+        spreadsheet.worksheet.rows.append(appended)
+        spreadsheet.touch()
+        # edited locally before the sheet was opened
+        data = Table(mirrored_rows)
+        data.update(0, 0, "Renamed locally")
+
+        wrapper = SheetWrapper(spreadsheet)
+        result = wrapper.pull_changes(data, mirrored_rows)
+
+        self.assertEqual(result.conflicts, 0)
+        self.assertEqual(data.row(0)[0], "Renamed locally")
+        self.assertEqual(list(data.row(len(data) - 1)), appended)
+
+        wrapper.update_sheet(data)
+        self.assertEqual(spreadsheet.worksheet.rows[1][0], "Renamed locally")
+        self.assertEqual(spreadsheet.worksheet.rows[-1], appended)
+        self.assertEqual(len(spreadsheet.worksheet.rows), len(mirrored_rows) + 1)
+
+
+class MergeRemoteChangesTest(unittest.TestCase):
+    def test_column_added_remotely_is_kept(self):
+        spreadsheet = FakeSpreadsheet([list(row) for row in make_rows(10)])
+        wrapper = SheetWrapper(spreadsheet)
+        data = wrapper.get_table()
+        data.update(0, 0, "Renamed locally")
+        for index, row in enumerate(spreadsheet.worksheet.rows):
+            row.append("notes" if index == 0 else f"note {index}")
+        spreadsheet.touch()
+
+        result = wrapper.merge_remote_changes(data)
+
+        self.assertEqual(result.table.header[-1], "notes")
+        self.assertEqual(result.table.row(0)[0], "Renamed locally")
+        self.assertEqual(result.table.row(3)[-1], "note 4")
+        wrapper.update_sheet(result.table)
+        self.assertEqual(spreadsheet.worksheet.rows[1][0], "Renamed locally")
+        self.assertEqual([row[-1] for row in spreadsheet.worksheet.rows[:3]], ["notes", "note 1", "note 2"])
+
+
+class UpdateSheetTest(unittest.TestCase):
+    def test_remote_edit_right_after_a_write_is_merged(self):
+        spreadsheet = FakeSpreadsheet([list(row) for row in make_rows(10)])
+        with tempfile.TemporaryDirectory() as directory:
+            wrapper = SheetWrapper(spreadsheet, SheetMirror("games", Path(directory) / "mirror.db"))
+            data = wrapper.get_table()
+            batch_update = spreadsheet.batch_update
+
+            def batch_update_then_remote_edit(body: dict) -> dict:
+                reply = batch_update(body)
+                # edited by another user before the modified time of the write could be requested
+                spreadsheet.worksheet.rows[5][0] = "Renamed remotely"
+                spreadsheet.touch()
+                return reply
+
+            spreadsheet.batch_update = batch_update_then_remote_edit
+            data.update(0, 0, "Renamed locally")
+            wrapper.update_sheet(data)
+            result = wrapper.merge_remote_changes(data)
+
+        self.assertIsNotNone(result)
+        self.assertEqual(data.row(4)[0], "Renamed remotely")
+        self.assertEqual(data.row(0)[0], "Renamed locally")
+
+
+if __name__ == "__main__":
+    unittest.main()
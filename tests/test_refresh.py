@@ -0,0 +1,38 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from benchmarks.fakes import make_rows, steam_store_stub
+from soul_link.refresh import FetchLog, StalenessRefresher
+from soul_link.table import Table
+
+
+class StalenessRefresherTest(unittest.TestCase):
+    def test_failed_batch_does_not_stop_the_refresh(self):
+        rows = [list(row) for row in make_rows(2)]
+        invalid = list(rows[1])
+        invalid[rows[0].index("app_id")] = "0"
+        data = Table(rows + [invalid])
+        applied = []
+
+        def on_changes(changes: dict[str, dict[str, str]]):
+            applied.append(changes)
+            if len(applied) == 1:
+                raise RuntimeError("Sheet unavailable")
+
+        with tempfile.TemporaryDirectory() as directory, steam_store_stub(directory):
+            fetch_log = FetchLog("games", Path(directory) / "mirror.db")
+            refresher = StalenessRefresher(lambda: data, fetch_log, on_changes, rate=None, batch_size=1)
+            refresher.schedule()
+            summary = refresher.refresh_due()
+
+            self.assertEqual(len(applied), 2)
+            self.assertEqual(summary.failed, 1)
+            self.assertIsNone(refresher.error)
+            # the games of the failed batch are downloaded again after the next scan
+            refresher.schedule()
+            self.assertEqual(refresher.refresh_due().fetched, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()